@@ -5,6 +5,18 @@ import json
 import logging
 import os
 import re
+import sys
+
+# The generator's modules handle steno strokes and the output formats.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "generator"))
+
+# pylint: disable=wrong-import-position,import-error
+import binary_dictionary
+import core
+import sqlite_dictionary
+import steno
+
+# pylint: enable=wrong-import-position,import-error
 
 
 def natural_sort_key(string):
@@ -52,10 +64,89 @@ def get_sorted_json_files(directory, recursive):
     return json_files
 
 
-def combine_json_files_directory(directory, recursive, force_overwrite, log):
-    """Combine all JSON files in a directory into a single JSON file.
+def write_binary_dictionary(combined_json, output_file, log):
+    """Write a combined dictionary in the binary format.
 
-    The created file is named <directory>.json.
+    Entries whose strokes can't be represented with steno keys alone (e.g.
+    strokes using number keys like "1-9") are skipped. Different keys can be
+    written the same (e.g. "KAT" and "KAT/-", since empty strokes are dropped);
+    only the first of them is kept, the same as when combining JSON files.
+
+    Args:
+        combined_json: A dictionary mapping stroke sequence strings to
+            translations, from highest to lowest priority.
+        output_file: The name of the file to write.
+        log: A logger to write logs
+    """
+
+    packed_key_to_entry = {}
+    for key, translation in combined_json.items():
+        try:
+            stroke_sequence = steno.StrokeSequence.from_string(key)
+        except (steno.MissingDashInStrokeError, steno.OutOfStenoOrderError):
+            log.warning("Skipping `%s: %s`; unable to parse the strokes", key, translation)
+            continue
+
+        packed_key = binary_dictionary.pack_stroke_sequence(stroke_sequence)
+        first_key, first_translation = packed_key_to_entry.setdefault(
+            packed_key, (key, translation)
+        )
+        if first_key != key:
+            log_func = log.debug if translation == first_translation else log.warning
+            log_func(
+                "Ignoring `%s: %s`; `%s: %s` is written the same and has higher priority",
+                key,
+                translation,
+                first_key,
+                first_translation,
+            )
+
+    binary_dictionary.write_binary_dictionary(
+        (
+            (packed_key, translation)
+            for packed_key, (_, translation) in packed_key_to_entry.items()
+        ),
+        output_file,
+    )
+
+
+def write_sqlite_dictionary(file_entries, output_file):
+    """Write every entry of the combined dictionaries to a SQLite database.
+
+    Unlike the other formats, entries that are overridden by a higher priority
+    file are kept and marked as overridden.
+
+    Args:
+        file_entries: A list of tuples of a filename and the dictionary loaded
+            from it, from highest to lowest priority.
+        output_file: The name of the file to write.
+    """
+
+    entries = []
+    for filename, contents in file_entries:
+        for key, translation in contents.items():
+            try:
+                packed_strokes = binary_dictionary.pack_stroke_sequence(
+                    steno.StrokeSequence.from_string(key)
+                )
+            except (steno.MissingDashInStrokeError, steno.OutOfStenoOrderError):
+                packed_strokes = None
+
+            entries.append(
+                sqlite_dictionary.SqliteEntry(key, packed_strokes, translation, filename)
+            )
+
+    sqlite_dictionary.write_sqlite_dictionary(entries, output_file, first_entry_wins=True)
+
+
+def combine_json_files_directory(
+    directory, recursive, force_overwrite, log, output_format=core.OUTPUT_FORMAT_JSON
+):
+    """Combine all JSON files in a directory into a single dictionary file.
+
+    The created file is named <directory>.json, <directory>.stenodict for the
+    binary format (see generator/binary_dictionary.py), or <directory>.sqlite
+    for the SQLite format (see generator/sqlite_dictionary.py).
 
     Args:
         directory: The name of a directory.
@@ -65,6 +156,8 @@ def combine_json_files_directory(directory, recursive, force_overwrite, log):
             already exists. If the file doesn't already exist, this parameter
             doesn't do anything.
         log: A logger to write logs
+        output_format: core.OUTPUT_FORMAT_JSON, core.OUTPUT_FORMAT_BINARY, or
+            core.OUTPUT_FORMAT_SQLITE.
 
     Raises:
         ValueError: If the input argument is not a directory.
@@ -79,7 +172,12 @@ def combine_json_files_directory(directory, recursive, force_overwrite, log):
         return
 
     # Check if the output file already exists.
-    new_filename = os.path.basename(directory) + ".json"
+    extension = ".json"
+    if output_format == core.OUTPUT_FORMAT_BINARY:
+        extension = binary_dictionary.BINARY_EXTENSION
+    elif output_format == core.OUTPUT_FORMAT_SQLITE:
+        extension = sqlite_dictionary.SQLITE_EXTENSION
+    new_filename = os.path.basename(directory) + extension
 
     if not force_overwrite and os.path.exists(new_filename):
         # If the file exists, prompt the user before overwriting it
@@ -97,11 +195,13 @@ def combine_json_files_directory(directory, recursive, force_overwrite, log):
 
     # Combine contents of JSON files.
     combined_json = {}
+    file_entries = []
     for file in json_files:
         log.info("Merging `%s`", file)
 
         with open(file, "r", encoding="UTF-8") as file:
             contents = json.load(file)
+            file_entries.append((file.name, contents))
 
             for key in contents:
                 if key in combined_json:
@@ -118,9 +218,15 @@ def combine_json_files_directory(directory, recursive, force_overwrite, log):
                     combined_json[key] = contents[key]
 
     # Write the combined JSON a file.
-    with open(new_filename, "w+", encoding="UTF-8") as file:
-        json.dump(combined_json, file, indent=0)
-        print(f"{new_filename} written successfully.")
+    if output_format == core.OUTPUT_FORMAT_BINARY:
+        write_binary_dictionary(combined_json, new_filename, log)
+    elif output_format == core.OUTPUT_FORMAT_SQLITE:
+        write_sqlite_dictionary(file_entries, new_filename)
+    else:
+        with open(new_filename, "w+", encoding="UTF-8") as file:
+            json.dump(combined_json, file, indent=0)
+
+    print(f"{new_filename} written successfully.")
 
 
 def main():
@@ -136,6 +242,13 @@ def main():
     parser.add_argument(
         "-r", "--recursive", action="store_true", help="combine subdirectories recursively"
     )
+    parser.add_argument(
+        "--output_format",
+        choices=core.OUTPUT_FORMATS,
+        default=core.OUTPUT_FORMAT_JSON,
+        help="write a JSON dictionary, a compact memory-mappable binary dictionary, "
+        + "or an indexed SQLite database",
+    )
     parser.add_argument("-v", "--verbose", action="count", help="increase output verbosity")
     args = parser.parse_args()
 
@@ -152,7 +265,9 @@ def main():
     logging.basicConfig(level=log_level, format=log_format)
     log = logging.getLogger("combine_dictionaries")
 
-    combine_json_files_directory(args.directory, args.recursive, args.force, log)
+    combine_json_files_directory(
+        args.directory, args.recursive, args.force, log, args.output_format
+    )
 
 
 if __name__ == "__main__":
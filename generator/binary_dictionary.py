@@ -0,0 +1,338 @@
+"""Read and write steno dictionaries in a compact, memory-mappable format.
+
+Looking up a stroke sequence in a JSON dictionary requires parsing the whole
+file first. In this format entries are sorted by their packed stroke sequence
+(see StrokeSequence.to_ints()) so a reader can memory-map the file and answer
+lookups with a binary search, without reading the rest of the file.
+
+The file layout, with all integers little-endian, is:
+    1. A header (see _HEADER) with the magic bytes, format version, number of
+       entries, and the byte offsets of the three sections below.
+    2. The records section, with one record per entry (see _RECORD), in sorted
+       order. A record gives where the entry's strokes are in the strokes
+       section and where its translation is in the translations section.
+    3. The strokes section, an array of 32-bit packed strokes.
+    4. The translations section, the UTF-8 encoded translations.
+
+Usage:
+    python binary_dictionary.py <dictionary> <stroke_sequence>...
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import struct
+import sys
+
+from generated_dictionary import iter_packed
+from steno import MissingDashInStrokeError, OutOfStenoOrderError, StrokeSequence
+
+BINARY_EXTENSION = ".stenodict"
+
+_MAGIC = b"STENODIC"
+_VERSION = 1
+
+# Magic, version, number of entries, and the offsets of the records, strokes,
+# and translations sections.
+_HEADER = struct.Struct("<8sIIQQQ")
+
+# The index of the entry's first stroke in the strokes section, the number of
+# strokes, the byte offset of the translation in the translations section, and
+# the translation's length in bytes.
+_RECORD = struct.Struct("<IIII")
+
+_STROKE = struct.Struct("<I")
+
+
+class InvalidBinaryDictionaryError(Exception):
+    """Error for when a file is not a binary dictionary this module can read."""
+
+
+def pack_stroke_sequence(stroke_sequence):
+    """Return the lookup key for a StrokeSequence.
+
+    Empty strokes are dropped, the same as when a StrokeSequence is converted to
+    a string, so sequences that are written the same have the same key.
+
+    Returns:
+        A tuple of packed strokes (see Stroke.to_int()).
+    """
+
+    return get_lookup_key(stroke_sequence.to_ints())
+
+
+def get_lookup_key(packed_strokes):
+    """Return the lookup key for a list of packed strokes, like pack_stroke_sequence()."""
+
+    return tuple(packed for packed in packed_strokes if packed != 0)
+
+
+def write_binary_dictionary(entries, output_file):
+    """Write dictionary entries in the binary format.
+
+    Args:
+        entries: An iterable of tuples where the first item is a tuple of
+            packed strokes (see pack_stroke_sequence()) and the second is the
+            translation string. If a stroke sequence appears more than once,
+            the last translation is kept, matching how a JSON dictionary with
+            duplicate keys is loaded.
+        output_file: The name of the file to write.
+
+    Returns:
+        The number of entries written.
+    """
+
+    key_to_translation = {}
+    for key, translation in entries:
+        key_to_translation[key] = translation
+
+    keys = sorted(key_to_translation)
+
+    records = bytearray()
+    strokes = bytearray()
+    translations = bytearray()
+    num_strokes = 0
+
+    for key in keys:
+        encoded_translation = key_to_translation[key].encode("UTF-8")
+        records += _RECORD.pack(num_strokes, len(key), len(translations), len(encoded_translation))
+        strokes += struct.pack(f"<{len(key)}I", *key)
+        translations += encoded_translation
+        num_strokes += len(key)
+
+    records_offset = _HEADER.size
+    strokes_offset = records_offset + len(records)
+    translations_offset = strokes_offset + len(strokes)
+
+    with open(output_file, "wb") as file:
+        file.write(
+            _HEADER.pack(
+                _MAGIC, _VERSION, len(keys), records_offset, strokes_offset, translations_offset
+            )
+        )
+        file.write(records)
+        file.write(strokes)
+        file.write(translations)
+
+    return len(keys)
+
+
+def write_generated_dictionary(words_and_translations, output_file):
+    """Write a generated dictionary in the binary format.
+
+    Args:
+        words_and_translations: The returned value from
+            core.generate_dictionary().
+        output_file: The name of the file to write.
+
+    Returns:
+        The number of entries written.
+    """
+
+    return write_binary_dictionary(
+        (
+            (get_lookup_key(packed_strokes), word)
+            for word, packed_translations in iter_packed(words_and_translations)
+            for packed_strokes in packed_translations
+        ),
+        output_file,
+    )
+
+
+def read_packed_entries(filenames):
+    """Load dictionary files and key their entries by packed strokes.
+
+    Entries with strokes that can't be parsed (e.g. strokes using number keys
+    like "1-9") are skipped.
+
+    Args:
+        filenames: JSON or binary dictionary files, from highest to lowest
+            priority. As with combine_dictionaries.py, an entry in an earlier
+            file takes precedence over the same strokes in a later one.
+
+    Returns:
+        A dictionary mapping tuples of packed strokes (see
+        pack_stroke_sequence()) to translations.
+    """
+
+    log = logging.getLogger("dictionary_generator")
+    entries = {}
+
+    for filename in filenames:
+        if filename.endswith(BINARY_EXTENSION):
+            with BinaryDictionary(filename) as dictionary:
+                for key, translation in dictionary.items():
+                    entries.setdefault(key, translation)
+            continue
+
+        with open(filename, "r", encoding="UTF-8") as file:
+            contents = json.load(file)
+
+        for sequence_str, translation in contents.items():
+            try:
+                stroke_sequence = StrokeSequence.from_string(sequence_str)
+            except (MissingDashInStrokeError, OutOfStenoOrderError):
+                log.debug(
+                    "Skipping `%s: %s`; unable to parse the strokes", sequence_str, translation
+                )
+                continue
+
+            entries.setdefault(pack_stroke_sequence(stroke_sequence), translation)
+
+    return entries
+
+
+class BinaryDictionary:
+    """A memory-mapped binary dictionary.
+
+    Opening a dictionary only reads its header, so it takes the same time no
+    matter how many entries the dictionary has. Each lookup takes O(log n)
+    time.
+
+    This can be used as a context manager, which closes the dictionary on exit.
+    """
+
+    def __init__(self, filename):
+        """Open a binary dictionary.
+
+        Raises:
+            InvalidBinaryDictionaryError: If the file is not a binary
+                dictionary.
+        """
+
+        self._file = open(filename, "rb")  # pylint: disable=consider-using-with
+
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as err:
+            # mmap can't map an empty file.
+            self._file.close()
+            raise InvalidBinaryDictionaryError(f"`{filename}` is empty") from err
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise InvalidBinaryDictionaryError(f"`{filename}` is not a binary dictionary")
+
+        (
+            magic,
+            version,
+            self._num_entries,
+            self._records_offset,
+            self._strokes_offset,
+            self._translations_offset,
+        ) = _HEADER.unpack_from(self._map, 0)
+
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise InvalidBinaryDictionaryError(
+                f"`{filename}` is not a binary dictionary of a supported version"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._num_entries
+
+    def __contains__(self, key):
+        return self.lookup(key) is not None
+
+    def close(self):
+        """Release the memory map and the file."""
+
+        self._map.close()
+        self._file.close()
+
+    def lookup(self, key):
+        """Find the translation for a stroke sequence.
+
+        Args:
+            key: A tuple of packed strokes (see pack_stroke_sequence()).
+
+        Returns:
+            The translation string, or None if the dictionary has no entry for
+            the stroke sequence.
+        """
+
+        key = tuple(key)
+        low = 0
+        high = self._num_entries
+
+        while low < high:
+            middle = (low + high) // 2
+            middle_key = self._read_key(middle)
+
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                return self._read_translation(middle)
+
+        return None
+
+    def lookup_string(self, sequence_str):
+        """Find the translation for a stroke sequence written like "KAT/HRAOG".
+
+        Raises:
+            MissingDashInStrokeError: If a stroke is missing a dash.
+            OutOfStenoOrderError: If a stroke is out of steno order.
+
+        Returns:
+            The translation string, or None if there's no entry for it.
+        """
+
+        return self.lookup(pack_stroke_sequence(StrokeSequence.from_string(sequence_str)))
+
+    def items(self):
+        """Yield every (packed strokes, translation) entry in sorted order."""
+
+        for i in range(self._num_entries):
+            yield (self._read_key(i), self._read_translation(i))
+
+    def _read_record(self, index):
+        return _RECORD.unpack_from(self._map, self._records_offset + index * _RECORD.size)
+
+    def _read_key(self, index):
+        first_stroke, num_strokes, _, _ = self._read_record(index)
+        return struct.unpack_from(
+            f"<{num_strokes}I", self._map, self._strokes_offset + first_stroke * _STROKE.size
+        )
+
+    def _read_translation(self, index):
+        _, _, start, length = self._read_record(index)
+        start += self._translations_offset
+        return self._map[start : start + length].decode("UTF-8")
+
+
+def main():
+    """Look up stroke sequences in a binary dictionary."""
+
+    parser = argparse.ArgumentParser(description="Look up strokes in a binary dictionary.")
+    parser.add_argument("dictionary", help="the binary dictionary file")
+    parser.add_argument("stroke_sequences", nargs="+", help='stroke sequences like "KAT/HRAOG"')
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(levelname)s: %(message)s")
+    log = logging.getLogger("dictionary_generator")
+
+    with BinaryDictionary(args.dictionary) as dictionary:
+        for sequence_str in args.stroke_sequences:
+            try:
+                translation = dictionary.lookup_string(sequence_str)
+            except MissingDashInStrokeError:
+                log.critical("Unable to parse `%s`; a stroke is missing a dash", sequence_str)
+                sys.exit(1)
+            except OutOfStenoOrderError:
+                log.critical("Unable to parse `%s`; a stroke is out of steno order", sequence_str)
+                sys.exit(1)
+
+            print(f"{sequence_str}: {translation}")
+
+
+if __name__ == "__main__":
+    main()
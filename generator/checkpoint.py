@@ -0,0 +1,184 @@
+"""Save and restore the progress of a dictionary generation run.
+
+A checkpoint records how far through the word list a run got, the translations
+made so far (after conflicts were resolved), and the state of the
+postprocessing.Disambiguator that resolves conflicts. Resuming from a
+checkpoint produces the same output as an uninterrupted run.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+from existing_dictionaries import fingerprint_config
+from generated_dictionary import GeneratedDictionary, iter_packed
+import ipa_utils
+
+CHECKPOINT_VERSION = 2
+
+# How often a checkpoint is written while generating a dictionary.
+CHECKPOINT_INTERVAL_SECONDS = 60
+
+_STR_VERSION = "version"
+_STR_INPUTS_FINGERPRINT = "inputs_fingerprint"
+_STR_POSITION = "position"
+_STR_WORDS = "words"
+_STR_TRANSLATIONS = "translations"
+_STR_USED_KEYS = "used_keys"
+_STR_NEXT_COUNT_KEYS = "next_count_keys"
+_STR_NEXT_COUNTS = "next_counts"
+
+
+class Checkpoint:
+    """The state of a partially finished generation run.
+
+    Attributes:
+        position: The number of lines of the word list that were processed.
+        words_and_translations: A GeneratedDictionary of the words translated
+            so far, after conflicts were resolved.
+        used_keys: A set of keys for stroke sequences that are already taken
+            (see postprocessing.get_sequence_key()), or None if conflicts
+            aren't being resolved.
+        next_counts: The Disambiguator's dictionary from base keys to the
+            number of disambiguator strokes to start from, or None if
+            conflicts aren't being resolved.
+    """
+
+    def __init__(self, position, words_and_translations, used_keys, next_counts):
+        self.position = position
+        self.words_and_translations = words_and_translations
+        self.used_keys = used_keys
+        self.next_counts = next_counts
+
+
+def get_default_checkpoint_file(output_file):
+    """Return the checkpoint filename used for a generated dictionary."""
+
+    return output_file + ".checkpoint"
+
+
+def fingerprint_inputs(ipa_file, word_list_file, config, existing_dictionaries=None):
+    """Return a string that changes whenever the inputs to a run change.
+
+    The IPA files are identified by their size and modification time so that
+    they don't need to be read in full.
+
+    Args:
+        ipa_file: The IPA file for the run, or a list of them in priority
+            order.
+        word_list_file: The word list file for the run.
+        config: The Config for the run.
+        existing_dictionaries: The ExistingDictionaries for the run, or None.
+    """
+
+    digest = hashlib.sha256()
+    digest.update(fingerprint_config(config, existing_dictionaries).encode("UTF-8"))
+
+    with open(word_list_file, "rb") as file:
+        digest.update(file.read())
+
+    for filename in ipa_utils.get_ipa_files(ipa_file):
+        ipa_stat = os.stat(filename)
+        digest.update(f"{ipa_stat.st_size}:{ipa_stat.st_mtime_ns}".encode("UTF-8"))
+
+    return digest.hexdigest()
+
+
+def save_checkpoint(checkpoint_file, inputs_fingerprint, checkpoint):
+    """Write a checkpoint, replacing any previous one.
+
+    Args:
+        checkpoint_file: The checkpoint filename.
+        inputs_fingerprint: The value of fingerprint_inputs() for this run.
+        checkpoint: The Checkpoint to save.
+    """
+
+    used_keys = None
+    next_count_keys = None
+    next_counts = None
+    if checkpoint.used_keys is not None:
+        used_keys = sorted(checkpoint.used_keys)
+        next_count_keys = list(checkpoint.next_counts.keys())
+        next_counts = list(checkpoint.next_counts.values())
+
+    words = []
+    translations = []
+    for word, packed_translations in iter_packed(checkpoint.words_and_translations):
+        words.append(word)
+        translations.append(packed_translations)
+
+    state = {
+        _STR_VERSION: CHECKPOINT_VERSION,
+        _STR_INPUTS_FINGERPRINT: inputs_fingerprint,
+        _STR_POSITION: checkpoint.position,
+        _STR_WORDS: words,
+        _STR_TRANSLATIONS: translations,
+        _STR_USED_KEYS: used_keys,
+        _STR_NEXT_COUNT_KEYS: next_count_keys,
+        _STR_NEXT_COUNTS: next_counts,
+    }
+
+    # Write to a temporary file first so the process being killed mid-write
+    # can't leave a corrupt checkpoint behind.
+    temp_file = checkpoint_file + ".tmp"
+    with open(temp_file, "w", encoding="UTF-8") as file:
+        json.dump(state, file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_file, checkpoint_file)
+
+
+def load_checkpoint(checkpoint_file, inputs_fingerprint):
+    """Read a checkpoint saved by save_checkpoint().
+
+    Args:
+        checkpoint_file: The checkpoint filename.
+        inputs_fingerprint: The value of fingerprint_inputs() for this run.
+
+    Returns:
+        A Checkpoint, or None if there's no usable checkpoint for these
+        inputs.
+    """
+
+    log = logging.getLogger("dictionary_generator")
+
+    if not os.path.exists(checkpoint_file):
+        log.warning("No checkpoint at `%s`; starting from the beginning", checkpoint_file)
+        return None
+
+    try:
+        with open(checkpoint_file, "r", encoding="UTF-8") as file:
+            state = json.load(file)
+    except (OSError, ValueError) as err:
+        log.warning("Ignoring unreadable checkpoint `%s`: %s", checkpoint_file, err)
+        return None
+
+    if state.get(_STR_VERSION) != CHECKPOINT_VERSION:
+        log.warning("Ignoring checkpoint `%s` with an old format", checkpoint_file)
+        return None
+
+    if state.get(_STR_INPUTS_FINGERPRINT) != inputs_fingerprint:
+        log.warning(
+            "Ignoring checkpoint `%s`; the inputs changed since it was saved", checkpoint_file
+        )
+        return None
+
+    words_and_translations = GeneratedDictionary()
+    for word, packed_translations in zip(state[_STR_WORDS], state[_STR_TRANSLATIONS]):
+        words_and_translations.append_packed(word, packed_translations)
+
+    used_keys = state[_STR_USED_KEYS]
+    next_counts = None
+    if used_keys is not None:
+        used_keys = set(used_keys)
+        next_counts = dict(zip(state[_STR_NEXT_COUNT_KEYS], state[_STR_NEXT_COUNTS]))
+
+    log.info("Resuming from word %d", state[_STR_POSITION] + 1)
+
+    return Checkpoint(state[_STR_POSITION], words_and_translations, used_keys, next_counts)
+
+
+def remove_checkpoint(checkpoint_file):
+    """Delete the checkpoint once a run has finished, if it exists."""
+
+    if os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
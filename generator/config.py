@@ -1,12 +1,14 @@
 """Configuration for the steno dictionary generator."""
 
-import copy
+import hashlib
+import json
 import logging
+import unicodedata
 import schema
 import yaml
 
 import steno
-from syllable import SyllableRegion, SyllableAtom
+from syllable import SyllableRegion, SyllableAtom, get_atom_id
 
 
 NO_STENO_MAPPING = "NO_STENO_MAPPING"
@@ -30,6 +32,8 @@ _STR_TYPE_LEFT_CONSONANT = "LEFT_CONSONANT"
 _STR_TYPE_VOWEL = "VOWEL"
 _STR_TYPE_RIGHT_CONSONANT = "RIGHT_CONSONANT"
 
+_STR_IGNORED_IPA_SYMBOLS = "ignored_ipa_symbols"
+
 _STR_PHONOLOGY = "phonology"
 _STR_ALLOWED = "allowed"
 _STR_IMMEDIATELY_BEFORE_VOWEL = "immediately_before_vowel"
@@ -102,6 +106,7 @@ class Config:
                     _STR_KEYS: [str],
                 }
             ],
+            schema.Optional(_STR_IGNORED_IPA_SYMBOLS): [str],
             _STR_PHONOLOGY: [
                 {
                     _STR_ALLOWED: {
@@ -167,7 +172,11 @@ class Config:
         self._left_consonant_to_possible_strokes = {}
         self._right_consonant_to_possible_strokes = {}
         self._phoneme_tuples_to_possible_key_clusters = {}
+        self._phoneme_ids = {}
+        self._atom_ids_to_possible_key_clusters = {}
+        self._max_atom_cluster_length = 0
         self._phoneme_sequence_overrides = {}
+        self._ignored_ipa_symbols = []
         self._allowed_first_consonants = []
         self._consonants_allowed_after = {}
         self._postprocessing_settings = {}
@@ -189,7 +198,9 @@ class Config:
         self._process_vowels_mapping()
         self._process_consonants_mapping()
         self._process_sequence_overrides()
+        self._process_ignored_ipa_symbols()
         self._compute_phoneme_tuples_to_possible_key_clusters()
+        self._compute_atom_ids_to_possible_key_clusters()
         self._process_phonology_rules()
         self._process_postprocessing_settings()
 
@@ -208,6 +219,15 @@ class Config:
         # This whole section is optional.
         self._phoneme_sequence_overrides = self._config.get(_STR_SEQUENCE_OVERRIDES, [])
 
+    def _process_ignored_ipa_symbols(self):
+        # This whole section is optional. Pronunciations are normalized to NFC
+        # before the symbols are removed, so the symbols must be too.
+        self._ignored_ipa_symbols = [
+            unicodedata.normalize("NFC", symbol)
+            for symbol in self._config.get(_STR_IGNORED_IPA_SYMBOLS, [])
+            if symbol != ""
+        ]
+
     def _process_phonology_rules(self):
         """Extract the phonology rules from the config.
 
@@ -355,6 +375,81 @@ class Config:
             ]
             self._phoneme_tuples_to_possible_key_clusters[key] = value
 
+    def _compute_atom_ids_to_possible_key_clusters(self):
+        """Give each phoneme an integer id and key the phoneme clusters by them.
+
+        This should only be called after
+        _compute_phoneme_tuples_to_possible_key_clusters() has already
+        finished.
+
+        Ids are given to the vowels, then the consonants, then any phonemes
+        that only appear in the phoneme sequence overrides, in the order they
+        appear in the config.
+        """
+
+        self._phoneme_ids = {}
+        for phoneme in list(self.get_vowels()) + list(self.get_consonants()):
+            self._phoneme_ids.setdefault(phoneme, len(self._phoneme_ids))
+
+        for atoms in self._phoneme_tuples_to_possible_key_clusters:
+            for phoneme, _ in atoms:
+                self._phoneme_ids.setdefault(phoneme, len(self._phoneme_ids))
+
+        self._atom_ids_to_possible_key_clusters = {}
+        for atoms, value in self._phoneme_tuples_to_possible_key_clusters.items():
+            key = tuple(
+                get_atom_id(self._phoneme_ids[phoneme], region) for phoneme, region in atoms
+            )
+            self._atom_ids_to_possible_key_clusters[key] = value
+
+        self._max_atom_cluster_length = max(
+            (len(key) for key in self._atom_ids_to_possible_key_clusters), default=0
+        )
+
+    def get_fingerprint(self):
+        """Return a string that changes whenever the config settings change.
+
+        Formatting and comments in the config file don't affect the result.
+        """
+
+        serialized = json.dumps(self._config, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("UTF-8")).hexdigest()
+
+    def get_syllabification_fingerprint(self):
+        """Return a string that changes whenever the way IPA is split changes.
+
+        Configs with the same syllabification fingerprint normalize every
+        pronunciation the same way and split it into the same Syllables, with
+        the same atom ids, even if they map phonemes to different keys.
+        """
+
+        settings = [
+            list(self.get_vowels()),
+            list(self.get_consonants()),
+            self._ignored_ipa_symbols,
+            self._allowed_first_consonants,
+            self._consonants_allowed_after,
+            self._phoneme_ids,
+        ]
+        serialized = json.dumps(settings, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("UTF-8")).hexdigest()
+
+    def get_stroke_postprocessing_fingerprint(self):
+        """Return a string that changes whenever postprocessing a word's strokes changes.
+
+        This covers every postprocessing setting except appending the
+        disambiguator stroke, which only affects resolving conflicts between
+        words.
+        """
+
+        settings = {
+            name: value
+            for name, value in self._postprocessing_settings.items()
+            if name != _STR_APPEND_DISAMBIGUATOR_STROKE
+        }
+        serialized = json.dumps(settings, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("UTF-8")).hexdigest()
+
     def get_vowels(self):
         """Return the vowels specified in the config.
 
@@ -373,6 +468,15 @@ class Config:
 
         return self._left_consonant_to_possible_strokes.keys()
 
+    def get_ignored_ipa_symbols(self):
+        """Return the IPA symbols to remove from pronunciations.
+
+        Returns:
+            A list of strings, normalized to NFC.
+        """
+
+        return self._ignored_ipa_symbols
+
     def get_phoneme_tuples_to_possible_key_clusters(self):
         """Return a dict from a phoneme cluster to steno keys.
 
@@ -385,6 +489,31 @@ class Config:
 
         return self._phoneme_tuples_to_possible_key_clusters
 
+    def get_phoneme_ids(self):
+        """Return a dict from each phoneme in the config to its integer id.
+
+        Ids are small integers starting from 0. They can be given to a
+        Syllable so it can be mapped with map_atom_ids().
+        """
+
+        return self._phoneme_ids
+
+    def get_atom_ids_to_possible_key_clusters(self):
+        """Return the same as get_phoneme_tuples_to_possible_key_clusters() keyed by atom ids.
+
+        Returns:
+            A dictionary where each key is a tuple of atom ids (see
+            syllable.get_atom_id()) and each value is the same list of lists of
+            Keys as for the corresponding tuple of SyllableAtoms.
+        """
+
+        return self._atom_ids_to_possible_key_clusters
+
+    def get_max_atom_cluster_length(self):
+        """Return the length of the longest key of get_atom_ids_to_possible_key_clusters()."""
+
+        return self._max_atom_cluster_length
+
     def possible_strokes_for_left_consonant(self, phoneme):
         """Return how to stroke a certain consonant with left consonants.
 
@@ -482,7 +611,7 @@ class Config:
         if not fold_strokes.get(_STR_ENABLED, False):
             return new_stroke_sequences
 
-        list_of_stroke_lists = [copy.deepcopy(stroke_sequence.get_strokes())]
+        list_of_stroke_lists = [[stroke.copy() for stroke in stroke_sequence.get_strokes()]]
 
         for rule in fold_strokes.get(_STR_RULES, []):
             if not rule[_STR_ENABLED]:
@@ -490,10 +619,10 @@ class Config:
 
             length = len(list_of_stroke_lists)  # We may append to the list.
             for i in range(length):
-                strokes = copy.deepcopy(list_of_stroke_lists[i])
+                strokes = [stroke.copy() for stroke in list_of_stroke_lists[i]]
                 made_changes = False
 
-                new_strokes = copy.deepcopy(strokes)
+                new_strokes = [stroke.copy() for stroke in strokes]
                 for k, stroke in enumerate(strokes):
                     if not Config._stroke_folding_enabled_for_stroke(
                         strokes, k, rule[_STR_FOLD_INTO]
@@ -553,7 +682,7 @@ class Config:
         if not vowel_dropping.get(_STR_ENABLED, False):
             return new_stroke_sequences
 
-        list_of_stroke_lists = [copy.deepcopy(stroke_sequence.get_strokes())]
+        list_of_stroke_lists = [[stroke.copy() for stroke in stroke_sequence.get_strokes()]]
 
         for rule in vowel_dropping.get(_STR_RULES, []):
             if not rule[_STR_ENABLED]:
@@ -561,7 +690,7 @@ class Config:
 
             length = len(list_of_stroke_lists)  # We may append to the list.
             for i in range(length):
-                strokes = copy.deepcopy(list_of_stroke_lists[i])
+                strokes = [stroke.copy() for stroke in list_of_stroke_lists[i]]
                 made_changes = False
 
                 for k, stroke in enumerate(strokes):
@@ -0,0 +1,435 @@
+"""Show how a config change affects a previously generated dictionary.
+
+Regenerating a whole dictionary to see the effect of a small config change,
+such as one consonant's keys or one phoneme sequence override, takes much
+longer than the change deserves. A config diff starts from the manifest saved
+by an incremental run with the old config (see incremental.py) and only
+translates again the words that the change can affect:
+    1. If the configs split IPA into syllables differently (see
+       Config.get_syllabification_fingerprint()) or postprocess a word's
+       strokes differently, every word is affected.
+    2. Otherwise, only the keys for some phoneme clusters changed. A word can
+       only be affected if its syllables contain every atom (a phoneme in an
+       onset, nucleus or coda; see syllable.get_atom_id()) of one of those
+       clusters. The words are found with an inverted index from each atom id
+       to the positions in the manifest of the words containing it.
+
+Conflicts are then resolved again from the first affected word onward, since
+a word's disambiguator strokes depend on the words before it, and every entry
+whose stroke sequences changed is reported.
+
+The inverted index is saved next to the manifest and is rebuilt whenever the
+manifest, or the way IPA is split into syllables, changes.
+
+Usage:
+    python config_diff.py <manifest_file> <old_config> <new_config>
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+from config import Config, InvalidConfigError
+import core
+import existing_dictionaries
+import incremental
+import ipa_utils
+import postprocessing
+from steno import StrokeSequence
+import stroke_builder
+
+INDEX_EXTENSION = ".atoms"
+INDEX_VERSION = 1
+
+_STR_VERSION = "version"
+_STR_SYLLABIFICATION_FINGERPRINT = "syllabification_fingerprint"
+_STR_MANIFEST_SIZE = "manifest_size"
+_STR_MANIFEST_MTIME_NS = "manifest_mtime_ns"
+_STR_ATOMS = "atoms"
+_STR_NUM_WORDS = "num_words"
+_STR_NUM_RETRANSLATED = "num_retranslated"
+_STR_CHANGES = "changes"
+_STR_WORD = "word"
+_STR_REMOVED = "removed"
+_STR_ADDED = "added"
+
+
+class ManifestMismatchError(Exception):
+    """Error for when a manifest wasn't saved by a run with the old config.
+
+    This should be raised when the manifest doesn't exist, can't be read, or
+    was made with a different config or different existing dictionaries.
+    """
+
+
+class EntryChange:
+    """How one word's entries changed.
+
+    Attributes:
+        word: The word.
+        removed: A list of the stroke strings the word no longer has.
+        added: A list of the stroke strings the word has now that it didn't
+            have before.
+    """
+
+    __slots__ = ["word", "removed", "added"]
+
+    def __init__(self, word, removed, added):
+        self.word = word
+        self.removed = removed
+        self.added = added
+
+
+class ConfigDiff:
+    """The changes to a dictionary caused by changing its config.
+
+    Attributes:
+        num_words: The number of words in the word list.
+        num_retranslated: The number of words that were translated again.
+        changes: A list of EntryChange, in word list order, for each word
+            whose stroke sequences changed after conflicts were resolved.
+    """
+
+    def __init__(self, num_words, num_retranslated, changes):
+        self.num_words = num_words
+        self.num_retranslated = num_retranslated
+        self.changes = changes
+
+    def to_json(self):
+        """Return the diff as a dictionary that can be written as JSON."""
+
+        return {
+            _STR_NUM_WORDS: self.num_words,
+            _STR_NUM_RETRANSLATED: self.num_retranslated,
+            _STR_CHANGES: [
+                {_STR_WORD: change.word, _STR_REMOVED: change.removed, _STR_ADDED: change.added}
+                for change in self.changes
+            ],
+        }
+
+
+def get_default_index_file(manifest_file):
+    """Return the sidecar atom index filename used for a manifest."""
+
+    return manifest_file + INDEX_EXTENSION
+
+
+def build_atom_index(entries, config):
+    """Index which words contain each atom.
+
+    Args:
+        entries: A list of incremental.ManifestEntry.
+        config: The Config to split the entries' pronunciations with.
+
+    Returns:
+        A dictionary mapping each atom id to a sorted list of the positions in
+        `entries` of the words with a pronunciation containing the atom.
+        Pronunciations that can't be split aren't indexed, since they can't be
+        translated with any config that splits IPA the same way.
+    """
+
+    atom_index = {}
+
+    for position, entry in enumerate(entries):
+        if entry.ipa is None:
+            continue
+
+        atom_ids = set()
+        for ipa in entry.ipa:
+            try:
+                syllables = ipa_utils.split_ipa_into_syllables_or_raise(ipa, config)
+            except ipa_utils.SyllableSplitError:
+                continue
+
+            for syllable in syllables:
+                atom_ids.update(syllable.get_atom_ids())
+
+        for atom_id in atom_ids:
+            atom_index.setdefault(atom_id, []).append(position)
+
+    return atom_index
+
+
+def load_atom_index(index_file, manifest_file, config):
+    """Load a saved atom index if it's current.
+
+    Returns:
+        The dictionary returned by build_atom_index(), or None if the index
+        doesn't exist, can't be read, or was built from a different manifest or
+        with a config that splits IPA differently.
+    """
+
+    if not os.path.exists(index_file):
+        return None
+
+    try:
+        with open(index_file, "r", encoding="UTF-8") as file:
+            saved = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    manifest_stat = os.stat(manifest_file)
+    if (
+        saved.get(_STR_VERSION) != INDEX_VERSION
+        or saved.get(_STR_SYLLABIFICATION_FINGERPRINT) != config.get_syllabification_fingerprint()
+        or saved.get(_STR_MANIFEST_SIZE) != manifest_stat.st_size
+        or saved.get(_STR_MANIFEST_MTIME_NS) != manifest_stat.st_mtime_ns
+    ):
+        return None
+
+    return {int(atom_id): positions for atom_id, positions in saved[_STR_ATOMS].items()}
+
+
+def save_atom_index(index_file, manifest_file, config, atom_index):
+    """Save an atom index built with build_atom_index() for a manifest."""
+
+    manifest_stat = os.stat(manifest_file)
+    saved = {
+        _STR_VERSION: INDEX_VERSION,
+        _STR_SYLLABIFICATION_FINGERPRINT: config.get_syllabification_fingerprint(),
+        _STR_MANIFEST_SIZE: manifest_stat.st_size,
+        _STR_MANIFEST_MTIME_NS: manifest_stat.st_mtime_ns,
+        _STR_ATOMS: atom_index,
+    }
+
+    # Write to a temporary file first so an interrupted write can't leave a
+    # corrupt index behind.
+    temp_file = index_file + ".tmp"
+    with open(temp_file, "w", encoding="UTF-8") as file:
+        json.dump(saved, file, separators=(",", ":"))
+    os.replace(temp_file, index_file)
+
+
+def find_changed_clusters(old_config, new_config):
+    """Find the phoneme clusters whose possible keys differ between two configs.
+
+    Both configs must have the same syllabification fingerprint, so that their
+    atom ids are the same.
+
+    Returns:
+        A list of tuples of atom ids (see
+        Config.get_atom_ids_to_possible_key_clusters()) for each cluster that
+        was added, removed, or mapped to different keys.
+    """
+
+    old_clusters = old_config.get_atom_ids_to_possible_key_clusters()
+    new_clusters = new_config.get_atom_ids_to_possible_key_clusters()
+
+    return [
+        atom_ids
+        for atom_ids in old_clusters.keys() | new_clusters.keys()
+        if old_clusters.get(atom_ids) != new_clusters.get(atom_ids)
+    ]
+
+
+def find_affected_positions(atom_index, changed_clusters):
+    """Find the words that contain every atom of some changed cluster.
+
+    Args:
+        atom_index: The dictionary returned by build_atom_index().
+        changed_clusters: The list returned by find_changed_clusters().
+
+    Returns:
+        A sorted list of positions in the manifest.
+    """
+
+    affected = set()
+
+    for atom_ids in changed_clusters:
+        # Start from the atom with the fewest words.
+        position_lists = sorted((atom_index.get(atom_id, []) for atom_id in atom_ids), key=len)
+        positions = set(position_lists[0])
+        for other_positions in position_lists[1:]:
+            positions.intersection_update(other_positions)
+
+        affected.update(positions)
+
+    return sorted(affected)
+
+
+def diff_configs(
+    manifest_file, old_config, new_config, existing=None, index_file=None
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    """Find how changing a dictionary's config changes its entries.
+
+    Args:
+        manifest_file: The manifest saved by an incremental run with
+            `old_config` (see incremental.py).
+        old_config: The Config the manifest was made with.
+        new_config: The changed Config.
+        existing: An optional ExistingDictionaries that the manifest's run
+            was given (see existing_dictionaries.py).
+        index_file: The atom index file to use, or None to use the default
+            one next to the manifest. It's built if it isn't current.
+
+    Raises:
+        ManifestMismatchError: If the manifest wasn't saved by an incremental
+            run with `old_config` and `existing`.
+
+    Returns:
+        A ConfigDiff.
+    """
+
+    log = logging.getLogger("dictionary_generator")
+    entries = incremental.load_manifest(
+        manifest_file, existing_dictionaries.fingerprint_config(old_config, existing)
+    )
+    if entries is None:
+        raise ManifestMismatchError(
+            f"`{manifest_file}` wasn't saved by an incremental run with the old config"
+        )
+
+    if (
+        old_config.get_syllabification_fingerprint()
+        != new_config.get_syllabification_fingerprint()
+        or old_config.get_stroke_postprocessing_fingerprint()
+        != new_config.get_stroke_postprocessing_fingerprint()
+    ):
+        log.info("The config change affects how every word is split or postprocessed")
+        affected = list(range(len(entries)))
+    else:
+        index_file = index_file or get_default_index_file(manifest_file)
+        atom_index = load_atom_index(index_file, manifest_file, new_config)
+        if atom_index is None:
+            log.info("Building the atom index `%s`", index_file)
+            atom_index = build_atom_index(entries, new_config)
+            save_atom_index(index_file, manifest_file, new_config, atom_index)
+
+        affected = find_affected_positions(
+            atom_index, find_changed_clusters(old_config, new_config)
+        )
+
+    # Conflicts are resolved in word list order, so every resolution from the
+    # first affected word onward may change. They also all change if the
+    # disambiguator stroke does.
+    first_affected = affected[0] if affected else len(entries)
+    if old_config.get_disambiguator_stroke() != new_config.get_disambiguator_stroke():
+        first_affected = 0
+
+    changes = _retranslate(entries, new_config, existing, set(affected), first_affected)
+
+    return ConfigDiff(len(entries), len(affected), changes)
+
+
+def _retranslate(entries, config, existing, affected, first_affected):
+    used_keys = existing.get_used_keys() if existing is not None else None
+    disambiguator = postprocessing.create_disambiguator(config, used_keys)
+    stroke_cache = stroke_builder.StrokeCache()
+    changes = []
+
+    for position, entry in enumerate(entries):
+        if position < first_affected:
+            if disambiguator is not None:
+                disambiguator.mark_used_packed(entry.resolved_translations)
+            continue
+
+        if position in affected:
+            word_to_ipa = {entry.word.lower(): entry.ipa} if entry.ipa is not None else {}
+            translations = core.translate_word(entry.word, word_to_ipa, config, stroke_cache)
+        else:
+            translations = [StrokeSequence.from_ints(ints) for ints in entry.translations]
+
+        postprocessing.postprocess_generated_dictionary(
+            [(entry.word, translations)], config, disambiguator
+        )
+
+        if [translation.to_ints() for translation in translations] == entry.resolved_translations:
+            continue
+
+        old_strings = [str(StrokeSequence.from_ints(ints)) for ints in entry.resolved_translations]
+        new_strings = [str(translation) for translation in translations]
+        changes.append(
+            EntryChange(
+                entry.word,
+                [string for string in old_strings if string not in new_strings],
+                [string for string in new_strings if string not in old_strings],
+            )
+        )
+
+    return changes
+
+
+def print_diff(diff):
+    """Print the changed entries of a ConfigDiff and a summary."""
+
+    for change in diff.changes:
+        print(change.word)
+        for string in change.removed:
+            print(f"  - {string}")
+        for string in change.added:
+            print(f"  + {string}")
+
+    print(
+        f"Translated {diff.num_retranslated} of {diff.num_words} words again; "
+        + f"{len(diff.changes)} words have changed entries"
+    )
+
+
+def main():
+    """Diff two configs using command-line arguments."""
+
+    parser = argparse.ArgumentParser(
+        description="Show how a config change affects a generated dictionary."
+    )
+    parser.add_argument(
+        "manifest_file",
+        help="the manifest saved by an incremental run with the old config (see --incremental)",
+    )
+    parser.add_argument("old_config_file", help="the config the manifest was made with")
+    parser.add_argument("new_config_file", help="the changed config")
+    parser.add_argument(
+        "--existing-dictionary",
+        action="append",
+        default=[],
+        dest="existing_dictionaries",
+        metavar="DICTIONARY",
+        help="a JSON dictionary the manifest's run was given (can be given more than once)",
+    )
+    parser.add_argument("-o", "--output_file", help="also write the diff as JSON here")
+    parser.add_argument(
+        "-v", "--verbose", action="count", default=0, help="increase output verbosity"
+    )
+    args = parser.parse_args()
+
+    # Translation warnings for individual words aren't useful here.
+    log_level = logging.ERROR
+    if args.verbose == 1:
+        log_level = logging.INFO
+    elif args.verbose >= 2:
+        log_level = logging.DEBUG
+
+    logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s")
+    log = logging.getLogger("dictionary_generator")
+
+    try:
+        old_config = Config(args.old_config_file)
+        new_config = Config(args.new_config_file)
+    except InvalidConfigError as err:
+        log.critical(err)
+        sys.exit(1)
+
+    try:
+        existing = existing_dictionaries.load_existing_dictionaries(
+            args.existing_dictionaries, new_config
+        )
+    except (OSError, ValueError) as err:
+        log.critical("Unable to load existing dictionaries: %s", err)
+        sys.exit(1)
+
+    try:
+        diff = diff_configs(args.manifest_file, old_config, new_config, existing)
+    except ManifestMismatchError as err:
+        log.critical(err)
+        sys.exit(1)
+
+    print_diff(diff)
+
+    if args.output_file is not None:
+        with open(args.output_file, "w", encoding="UTF-8") as file:
+            json.dump(diff.to_json(), file, ensure_ascii=False, indent=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Report how often generated stroke sequences conflict.
+
+When two words are translated to the same stroke sequence, the conflict is
+resolved by appending the disambiguator stroke to the later word's sequence
+(see postprocessing.Disambiguator). This module analyzes translations before
+conflicts are resolved so that conflict rates can be compared as the theory
+changes.
+
+Every translation is grouped by its stroke sequence in a single pass, and the
+number of disambiguator strokes each one needs is worked out in the same pass
+with a postprocessing.Disambiguator, so the analysis takes linear time.
+
+Usage:
+    python conflicts.py <ipa_file> <word_list_file> --config_file <config>
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from config import Config, InvalidConfigError
+import core
+import ipa_utils
+import postprocessing
+
+_STR_NUM_WORDS = "num_words"
+_STR_NUM_TRANSLATIONS = "num_translations"
+_STR_NUM_CONFLICT_GROUPS = "num_conflict_groups"
+_STR_NUM_CONFLICTING_TRANSLATIONS = "num_conflicting_translations"
+_STR_NUM_DISAMBIGUATOR_STROKES = "num_disambiguator_strokes"
+_STR_CONFLICT_GROUPS = "conflict_groups"
+_STR_DISAMBIGUATOR_STROKES_PER_WORD = "disambiguator_strokes_per_word"
+
+
+class ConflictReport:
+    """The conflicts between translations of a word list.
+
+    Attributes:
+        num_words: The number of translated words.
+        num_translations: The number of stroke sequences for all words.
+        conflict_groups: A dictionary mapping each stroke string that more than
+            one word was translated to, to the list of those words in word list
+            order.
+        disambiguator_strokes_per_word: A dictionary mapping each word that
+            needed the disambiguator stroke to the total number of
+            disambiguator strokes appended to its stroke sequences.
+    """
+
+    def __init__(
+        self, num_words, num_translations, conflict_groups, disambiguator_strokes_per_word
+    ):
+        self.num_words = num_words
+        self.num_translations = num_translations
+        self.conflict_groups = conflict_groups
+        self.disambiguator_strokes_per_word = disambiguator_strokes_per_word
+
+    def get_num_conflicting_translations(self):
+        """Return how many translations share their stroke sequence with another word."""
+
+        return sum(len(words) for words in self.conflict_groups.values())
+
+    def get_num_disambiguator_strokes(self):
+        """Return how many disambiguator strokes are appended in total."""
+
+        return sum(self.disambiguator_strokes_per_word.values())
+
+    def get_largest_conflict_groups(self, limit):
+        """Return up to `limit` (stroke string, words) tuples, largest first."""
+
+        groups = sorted(self.conflict_groups.items(), key=lambda group: -len(group[1]))
+        return groups[:limit]
+
+    def get_words_with_most_disambiguator_strokes(self, limit):
+        """Return up to `limit` (word, number of strokes) tuples, most first."""
+
+        words = sorted(self.disambiguator_strokes_per_word.items(), key=lambda item: -item[1])
+        return words[:limit]
+
+    def to_json(self):
+        """Return the report as a dictionary that can be written as JSON."""
+
+        return {
+            _STR_NUM_WORDS: self.num_words,
+            _STR_NUM_TRANSLATIONS: self.num_translations,
+            _STR_NUM_CONFLICT_GROUPS: len(self.conflict_groups),
+            _STR_NUM_CONFLICTING_TRANSLATIONS: self.get_num_conflicting_translations(),
+            _STR_NUM_DISAMBIGUATOR_STROKES: self.get_num_disambiguator_strokes(),
+            _STR_CONFLICT_GROUPS: self.conflict_groups,
+            _STR_DISAMBIGUATOR_STROKES_PER_WORD: self.disambiguator_strokes_per_word,
+        }
+
+
+def analyze_conflicts(words_and_translations, config):
+    """Find the conflicts between translations before they're resolved.
+
+    Args:
+        words_and_translations: A list of tuples where the first item in each
+            tuple is a word and the second item is a list of StrokeSequences,
+            in word list order and before conflicts were resolved.
+        config: The Config the words were translated with. If it doesn't
+            enable the disambiguator stroke, no disambiguator strokes are
+            counted.
+
+    Returns:
+        A ConflictReport.
+    """
+
+    disambiguator = postprocessing.create_disambiguator(config)
+    words_by_key = {}
+    translation_by_key = {}
+    disambiguator_strokes_per_word = {}
+    num_translations = 0
+
+    for word, translations in words_and_translations:
+        num_translations += len(translations)
+
+        for translation in translations:
+            key = postprocessing.get_sequence_key(translation)
+            words = words_by_key.get(key)
+            if words is None:
+                words_by_key[key] = [word]
+                translation_by_key[key] = translation
+            else:
+                words.append(word)
+
+            if disambiguator is None:
+                continue
+
+            num_appended = disambiguator.claim(translation)
+            if num_appended > 0:
+                disambiguator_strokes_per_word[word] = (
+                    disambiguator_strokes_per_word.get(word, 0) + num_appended
+                )
+
+    # Only conflicting sequences need to be converted to strings.
+    conflict_groups = {
+        str(translation_by_key[key]): words
+        for key, words in words_by_key.items()
+        if len(words) > 1
+    }
+
+    return ConflictReport(
+        len(words_and_translations),
+        num_translations,
+        conflict_groups,
+        disambiguator_strokes_per_word,
+    )
+
+
+def translate_words(ipa_file, word_list_file, config):
+    """Translate a word list without resolving conflicts.
+
+    Returns:
+        A list of tuples where the first item in each tuple is a word and the
+        second item is a list of StrokeSequences, for every word that could be
+        translated.
+    """
+
+    words = core.read_word_list(word_list_file)
+    word_to_ipa = ipa_utils.create_ipa_lookup_dictionary(ipa_file, words)
+    ipa_utils.IpaNormalizer.from_config(config).normalize_lookup_dictionary(word_to_ipa)
+    words_and_translations = []
+
+    for word in words:
+        translations = core.translate_word(word, word_to_ipa, config)
+        if len(translations) > 0:
+            words_and_translations.append((word, translations))
+
+    return words_and_translations
+
+
+def print_report(report, limit):
+    """Print a summary of a ConflictReport with its `limit` worst offenders."""
+
+    num_conflicting = report.get_num_conflicting_translations()
+    percent = 100 * num_conflicting / report.num_translations if report.num_translations else 0
+
+    print(f"Words: {report.num_words}")
+    print(f"Stroke sequences: {report.num_translations}")
+    print(f"Conflicting stroke sequences: {num_conflicting} ({percent:.1f}%)")
+    print(f"Conflict groups: {len(report.conflict_groups)}")
+    print(f"Disambiguator strokes appended: {report.get_num_disambiguator_strokes()}")
+
+    print("\nLargest conflict groups:")
+    for translation_str, words in report.get_largest_conflict_groups(limit):
+        print(f"  {translation_str}: {len(words)} words: {', '.join(words)}")
+
+    print("\nWords with the most disambiguator strokes:")
+    for word, num_strokes in report.get_words_with_most_disambiguator_strokes(limit):
+        print(f"  {word}: {num_strokes}")
+
+
+def main():
+    """Analyze the conflicts of a word list using command-line arguments."""
+
+    parser = argparse.ArgumentParser(description="Report conflicts between generated strokes.")
+    parser.add_argument("ipa_file", type=str, help="the IPA CSV dictionary")
+    parser.add_argument(
+        "word_list_file", type=str, help="the file containing words generate strokes for"
+    )
+    parser.add_argument(
+        "--config_file",
+        type=str,
+        required=True,
+        help="the config file specifying how to generate strokes for words",
+    )
+    parser.add_argument(
+        "--limit", type=int, default=20, help="how many of the worst offenders to print"
+    )
+    parser.add_argument("-o", "--output_file", help="also write the full report as JSON here")
+    parser.add_argument(
+        "-v", "--verbose", action="count", default=0, help="increase output verbosity"
+    )
+    args = parser.parse_args()
+
+    # Translation warnings for individual words aren't useful here.
+    log_level = logging.ERROR
+    if args.verbose == 1:
+        log_level = logging.INFO
+    elif args.verbose >= 2:
+        log_level = logging.DEBUG
+
+    logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s")
+    log = logging.getLogger("dictionary_generator")
+
+    try:
+        config = Config(args.config_file)
+    except InvalidConfigError as err:
+        log.critical(err)
+        sys.exit(1)
+
+    report = analyze_conflicts(translate_words(args.ipa_file, args.word_list_file, config), config)
+    print_report(report, args.limit)
+
+    if args.output_file is not None:
+        with open(args.output_file, "w", encoding="UTF-8") as file:
+            json.dump(report.to_json(), file, ensure_ascii=False, indent=0)
+
+
+if __name__ == "__main__":
+    main()
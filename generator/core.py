@@ -1,111 +1,427 @@
 """Generate a steno dictionary by converting words to strokes."""
 
+import contextlib
+import itertools
+import json
 import logging
+import time
 
+import binary_dictionary
+import checkpoint
+import generated_dictionary
+import ipa_lexicon
 import ipa_utils
 import postprocessing
+import sqlite_dictionary
 import stroke_builder
 
+OUTPUT_FORMAT_JSON = "json"
+OUTPUT_FORMAT_BINARY = "binary"
+OUTPUT_FORMAT_SQLITE = "sqlite"
+OUTPUT_FORMATS = [OUTPUT_FORMAT_JSON, OUTPUT_FORMAT_BINARY, OUTPUT_FORMAT_SQLITE]
 
-def generate_dictionary(ipa_file, word_list_file, config):
+# The number of entries to join together before writing them to a file.
+_ENTRIES_PER_WRITE = 1 << 16
+
+# Quote a string and escape it for JSON, keeping non-ASCII characters as is.
+# This uses the same C implementation as the json module.
+_encode_json_string = json.encoder.encode_basestring
+
+
+def generate_dictionary(
+    ipa_file,
+    word_list_file,
+    config,
+    checkpoint_file=None,
+    resume=False,
+    existing_dictionaries=None,
+    use_ipa_index=False,
+    reuse_strokes=False,
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
     """Create a dictionary mapping a word to ways to write it in steno.
 
     Args:
         ipa_file: A CSV file that gives the pronunciation in IPA for a word.
             Each line should be "<word>,/<ipa1>/,/<ipa2>/..." so that each
-            prononciation (ipa1, ipa2, ...) is between slashes.
+            prononciation (ipa1, ipa2, ...) is between slashes. This can also
+            be a list of files, highest priority first, and each word uses the
+            pronunciations from the first file that has it.
         word_list_file: A file of words that should be translated into steno
             strokes. Each word should be on its own line. If the word does not
             have an entry in the `ipa_file` then its steno strokes cannot be
             generated.
+        config: The Config specifying how strokes should be generated.
+        checkpoint_file: An optional file to periodically save progress to so
+            that an interrupted run can be resumed. It's removed once the
+            dictionary is generated.
+        resume: True if progress should be restored from `checkpoint_file`
+            before translating the rest of the words.
+        existing_dictionaries: An optional ExistingDictionaries (see
+            existing_dictionaries.py). Words they define aren't translated, and
+            their stroke sequences are treated as taken when resolving
+            conflicts.
+        use_ipa_index: True if pronunciations should be looked up with an
+            index of each IPA file (see ipa_lexicon.py) instead of reading
+            them. This is much faster for short word lists.
+        reuse_strokes: True if the strokes built for each syllable, and for
+            the first syllables of each word, should be reused for later words
+            (see stroke_builder.StrokeCache). The result is the same, but
+            building strokes is faster for long word lists.
     Returns:
-        A list of tuples where the first item in each tuple is a word from
+        A GeneratedDictionary (see generated_dictionary.py). Iterating over it
+        gives tuples where the first item in each tuple is a word from
         `word_list_file` and the second item in the tuple is a list of
         StrokeSequences, giving the valid ways to steno that word.
     """
 
-    # Make a list of tuples. The first part of the tuple is the desired word,
-    # and the second part is a list of ways to write it in steno.
-    words_and_translations = []
-    word_to_ipa = ipa_utils.create_ipa_lookup_dictionary(ipa_file)
+    # Store each translated word along with the ways to write it in steno.
+    words_and_translations = generated_dictionary.GeneratedDictionary()
+    words = read_word_list(word_list_file)
+    start_position = 0
+    used_keys = None
 
-    num_words_requested = 0
-    num_words_translated = 0
+    if existing_dictionaries is not None:
+        words = existing_dictionaries.filter_words(words)
+        used_keys = existing_dictionaries.get_used_keys()
 
-    log = logging.getLogger("dictionary_generator")
+    disambiguator = postprocessing.create_disambiguator(config, used_keys)
+
+    inputs_fingerprint = None
+    if checkpoint_file is not None:
+        inputs_fingerprint = checkpoint.fingerprint_inputs(
+            ipa_file, word_list_file, config, existing_dictionaries
+        )
+
+    if resume and checkpoint_file is not None:
+        saved = checkpoint.load_checkpoint(checkpoint_file, inputs_fingerprint)
+        if saved is not None:
+            start_position = saved.position
+            words_and_translations = saved.words_and_translations
+            disambiguator = postprocessing.create_disambiguator(
+                config, saved.used_keys, saved.next_counts
+            )
+
+    stroke_cache = stroke_builder.StrokeCache() if reuse_strokes else None
+
+    # The IPA index's files are closed even if the run is interrupted.
+    with open_pronunciations(ipa_file, words[start_position:], config, use_ipa_index) as (
+        word_to_ipa
+    ):
+        last_checkpoint_time = time.monotonic()
+
+        for position in range(start_position, len(words)):
+            word = words[position]
+            translations_for_word = translate_word(word, word_to_ipa, config, stroke_cache)
+
+            if len(translations_for_word) > 0:
+                # Conflicts are resolved in word list order, so resolving them
+                # as each word is translated gives the same result as resolving
+                # them once every word is translated.
+                postprocessing.postprocess_generated_dictionary(
+                    [(word, translations_for_word)], config, disambiguator
+                )
+                words_and_translations.append(word, translations_for_word)
+
+            if (
+                checkpoint_file is not None
+                and time.monotonic() - last_checkpoint_time
+                >= checkpoint.CHECKPOINT_INTERVAL_SECONDS
+            ):
+                used_keys = None
+                next_counts = None
+                if disambiguator is not None:
+                    used_keys = disambiguator.get_used_keys()
+                    next_counts = disambiguator.get_next_counts()
+
+                checkpoint.save_checkpoint(
+                    checkpoint_file,
+                    inputs_fingerprint,
+                    checkpoint.Checkpoint(
+                        position + 1, words_and_translations, used_keys, next_counts
+                    ),
+                )
+                last_checkpoint_time = time.monotonic()
+
+    print_translation_summary(len(words_and_translations), len(words))
+
+    if checkpoint_file is not None:
+        checkpoint.remove_checkpoint(checkpoint_file)
+
+    return words_and_translations
+
+
+def open_pronunciations(ipa_file, words, config, use_ipa_index=False):
+    """Load the normalized pronunciations of a list of words.
+
+    Args:
+        ipa_file: An IPA file, or a list of them; see generate_dictionary().
+        words: The words whose pronunciations are needed.
+        config: The Config specifying how to normalize pronunciations.
+        use_ipa_index: True if pronunciations should be looked up with an
+            index of each IPA file (see ipa_lexicon.py) instead of reading
+            them.
+
+    Returns:
+        A context manager giving a LayeredIpaLexicon if `use_ipa_index` is
+        True, or otherwise a dictionary from create_ipa_lookup_dictionary().
+        Either maps lowercased words to their normalized pronunciations. The
+        lexicon is closed when the context exits.
+    """
+
+    normalizer = ipa_utils.IpaNormalizer.from_config(config)
+    if use_ipa_index:
+        return ipa_lexicon.LayeredIpaLexicon(ipa_file, normalizer)
+
+    return contextlib.nullcontext(
+        normalizer.normalize_lookup_dictionary(
+            ipa_utils.create_ipa_lookup_dictionary(ipa_file, words)
+        )
+    )
+
+
+def read_word_list(word_list_file):
+    """Read the words to translate.
+
+    Args:
+        word_list_file: A file with one word on each line.
+
+    Returns:
+        A list of the words in the file, in order, with surrounding whitespace
+        removed.
+    """
 
     with open(word_list_file, "r", encoding="UTF-8") as file:
-        for line in file:
-            num_words_requested += 1
-            word = line.strip()
-            word_lower = word.lower()
-            translations_for_word = []  # A list of ways to write the word.
+        return [line.strip() for line in file]
+
 
-            log.debug("Translating `%s`", word)
+def translate_word(word, word_to_ipa, config, stroke_cache=None):
+    """Find all the ways to write a word in steno.
 
-            if word_lower not in word_to_ipa:
-                log.warning("No translation for `%s` (missing IPA entry)", word)
-                continue
+    This does not perform postprocessing that depends on other words, such as
+    resolving conflicts; see postprocessing.postprocess_generated_dictionary().
 
-            for ipa in word_to_ipa[word_lower]:
-                syllables = ipa_utils.split_ipa_into_syllables(ipa, config)
+    Args:
+        word: The word to translate.
+        word_to_ipa: A dictionary mapping lowercased words to a list of their
+            IPA pronunciations, as returned by
+            ipa_utils.create_ipa_lookup_dictionary(), or an IpaLexicon or
+            LayeredIpaLexicon.
+        config: The Config specifying how strokes should be generated.
+        stroke_cache: An optional stroke_builder.StrokeCache to reuse strokes
+            built for other words from.
 
-                if syllables is None:
-                    continue
+    Returns:
+        A sorted list of unique StrokeSequences for the word. The list is empty
+        if the word could not be translated.
+    """
 
-                log.debug("Converting %s to steno", [str(s) for s in syllables])
-                translations = stroke_builder.syllables_to_steno(syllables, config)
-                if translations is not None:
-                    log.debug("Generated %s for `%s`", translations, word)
-                    translations_for_word += translations
+    log = logging.getLogger("dictionary_generator")
+    word_lower = word.lower()
 
-            # Remove duplicate translations.
-            translations_for_word = sorted(list(set(translations_for_word)))
+    log.debug("Translating `%s`", word)
 
-            if len(translations_for_word) == 0:
-                log.warning("No translation for `%s`", word)
-            else:
-                words_and_translations.append((word, translations_for_word))
-                num_words_translated += 1
+    if word_lower not in word_to_ipa:
+        log.warning("No translation for `%s` (missing IPA entry)", word)
+        return []
 
-    print(
-        f"Generated translations for {num_words_translated} out of "
-        + f"{num_words_requested} words"
+    # Split each pronunciation only when it's about to be translated.
+    syllables_for_each_pronunciation = (
+        ipa_utils.split_ipa_into_syllables(ipa, config) for ipa in word_to_ipa[word_lower]
     )
 
-    # Perform postprocessing on the whole dictionary.
-    words_and_translations = postprocessing.postprocess_generated_dictionary(
-        words_and_translations, config
+    return translate_syllables(word, syllables_for_each_pronunciation, config, stroke_cache)
+
+
+def translate_syllables(word, syllables_for_each_pronunciation, config, stroke_cache=None):
+    """Find all the ways to write a word in steno from its syllables.
+
+    This is the same as translate_word(), for a word whose pronunciations have
+    already been split into syllables.
+
+    Args:
+        word: The word to translate.
+        syllables_for_each_pronunciation: An iterable with the list of
+            Syllables returned by ipa_utils.split_ipa_into_syllables() for each
+            of the word's pronunciations, or None for pronunciations that
+            couldn't be split.
+        config: The Config specifying how strokes should be generated. It must
+            split pronunciations the same way as the Config the syllables were
+            split with (see Config.get_syllabification_fingerprint()).
+        stroke_cache: An optional stroke_builder.StrokeCache to reuse strokes
+            built for other words from.
+
+    Returns:
+        A sorted list of unique StrokeSequences for the word. The list is empty
+        if the word could not be translated.
+    """
+
+    log = logging.getLogger("dictionary_generator")
+    translations_for_word = []  # A list of ways to write the word.
+
+    for syllables in syllables_for_each_pronunciation:
+        if syllables is None:
+            continue
+
+        log.debug("Converting %s to steno", [str(s) for s in syllables])
+        translations = stroke_builder.syllables_to_steno(syllables, config, stroke_cache)
+        if translations is not None:
+            log.debug("Generated %s for `%s`", translations, word)
+            translations_for_word += translations
+
+    # Remove duplicate translations.
+    translations_for_word = sorted(list(set(translations_for_word)))
+
+    if len(translations_for_word) == 0:
+        log.warning("No translation for `%s`", word)
+
+    return translations_for_word
+
+
+def describe_syllables(words_and_translations, ipa_file, config):
+    """Describe how each translated word was split into syllables.
+
+    Args:
+        words_and_translations: The returned value from generate_dictionary().
+        ipa_file: The IPA file, or list of them, the words were translated
+            from.
+        config: The Config the words were translated with.
+
+    Returns:
+        A dictionary mapping each word to a string like "kæt.ə.lɔɡ", with the
+        syllables of each pronunciation separated by dots and pronunciations
+        separated by " | ".
+    """
+
+    word_to_ipa = ipa_utils.create_ipa_lookup_dictionary(
+        ipa_file, (word for word, _ in generated_dictionary.iter_packed(words_and_translations))
     )
+    ipa_utils.IpaNormalizer.from_config(config).normalize_lookup_dictionary(word_to_ipa)
+    word_to_syllables = {}
+
+    for word, _ in words_and_translations:
+        word_to_syllables[word] = describe_pronunciations(
+            word_to_ipa.get(word.lower(), []), config
+        )
+
+    return word_to_syllables
 
-    return words_and_translations
 
+def describe_pronunciations(pronunciations, config):
+    """Describe how a word's pronunciations are split into syllables.
+
+    Args:
+        pronunciations: A list of the word's normalized IPA pronunciations.
+        config: The Config to split the pronunciations with.
+
+    Returns:
+        A string in the format of the values returned by describe_syllables().
+    """
+
+    descriptions = []
+    for ipa in pronunciations:
+        syllables = ipa_utils.split_ipa_into_syllables(ipa, config)
+        if syllables is not None:
+            descriptions.append(".".join(str(syllable) for syllable in syllables))
+
+    return " | ".join(descriptions)
+
+
+def print_translation_summary(num_words_translated, num_words_requested):
+    """Print how many of the requested words have translations."""
+
+    print(
+        f"Generated translations for {num_words_translated} out of "
+        + f"{num_words_requested} words"
+    )
 
-def write_dictionary_to_file(words_and_translations, output_file):
-    """Write steno strokes for words to a file in JSON format.
+
+def write_dictionary_to_file(
+    words_and_translations,
+    output_file,
+    compact=False,
+    sort_by_stroke=False,
+    output_format=OUTPUT_FORMAT_JSON,
+    word_to_syllables=None,
+    source_file=None,
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    """Write steno strokes for words to a file.
 
     Args:
         words_and_translations: the returned value from generate_dictionary().
-        output_file: the name of the output file. This should be a JSON file.
+        output_file: the name of the output file.
+        compact: True if the JSON should be written without any whitespace.
+            Otherwise each entry is written on its own line. This only applies
+            to the JSON format.
+        sort_by_stroke: True if entries should be sorted by their stroke
+            sequence. Otherwise entries are in the same order as
+            `words_and_translations`. This only applies to the JSON format;
+            the binary format is always sorted.
+        output_format: OUTPUT_FORMAT_JSON to write a JSON dictionary,
+            OUTPUT_FORMAT_BINARY to write a memory-mappable dictionary (see
+            binary_dictionary.py), or OUTPUT_FORMAT_SQLITE to write an indexed
+            SQLite database (see sqlite_dictionary.py).
+        word_to_syllables: An optional dictionary from describe_syllables() to
+            store with each entry. This only applies to the SQLite format.
+        source_file: The word list the dictionary was generated from, stored
+            with each entry. This only applies to the SQLite format, where it's
+            required.
     """
 
     num_entries = 0
     num_strokes = 0
+    for _, packed_translations in generated_dictionary.iter_packed(words_and_translations):
+        num_entries += len(packed_translations)
+        num_strokes += sum(len(packed_strokes) for packed_strokes in packed_translations)
 
-    with open(output_file, "w+", encoding="UTF-8") as output:
-        output.write("{\n")
+    if output_format == OUTPUT_FORMAT_BINARY:
+        binary_dictionary.write_generated_dictionary(words_and_translations, output_file)
+    elif output_format == OUTPUT_FORMAT_SQLITE:
+        sqlite_dictionary.write_generated_dictionary(
+            words_and_translations, output_file, source_file, word_to_syllables
+        )
+    else:
+        _write_json_dictionary(words_and_translations, output_file, compact, sort_by_stroke)
 
-        for i, (word, translations) in enumerate(words_and_translations):
-            for k, stroke_sequence in enumerate(translations):
-                line = f'"{str(stroke_sequence)}": "{word}"'
-                if i < len(words_and_translations) - 1 or k < len(translations) - 1:
-                    line += ","
+    print(f"Generated {num_strokes} strokes for {num_entries} entries")
 
-                output.write(f"{line}\n")
 
-                num_entries += 1
-                num_strokes += len(stroke_sequence.get_strokes())
+def _write_json_dictionary(words_and_translations, output_file, compact, sort_by_stroke):
+    # Entries are formatted from their packed strokes as they're written so
+    # that, unless they have to be sorted, they aren't all held in memory.
+    entries = (
+        (packed_strokes, word)
+        for word, packed_translations in generated_dictionary.iter_packed(words_and_translations)
+        for packed_strokes in packed_translations
+    )
 
-        output.write("}")
+    if sort_by_stroke:
+        entries = iter(
+            sorted(entries, key=lambda entry: generated_dictionary.get_packed_sort_key(entry[0]))
+        )
 
-    print(f"Generated {num_strokes} strokes for {num_entries} entries")
+    if compact:
+        opening, entry_separator, key_separator, closing = ("{", ",", ":", "}")
+    else:
+        opening, entry_separator, key_separator, closing = ("{\n", ",\n", ": ", "\n}")
+
+    with open(output_file, "w", encoding="UTF-8") as output:
+        output.write(opening)
+        wrote_entry = False
+
+        # Join entries into large chunks so there are few calls to write().
+        while True:
+            chunk = [
+                _encode_json_string(generated_dictionary.format_packed_strokes(packed_strokes))
+                + key_separator
+                + _encode_json_string(word)
+                for packed_strokes, word in itertools.islice(entries, _ENTRIES_PER_WRITE)
+            ]
+            if len(chunk) == 0:
+                break
+
+            if wrote_entry:
+                output.write(entry_separator)
+            output.write(entry_separator.join(chunk))
+            wrote_entry = True
+
+        output.write(closing if wrote_entry else "}")
@@ -0,0 +1,205 @@
+"""Find which words of a word list can't be translated, and why.
+
+This runs only the first steps of translating each word: looking up its IPA,
+splitting each pronunciation into syllables, and mapping each syllable's
+phonemes to steno keys. Whole stroke sequences are never built or
+postprocessed, so it takes a fraction of the time of generating a dictionary.
+The words are checked in parallel.
+
+A word is covered if at least one of its pronunciations gets through every
+step. Otherwise its failure reason is the one for the pronunciation that got
+the furthest, out of FAILURE_REASONS.
+
+A covered word can still end up with no translation if postprocessing removes
+every stroke sequence, but that's rare.
+"""
+
+import collections
+import concurrent.futures
+import itertools
+import os
+
+import ipa_utils
+import stroke_builder
+
+REASON_MISSING_IPA = "missing IPA entry"
+REASON_NO_SYLLABLES = "no syllables found"
+REASON_LEADING_CONSONANTS = "unable to assign leading consonants"
+REASON_NO_MATCH = "no keys for a phoneme"
+REASON_NO_VALID_STROKE = "no valid stroke for a syllable"
+
+# The failure reasons, in the order the steps that fail with them are run.
+FAILURE_REASONS = [
+    REASON_MISSING_IPA,
+    REASON_NO_SYLLABLES,
+    REASON_LEADING_CONSONANTS,
+    REASON_NO_MATCH,
+    REASON_NO_VALID_STROKE,
+]
+
+# The number of words each process checks at a time.
+_WORDS_PER_CHUNK = 4096
+
+# The Config used by a worker process, set by _init_worker().
+_WORKER_STATE = {}
+
+
+class CoverageReport:
+    """Which words of a word list can be translated.
+
+    Attributes:
+        num_words: The number of words checked.
+        num_covered: The number of words that can be translated.
+        failure_counts: A Counter of the number of words that failed for each
+            reason in FAILURE_REASONS.
+        failure_examples: A dictionary mapping each failure reason to a list
+            of the first words that failed for it, in word list order.
+    """
+
+    def __init__(self):
+        self.num_words = 0
+        self.num_covered = 0
+        self.failure_counts = collections.Counter()
+        self.failure_examples = {}
+
+    def add(self, word, reason, max_examples):
+        """Record the result for a word, with a reason of None if it's covered."""
+
+        self.num_words += 1
+        if reason is None:
+            self.num_covered += 1
+            return
+
+        self.failure_counts[reason] += 1
+        examples = self.failure_examples.setdefault(reason, [])
+        if len(examples) < max_examples:
+            examples.append(word)
+
+    def merge(self, other, max_examples):
+        """Add the results of a report for later words of the same word list."""
+
+        self.num_words += other.num_words
+        self.num_covered += other.num_covered
+        self.failure_counts.update(other.failure_counts)
+
+        for reason, words in other.failure_examples.items():
+            examples = self.failure_examples.setdefault(reason, [])
+            examples += words[: max_examples - len(examples)]
+
+
+def get_failure_reason(pronunciations, config):
+    """Check whether a word can be translated.
+
+    Args:
+        pronunciations: The list of the word's IPA pronunciations, or None if
+            it has no IPA entry.
+        config: The Config specifying how strokes should be generated.
+
+    Returns:
+        None if the word can be translated, otherwise a reason from
+        FAILURE_REASONS.
+    """
+
+    if pronunciations is None:
+        return REASON_MISSING_IPA
+
+    # Words without any pronunciations fail the same way as those without
+    # vowels, since no syllables are found for them either.
+    furthest = 1
+    for ipa in pronunciations:
+        reason = _get_pronunciation_failure_reason(ipa, config)
+        if reason is None:
+            return None
+
+        furthest = max(furthest, FAILURE_REASONS.index(reason))
+
+    return FAILURE_REASONS[furthest]
+
+
+def _get_pronunciation_failure_reason(ipa, config):
+    try:
+        syllables = ipa_utils.split_ipa_into_syllables_or_raise(ipa, config)
+    except ipa_utils.NoSyllablesError:
+        return REASON_NO_SYLLABLES
+    except ipa_utils.LeadingConsonantsError:
+        return REASON_LEADING_CONSONANTS
+
+    for syllable in syllables:
+        possible_keys = stroke_builder.map_syllable_to_key_clusters(syllable, config)
+        if possible_keys is None:
+            return REASON_NO_MATCH
+
+        if not stroke_builder.has_valid_stroke(possible_keys):
+            return REASON_NO_VALID_STROKE
+
+    return None
+
+
+def check_coverage(words, word_to_ipa, config, num_processes=None, max_examples=5):
+    """Check which words of a word list can be translated.
+
+    Args:
+        words: The list of words to check.
+        word_to_ipa: A dictionary mapping lowercased words to a list of their
+            IPA pronunciations, normalized with ipa_utils.IpaNormalizer.
+        config: The Config specifying how strokes should be generated.
+        num_processes: The most processes to check the words with, or None to
+            use one for each CPU.
+        max_examples: The most example words to keep for each failure reason.
+
+    Returns:
+        A CoverageReport.
+    """
+
+    chunks = [
+        [(word, word_to_ipa.get(word.lower())) for word in words[start : start + _WORDS_PER_CHUNK]]
+        for start in range(0, len(words), _WORDS_PER_CHUNK)
+    ]
+    num_processes = min(num_processes or os.cpu_count() or 1, len(chunks))
+    report = CoverageReport()
+
+    if num_processes <= 1:
+        for chunk in chunks:
+            report.merge(_check_chunk(chunk, max_examples, config), max_examples)
+
+        return report
+
+    with concurrent.futures.ProcessPoolExecutor(
+        num_processes, initializer=_init_worker, initargs=(config,)
+    ) as executor:
+        for chunk_report in executor.map(_check_chunk, chunks, itertools.repeat(max_examples)):
+            report.merge(chunk_report, max_examples)
+
+    return report
+
+
+def _init_worker(config):
+    _WORKER_STATE["config"] = config
+
+
+def _check_chunk(words_and_pronunciations, max_examples, config=None):
+    config = config or _WORKER_STATE["config"]
+    report = CoverageReport()
+
+    for word, pronunciations in words_and_pronunciations:
+        report.add(word, get_failure_reason(pronunciations, config), max_examples)
+
+    return report
+
+
+def print_coverage_report(report):
+    """Print a summary of a CoverageReport."""
+
+    percent = 100 * report.num_covered / report.num_words if report.num_words else 0
+
+    print(f"Words: {report.num_words}")
+    print(f"Words that can be translated: {report.num_covered} ({percent:.1f}%)")
+    print(f"Words that can't be translated: {report.num_words - report.num_covered}")
+
+    for reason in FAILURE_REASONS:
+        count = report.failure_counts[reason]
+        if count == 0:
+            continue
+
+        examples = ", ".join(report.failure_examples[reason])
+        print(f"  {reason}: {count}, e.g. {examples}")
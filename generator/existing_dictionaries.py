@@ -0,0 +1,123 @@
+"""Take hand-made dictionaries into account when generating a dictionary.
+
+A generated dictionary is usually used under dictionaries with hand-made
+briefs. Words those dictionaries already define don't need to be translated,
+and generated entries for strokes they already use would be shadowed by them.
+Loading the existing dictionaries lets the generator skip those words and
+treat their strokes as taken when resolving conflicts.
+"""
+
+import hashlib
+import json
+import logging
+
+from postprocessing import get_sequence_key
+from steno import MissingDashInStrokeError, OutOfStenoOrderError, StrokeSequence
+
+
+class ExistingDictionaries:
+    """The words and stroke sequences of existing dictionaries.
+
+    Attributes:
+        words: A set of the translations in the dictionaries.
+        sequence_keys: A set of the keys of the dictionaries' stroke sequences
+            (see postprocessing.get_sequence_key()). Stroke sequences that
+            can't be parsed, like "1-9", are left out since they can't be
+            generated.
+        fingerprint: A string that changes whenever the dictionaries' contents
+            change.
+    """
+
+    def __init__(self, words, sequence_keys, fingerprint):
+        self.words = words
+        self.sequence_keys = sequence_keys
+        self.fingerprint = fingerprint
+
+    def filter_words(self, words):
+        """Return the words that aren't already defined, in the same order."""
+
+        log = logging.getLogger("dictionary_generator")
+        remaining = [word for word in words if word not in self.words]
+        log.info("Skipping %d words from existing dictionaries", len(words) - len(remaining))
+
+        return remaining
+
+    def get_used_keys(self):
+        """Return a new set of the keys of stroke sequences that are already taken.
+
+        This can be given to postprocessing.create_disambiguator().
+        """
+
+        return set(self.sequence_keys)
+
+
+def load_existing_dictionaries(filenames, config):
+    """Load existing JSON dictionaries.
+
+    Args:
+        filenames: A list of JSON dictionary files.
+        config: The Config specifying how strokes should be generated.
+
+    Returns:
+        An ExistingDictionaries, or None if `filenames` is empty.
+    """
+
+    if not filenames:
+        return None
+
+    log = logging.getLogger("dictionary_generator")
+    if not config.should_append_disambiguator_stroke():
+        log.warning(
+            "Generated entries may be shadowed by existing dictionaries unless the "
+            + "disambiguator stroke is enabled"
+        )
+
+    words = set()
+    sequence_keys = set()
+    digest = hashlib.sha256()
+
+    for filename in filenames:
+        with open(filename, "rb") as file:
+            contents = file.read()
+
+        digest.update(hashlib.sha256(contents).digest())
+
+        for sequence_str, translation in json.loads(contents).items():
+            words.add(translation)
+
+            # Parsing the strokes means that e.g. "KA-T" matches the generated
+            # "KAT".
+            try:
+                sequence_keys.add(get_sequence_key(StrokeSequence.from_string(sequence_str)))
+            except (MissingDashInStrokeError, OutOfStenoOrderError):
+                pass
+
+    log.info(
+        "Loaded %d words and %d stroke sequences from existing dictionaries",
+        len(words),
+        len(sequence_keys),
+    )
+
+    return ExistingDictionaries(words, sequence_keys, digest.hexdigest())
+
+
+def fingerprint_config(config, existing_dictionaries):
+    """Return a string that changes whenever the config or existing dictionaries change.
+
+    Args:
+        config: The Config specifying how strokes should be generated.
+        existing_dictionaries: An ExistingDictionaries, or None.
+
+    Returns:
+        The config's fingerprint if there are no existing dictionaries, so
+        results saved without them stay valid.
+    """
+
+    if existing_dictionaries is None:
+        return config.get_fingerprint()
+
+    digest = hashlib.sha256()
+    digest.update(config.get_fingerprint().encode("UTF-8"))
+    digest.update(existing_dictionaries.fingerprint.encode("UTF-8"))
+
+    return digest.hexdigest()
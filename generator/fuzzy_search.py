@@ -0,0 +1,214 @@
+"""Find dictionary entries whose strokes are close to a stroke sequence.
+
+The distance between two stroke sequences with the same number of strokes is
+the number of keys that are in one but not the other, i.e. the Hamming distance
+between their packed strokes (see Stroke.to_int()). Sequences with different
+numbers of strokes aren't compared.
+
+Entries are stored in a BK-tree for each number of strokes. Each child of a
+node is stored under its distance from the node, so by the triangle inequality
+a query only needs to visit the children whose distance is within the query's
+maximum distance of the query's distance to the node. This lets queries for
+close entries skip most of the dictionary.
+
+Usage:
+    python fuzzy_search.py <stroke_sequence> <dictionary>... [--max_distance k]
+"""
+
+import argparse
+
+import binary_dictionary
+from generated_dictionary import iter_packed
+from steno import Stroke, StrokeSequence
+
+
+def get_distance(key, other_key):
+    """Return the number of keys that differ between two packed stroke tuples.
+
+    Both tuples must have the same length.
+    """
+
+    if len(key) == 1:
+        return (key[0] ^ other_key[0]).bit_count()
+
+    return sum((packed ^ other_packed).bit_count() for packed, other_packed in zip(key, other_key))
+
+
+class _Node:
+    __slots__ = ["key", "translation", "children"]
+
+    def __init__(self, key, translation):
+        self.key = key
+        self.translation = translation
+        # A dictionary mapping a distance from this node to the child at that
+        # distance.
+        self.children = {}
+
+
+class BKTree:
+    """A BK-tree of entries whose stroke sequences have the same length."""
+
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, key, translation):
+        """Add an entry, replacing any existing translation for the strokes.
+
+        Args:
+            key: A tuple of packed strokes (see
+                binary_dictionary.pack_stroke_sequence()).
+            translation: The translation string.
+        """
+
+        if self._root is None:
+            self._root = _Node(key, translation)
+            self._size += 1
+            return
+
+        node = self._root
+        while True:
+            distance = get_distance(key, node.key)
+            if distance == 0:
+                node.translation = translation
+                return
+
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(key, translation)
+                self._size += 1
+                return
+
+            node = child
+
+    def find_within(self, key, max_distance):
+        """Find the entries within a distance of some strokes.
+
+        Args:
+            key: A tuple of packed strokes with the same length as the tree's
+                entries.
+            max_distance: The largest distance to include.
+
+        Returns:
+            A list of tuples of the distance, the entry's packed strokes, and
+            its translation, in no particular order.
+        """
+
+        if self._root is None:
+            return []
+
+        results = []
+        nodes = [self._root]
+
+        while nodes:
+            node = nodes.pop()
+            distance = get_distance(key, node.key)
+            if distance <= max_distance:
+                results.append((distance, node.key, node.translation))
+
+            for child_distance, child in node.children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    nodes.append(child)
+
+        return results
+
+
+class FuzzyIndex:
+    """An index of dictionary entries for finding strokes close to others."""
+
+    def __init__(self, entries):
+        """Build the index.
+
+        Args:
+            entries: A dictionary mapping tuples of packed strokes (see
+                binary_dictionary.pack_stroke_sequence()) to translations,
+                e.g. from binary_dictionary.read_packed_entries().
+        """
+
+        self._trees = {}
+        for key, translation in entries.items():
+            tree = self._trees.get(len(key))
+            if tree is None:
+                tree = self._trees[len(key)] = BKTree()
+            tree.add(key, translation)
+
+    def __len__(self):
+        return sum(len(tree) for tree in self._trees.values())
+
+    def find_within(self, key, max_distance):
+        """Find the entries within a distance of some strokes.
+
+        Args:
+            key: A tuple of packed strokes.
+            max_distance: The largest number of keys that can differ.
+
+        Returns:
+            A list of tuples of the distance, the entry's packed strokes, and
+            its translation, sorted by distance and then by strokes.
+        """
+
+        tree = self._trees.get(len(key))
+        if tree is None:
+            return []
+
+        return sorted(tree.find_within(tuple(key), max_distance))
+
+    def find_within_string(self, sequence_str, max_distance):
+        """Find the entries within a distance of strokes like "KAT/HRAOG".
+
+        Raises:
+            MissingDashInStrokeError: If a stroke is missing a dash.
+            OutOfStenoOrderError: If a stroke is out of steno order.
+
+        Returns:
+            The same as find_within().
+        """
+
+        return self.find_within(
+            binary_dictionary.pack_stroke_sequence(StrokeSequence.from_string(sequence_str)),
+            max_distance,
+        )
+
+
+def create_index_from_generated_dictionary(words_and_translations):
+    """Build a FuzzyIndex from the returned value of core.generate_dictionary()."""
+
+    entries = {}
+    for word, packed_translations in iter_packed(words_and_translations):
+        for packed_strokes in packed_translations:
+            entries[binary_dictionary.get_lookup_key(packed_strokes)] = word
+
+    return FuzzyIndex(entries)
+
+
+def main():
+    """Print the entries of dictionaries close to a stroke sequence."""
+
+    parser = argparse.ArgumentParser(description="Find entries close to a stroke sequence.")
+    parser.add_argument("stroke_sequence", help='a stroke sequence like "KAT/HRAOG"')
+    parser.add_argument(
+        "dictionaries", nargs="+", help="JSON or binary dictionaries, highest priority first"
+    )
+    parser.add_argument(
+        "-k",
+        "--max_distance",
+        type=int,
+        default=1,
+        help="the most keys that can differ from the stroke sequence",
+    )
+    args = parser.parse_args()
+
+    index = FuzzyIndex(binary_dictionary.read_packed_entries(args.dictionaries))
+
+    for distance, key, translation in index.find_within_string(
+        args.stroke_sequence, args.max_distance
+    ):
+        sequence_str = "/".join(str(Stroke.from_int(packed)) for packed in key)
+        print(f"{distance}: {sequence_str}: {translation}")
+
+
+if __name__ == "__main__":
+    main()
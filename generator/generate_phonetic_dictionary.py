@@ -10,8 +10,15 @@ import argparse
 import logging
 import sys
 
+import checkpoint
 from config import Config, InvalidConfigError
 import core
+import coverage_report
+import existing_dictionaries
+import incremental
+import ipa_utils
+import reverse_index
+import sharding
 
 
 def get_args():
@@ -34,12 +41,118 @@ def get_args():
     parser.add_argument(
         "-o", "--output_file", help="Path to the output file", default="output.json"
     )
+    parser.add_argument(
+        "--output_format",
+        choices=core.OUTPUT_FORMATS,
+        default=core.OUTPUT_FORMAT_JSON,
+        help="write a JSON dictionary, a compact memory-mappable binary dictionary, "
+        + "or an indexed SQLite database",
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="write the JSON output without whitespace"
+    )
+    parser.add_argument(
+        "--sort_by_stroke",
+        action="store_true",
+        help="sort the output by stroke sequence instead of by word list order",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only retranslate words whose inputs changed since the last incremental run",
+    )
+    parser.add_argument(
+        "--manifest_file",
+        help="the manifest used by --incremental (default: <output_file>.manifest)",
+    )
+    parser.add_argument(
+        "--checkpoint_file",
+        help="where to periodically save progress (default: <output_file>.checkpoint)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue from the checkpoint saved by an interrupted run",
+    )
+    parser.add_argument(
+        "--shard",
+        type=sharding.parse_shard_spec,
+        metavar="i/N",
+        help="only translate shard i of N (0 <= i < N) and write it to <output_file>.shard-i-of-N"
+        + " for merge_shards.py",
+    )
+    parser.add_argument(
+        "--existing-dictionary",
+        action="append",
+        default=[],
+        dest="existing_dictionaries",
+        metavar="DICTIONARY",
+        help="a JSON dictionary the output will be used with; words it defines are skipped and "
+        + "its strokes aren't reused (can be given more than once)",
+    )
+    parser.add_argument(
+        "--ipa-file",
+        action="append",
+        default=[],
+        dest="ipa_files",
+        metavar="IPA_FILE",
+        help="an IPA CSV dictionary to look words up in before ipa_file, such as a file of "
+        + "corrections; the first one given that has a word is used (can be given more than once)",
+    )
+    parser.add_argument(
+        "--use_ipa_index",
+        action="store_true",
+        help="look up pronunciations with a sidecar index of each IPA file (<ipa_file>.idx) "
+        + "instead of loading it, which is faster for short word lists",
+    )
+    parser.add_argument(
+        "--reuse_strokes",
+        action="store_true",
+        help="reuse the strokes built for each syllable, and for the first syllables of each "
+        + "word, for later words; the output is the same, but it's faster for long word lists",
+    )
+    parser.add_argument(
+        "--dry-run-coverage",
+        action="store_true",
+        dest="dry_run_coverage",
+        help="don't write a dictionary; only report how many words can be translated and why "
+        + "the rest can't, which is much faster",
+    )
+    parser.add_argument(
+        "--reverse_index_file",
+        help="also write a word to strokes index for reverse_index.py to this file",
+    )
     parser.add_argument(
         "-v", "--verbose", action="count", default=0, help="increase output verbosity"
     )
 
     # Parse the command line arguments
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    # Only a full run saves checkpoints.
+    if args.incremental or args.shard is not None:
+        mode = "--incremental" if args.incremental else "--shard"
+        if args.resume:
+            parser.error(f"--resume can't be used with {mode}")
+        if args.checkpoint_file is not None:
+            parser.error(f"--checkpoint_file can't be used with {mode}")
+
+    return args
+
+
+def check_coverage(ipa_files, word_list_file, config, existing):
+    """Print which words of the word list can be translated (see coverage_report.py)."""
+
+    words = core.read_word_list(word_list_file)
+    if existing is not None:
+        words = existing.filter_words(words)
+
+    word_to_ipa = ipa_utils.create_ipa_lookup_dictionary(ipa_files, words)
+    ipa_utils.IpaNormalizer.from_config(config).normalize_lookup_dictionary(word_to_ipa)
+
+    coverage_report.print_coverage_report(
+        coverage_report.check_coverage(words, word_to_ipa, config)
+    )
 
 
 def main():
@@ -64,9 +177,82 @@ def main():
         log.critical(err)
         sys.exit(1)
 
+    try:
+        existing = existing_dictionaries.load_existing_dictionaries(
+            args.existing_dictionaries, config
+        )
+    except (OSError, ValueError) as err:
+        log.critical("Unable to load existing dictionaries: %s", err)
+        sys.exit(1)
+
+    # Pronunciations are looked up in the --ipa-file dictionaries first.
+    ipa_files = args.ipa_files + [args.ipa_file]
+
+    if args.dry_run_coverage:
+        check_coverage(ipa_files, args.word_list_file, config, existing)
+        return
+
     # Create the dictionary.
-    words_and_strokes = core.generate_dictionary(args.ipa_file, args.word_list_file, config)
-    core.write_dictionary_to_file(words_and_strokes, args.output_file)
+    if args.shard is not None:
+        shard_index, shard_count = args.shard
+        shard_file = sharding.get_shard_file(args.output_file, shard_index, shard_count)
+        sharding.generate_shard(
+            ipa_files,
+            args.word_list_file,
+            config,
+            shard_index,
+            shard_count,
+            shard_file,
+            existing,
+            args.use_ipa_index,
+            args.reuse_strokes,
+        )
+        return
+
+    if args.incremental:
+        manifest_file = args.manifest_file or incremental.get_default_manifest_file(
+            args.output_file
+        )
+        words_and_strokes = incremental.generate_dictionary_incrementally(
+            ipa_files,
+            args.word_list_file,
+            config,
+            manifest_file,
+            existing,
+            args.use_ipa_index,
+            args.reuse_strokes,
+        )
+    else:
+        checkpoint_file = args.checkpoint_file or checkpoint.get_default_checkpoint_file(
+            args.output_file
+        )
+        words_and_strokes = core.generate_dictionary(
+            ipa_files,
+            args.word_list_file,
+            config,
+            checkpoint_file,
+            args.resume,
+            existing,
+            args.use_ipa_index,
+            args.reuse_strokes,
+        )
+
+    word_to_syllables = None
+    if args.output_format == core.OUTPUT_FORMAT_SQLITE:
+        word_to_syllables = core.describe_syllables(words_and_strokes, ipa_files, config)
+
+    core.write_dictionary_to_file(
+        words_and_strokes,
+        args.output_file,
+        args.compact,
+        args.sort_by_stroke,
+        args.output_format,
+        word_to_syllables,
+        args.word_list_file,
+    )
+
+    if args.reverse_index_file is not None:
+        reverse_index.write_reverse_index(words_and_strokes, args.reverse_index_file)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,169 @@
+"""Store the translations of a generated dictionary compactly.
+
+Each StrokeSequence holds a list of Strokes, and each Stroke holds its own list
+of a boolean for every key, so keeping a whole dictionary as StrokeSequences
+takes kilobytes per word. A GeneratedDictionary stores the same data in
+columns instead:
+    words: A list of the translated words, in word list order.
+    translation_offsets: The translations of word `i` are the ones from
+        translation_offsets[i] up to translation_offsets[i + 1].
+    stroke_offsets: The strokes of translation `j` are the ones from
+        stroke_offsets[j] up to stroke_offsets[j + 1].
+    strokes: Every stroke of every translation, packed (see Stroke.to_int()).
+The offsets and strokes are arrays of unsigned integers, so each stroke takes
+up 4 bytes.
+
+Iterating over a GeneratedDictionary gives the same tuples of a word and a list
+of StrokeSequences as before, so existing callers keep working. Code that only
+needs the packed strokes should use iter_packed() to skip creating Strokes.
+"""
+
+from array import array
+
+from steno import Stroke, StrokeSequence
+
+
+class GeneratedDictionary:
+    """The words and translations of a generated dictionary, stored in columns."""
+
+    def __init__(self):
+        self._words = []
+        self._translation_offsets = array("I", [0])
+        self._stroke_offsets = array("I", [0])
+        self._strokes = array("I")
+
+    def __len__(self):
+        return len(self._words)
+
+    def __iter__(self):
+        for i in range(len(self._words)):
+            yield self[i]
+
+    def __getitem__(self, i):
+        """Return a tuple of word `i` and a new list of its StrokeSequences."""
+
+        i = self._check_index(i)
+        return (
+            self._words[i],
+            [StrokeSequence.from_ints(packed) for packed in self.get_packed_translations(i)],
+        )
+
+    def append(self, word, translations):
+        """Add a word and its translations.
+
+        Args:
+            word: The translated word.
+            translations: A list of StrokeSequences. They're copied, so changes
+                made to them afterwards aren't stored.
+        """
+
+        self.append_packed(word, [translation.to_ints() for translation in translations])
+
+    def append_packed(self, word, packed_translations):
+        """Add a word and its translations as packed strokes.
+
+        Args:
+            word: The translated word.
+            packed_translations: A list with a list of packed strokes (see
+                StrokeSequence.to_ints()) for each translation.
+        """
+
+        self._words.append(word)
+        for packed_strokes in packed_translations:
+            self._strokes.extend(packed_strokes)
+            self._stroke_offsets.append(len(self._strokes))
+        self._translation_offsets.append(len(self._stroke_offsets) - 1)
+
+    def get_word(self, i):
+        """Return word `i`."""
+
+        return self._words[self._check_index(i)]
+
+    def get_packed_translations(self, i):
+        """Return a list with a list of packed strokes for each translation of word `i`."""
+
+        i = self._check_index(i)
+        stroke_offsets = self._stroke_offsets
+        strokes = self._strokes
+
+        return [
+            strokes[stroke_offsets[j] : stroke_offsets[j + 1]].tolist()
+            for j in range(self._translation_offsets[i], self._translation_offsets[i + 1])
+        ]
+
+    def iter_packed(self):
+        """Iterate over tuples of a word and its get_packed_translations()."""
+
+        for i, word in enumerate(self._words):
+            yield (word, self.get_packed_translations(i))
+
+    def get_num_translations(self):
+        """Return the total number of translations of all the words."""
+
+        return len(self._stroke_offsets) - 1
+
+    def get_num_strokes(self):
+        """Return the total number of strokes in all the translations."""
+
+        return len(self._strokes)
+
+    def _check_index(self, i):
+        """Return a word index with negative values counted from the end, like a list.
+
+        Raises:
+            IndexError: If there's no word `i`.
+        """
+
+        num_words = len(self._words)
+        if i < 0:
+            i += num_words
+
+        if not 0 <= i < num_words:
+            raise IndexError("GeneratedDictionary index out of range")
+
+        return i
+
+
+def iter_packed(words_and_translations):
+    """Iterate over the packed translations of a generated dictionary.
+
+    Args:
+        words_and_translations: A GeneratedDictionary, or a list of tuples of a
+            word and a list of its StrokeSequences.
+
+    Returns:
+        An iterator of tuples of a word and a list with a list of packed
+        strokes (see StrokeSequence.to_ints()) for each translation.
+    """
+
+    if isinstance(words_and_translations, GeneratedDictionary):
+        return words_and_translations.iter_packed()
+
+    return (
+        (word, [translation.to_ints() for translation in translations])
+        for word, translations in words_and_translations
+    )
+
+
+def format_packed_strokes(packed_strokes):
+    """Return the same string as str(StrokeSequence.from_ints(packed_strokes))."""
+
+    stroke_strings = []
+    for packed in packed_strokes:
+        # Empty strokes are left out, the same as for a StrokeSequence.
+        if packed == 0:
+            continue
+
+        stroke_strings.append(Stroke.string_from_int(packed))
+
+    return "/".join(stroke_strings)
+
+
+def get_packed_sort_key(packed_strokes):
+    """Return the same value as StrokeSequence.from_ints(packed_strokes).sort_key()."""
+
+    sort_keys = []
+    for packed in packed_strokes:
+        sort_keys.append(Stroke.sort_key_from_int(packed))
+
+    return (len(sort_keys), tuple(sort_keys))
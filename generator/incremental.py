@@ -0,0 +1,270 @@
+"""Regenerate a dictionary by only retranslating words whose inputs changed.
+
+Each incremental run saves a manifest next to the generated dictionary. The
+manifest records the config fingerprint and, for each line of the word list,
+the word, its IPA pronunciations, and its stroke sequences both before and
+after conflicts were resolved. The next run compares its inputs against the
+manifest:
+    1. Words whose IPA entries are unchanged reuse their stroke sequences from
+       before conflict resolution instead of being translated again.
+    2. Conflict resolution depends on the order of the word list, so the
+       resolved stroke sequences are reused up to the first position where the
+       word list or a word's IPA entries changed, and conflicts are resolved
+       again from that position onward.
+
+If the config or the existing dictionaries (see existing_dictionaries.py)
+changed, every word is translated again.
+"""
+
+import json
+import logging
+import os
+
+import core
+from existing_dictionaries import fingerprint_config
+from generated_dictionary import GeneratedDictionary
+import postprocessing
+from steno import StrokeSequence
+import stroke_builder
+
+MANIFEST_VERSION = 1
+
+_STR_VERSION = "version"
+_STR_CONFIG_FINGERPRINT = "config_fingerprint"
+_STR_WORDS = "words"
+_STR_IPA = "ipa"
+_STR_TRANSLATIONS = "translations"
+_STR_RESOLVED_TRANSLATIONS = "resolved_translations"
+
+
+class ManifestEntry:
+    """What the previous run knew about one line of the word list.
+
+    Attributes:
+        word: The word on this line of the word list.
+        ipa: The list of IPA pronunciations for the word, or None if the word
+            had no IPA entry.
+        translations: A list of packed stroke sequences (see
+            StrokeSequence.to_ints()) before conflicts were resolved.
+        resolved_translations: A list of packed stroke sequences after
+            conflicts were resolved.
+    """
+
+    __slots__ = ["word", "ipa", "translations", "resolved_translations"]
+
+    def __init__(self, word, ipa, translations, resolved_translations):
+        self.word = word
+        self.ipa = ipa
+        self.translations = translations
+        self.resolved_translations = resolved_translations
+
+
+def get_default_manifest_file(output_file):
+    """Return the manifest filename used for a generated dictionary."""
+
+    return output_file + ".manifest"
+
+
+def load_manifest(manifest_file, config_fingerprint):
+    """Load the entries saved by a previous run.
+
+    Args:
+        manifest_file: The manifest filename.
+        config_fingerprint: The fingerprint of the config and existing
+            dictionaries for this run (see
+            existing_dictionaries.fingerprint_config()).
+
+    Returns:
+        A list of ManifestEntry, one for each line of the previous word list,
+        or None if the manifest doesn't exist, can't be read, or was made with
+        a different config.
+    """
+
+    log = logging.getLogger("dictionary_generator")
+
+    if not os.path.exists(manifest_file):
+        log.info("No manifest at `%s`; translating every word", manifest_file)
+        return None
+
+    try:
+        with open(manifest_file, "r", encoding="UTF-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError) as err:
+        log.warning("Ignoring unreadable manifest `%s`: %s", manifest_file, err)
+        return None
+
+    if manifest.get(_STR_VERSION) != MANIFEST_VERSION:
+        log.info("Manifest `%s` has an old format; translating every word", manifest_file)
+        return None
+
+    if manifest.get(_STR_CONFIG_FINGERPRINT) != config_fingerprint:
+        log.info(
+            "The config or existing dictionaries changed since the last run; "
+            + "translating every word"
+        )
+        return None
+
+    return [
+        ManifestEntry(*fields)
+        for fields in zip(
+            manifest[_STR_WORDS],
+            manifest[_STR_IPA],
+            manifest[_STR_TRANSLATIONS],
+            manifest[_STR_RESOLVED_TRANSLATIONS],
+        )
+    ]
+
+
+def save_manifest(manifest_file, config_fingerprint, entries):
+    """Save the entries for the next incremental run.
+
+    Args:
+        manifest_file: The manifest filename.
+        config_fingerprint: The fingerprint of the config and existing
+            dictionaries used for this run.
+        entries: A list of ManifestEntry, one for each line of the word list.
+    """
+
+    manifest = {
+        _STR_VERSION: MANIFEST_VERSION,
+        _STR_CONFIG_FINGERPRINT: config_fingerprint,
+        _STR_WORDS: [entry.word for entry in entries],
+        _STR_IPA: [entry.ipa for entry in entries],
+        _STR_TRANSLATIONS: [entry.translations for entry in entries],
+        _STR_RESOLVED_TRANSLATIONS: [entry.resolved_translations for entry in entries],
+    }
+
+    # Write to a temporary file first so an interrupted write can't leave a
+    # corrupt manifest behind.
+    temp_file = manifest_file + ".tmp"
+    with open(temp_file, "w", encoding="UTF-8") as file:
+        json.dump(manifest, file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_file, manifest_file)
+
+
+def find_first_affected_position(words, word_to_ipa, old_entries):
+    """Find the first line of the word list that differs from the last run.
+
+    Args:
+        words: The list of words to translate.
+        word_to_ipa: A dictionary mapping lowercased words to a list of their
+            IPA pronunciations.
+        old_entries: A list of ManifestEntry from the previous run.
+
+    Returns:
+        The index of the first word that was added, removed, reordered, or
+        whose IPA entries changed. Stroke sequences for words before this index
+        are unaffected. If nothing changed, this is `len(words)`.
+    """
+
+    for i, word in enumerate(words):
+        if i >= len(old_entries):
+            return i
+
+        entry = old_entries[i]
+        if entry.word != word or entry.ipa != word_to_ipa.get(word.lower()):
+            return i
+
+    return len(words)
+
+
+def generate_dictionary_incrementally(
+    ipa_file,
+    word_list_file,
+    config,
+    manifest_file,
+    existing_dictionaries=None,
+    use_ipa_index=False,
+    reuse_strokes=False,
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    """Create a dictionary, reusing the results of the last run where possible.
+
+    The result is identical to core.generate_dictionary() for the same inputs.
+
+    Args:
+        ipa_file: A CSV file that gives the pronunciation in IPA for a word.
+            See core.generate_dictionary() for the expected format.
+        word_list_file: A file of words that should be translated into steno
+            strokes, with one word per line.
+        config: The Config specifying how strokes should be generated.
+        manifest_file: The manifest saved by the previous run. It's created if
+            it doesn't exist and is updated to match this run.
+        existing_dictionaries: An optional ExistingDictionaries; see
+            core.generate_dictionary().
+        use_ipa_index: True if pronunciations should be looked up with an
+            index of each IPA file; see core.generate_dictionary().
+        reuse_strokes: True if strokes should be reused between retranslated
+            words; see core.generate_dictionary().
+
+    Returns:
+        A GeneratedDictionary, the same as core.generate_dictionary().
+    """
+
+    log = logging.getLogger("dictionary_generator")
+    config_fingerprint = fingerprint_config(config, existing_dictionaries)
+
+    old_entries = load_manifest(manifest_file, config_fingerprint) or []
+    words = core.read_word_list(word_list_file)
+    used_keys = None
+
+    if existing_dictionaries is not None:
+        words = existing_dictionaries.filter_words(words)
+        used_keys = existing_dictionaries.get_used_keys()
+
+    # Reuse translations made before conflicts were resolved for any word whose
+    # IPA entries are unchanged, even if it moved in the word list.
+    old_translations = {}
+    for entry in old_entries:
+        old_translations[entry.word] = entry
+
+    disambiguator = postprocessing.create_disambiguator(config, used_keys)
+    stroke_cache = stroke_builder.StrokeCache() if reuse_strokes else None
+
+    entries = []
+    words_and_translations = GeneratedDictionary()
+    num_words_retranslated = 0
+
+    with core.open_pronunciations(ipa_file, words, config, use_ipa_index) as word_to_ipa:
+        first_affected = find_first_affected_position(words, word_to_ipa, old_entries)
+
+        for i, word in enumerate(words):
+            ipa = word_to_ipa.get(word.lower())
+
+            if i < first_affected:
+                entry = old_entries[i]
+                if disambiguator is not None:
+                    disambiguator.mark_used_packed(entry.resolved_translations)
+            else:
+                old_entry = old_translations.get(word)
+                if old_entry is not None and old_entry.ipa == ipa:
+                    packed_translations = old_entry.translations
+                    translations = [StrokeSequence.from_ints(ints) for ints in packed_translations]
+                else:
+                    translations = core.translate_word(word, word_to_ipa, config, stroke_cache)
+                    packed_translations = [translation.to_ints() for translation in translations]
+                    num_words_retranslated += 1
+
+                postprocessing.postprocess_generated_dictionary(
+                    [(word, translations)], config, disambiguator
+                )
+                entry = ManifestEntry(
+                    word,
+                    ipa,
+                    packed_translations,
+                    [translation.to_ints() for translation in translations],
+                )
+
+            entries.append(entry)
+            if len(entry.resolved_translations) > 0:
+                words_and_translations.append_packed(word, entry.resolved_translations)
+
+    log.info(
+        "Translated %d changed words and resolved conflicts from word %d onward",
+        num_words_retranslated,
+        first_affected + 1,
+    )
+    core.print_translation_summary(len(words_and_translations), len(words))
+
+    save_manifest(manifest_file, config_fingerprint, entries)
+
+    return words_and_translations
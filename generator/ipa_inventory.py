@@ -0,0 +1,400 @@
+"""Count the IPA symbols and phonemes used by an IPA file.
+
+This is meant as a quick check before generating a dictionary. Every line of
+the IPA file is read, in parallel for large files, and the report gives:
+    1. How often each symbol appears in the pronunciations, as written.
+    2. How often each of the config's phonemes appears, after the
+       pronunciations are normalized (see ipa_utils.IpaNormalizer) and split
+       into phonemes the same way as by ipa_utils.split_ipa_into_syllables().
+    3. The symbols left over that aren't part of any phoneme in the config,
+       with how many words use them and some examples. These symbols are
+       skipped when splitting syllables, so words using them are translated
+       without that sound, or not at all.
+    4. The config's phonemes that never appear.
+
+Usage:
+    python ipa_inventory.py <ipa_file> --config_file <config>
+"""
+
+import argparse
+import collections
+import functools
+import itertools
+import json
+import logging
+import re
+import sys
+
+from config import Config, InvalidConfigError
+import ipa_utils
+
+# The first of the characters used to mark each phoneme while tokenizing. They
+# are in the Unicode private use area, so they don't appear in real IPA.
+_FIRST_MARKER = 0xE000
+
+_STR_NUM_WORDS = "num_words"
+_STR_NUM_PRONUNCIATIONS = "num_pronunciations"
+_STR_SYMBOL_COUNTS = "symbol_counts"
+_STR_PHONEME_COUNTS = "phoneme_counts"
+_STR_UNCOVERED_SYMBOLS = "uncovered_symbols"
+_STR_SYMBOL = "symbol"
+_STR_COUNT = "count"
+_STR_NUM_WORDS_USING = "num_words_using"
+_STR_EXAMPLE_WORDS = "example_words"
+_STR_UNUSED_PHONEMES = "unused_phonemes"
+
+
+class IpaTokenizer:
+    """Split pronunciations into the phonemes of a config."""
+
+    def __init__(self, vowels, consonants, ignored_symbols=()):
+        """Create a tokenizer.
+
+        Args:
+            vowels: The vowel phonemes, e.g. Config.get_vowels().
+            consonants: The consonant phonemes, e.g. Config.get_consonants().
+            ignored_symbols: Symbols to remove before tokenizing, e.g.
+                Config.get_ignored_ipa_symbols().
+        """
+
+        # Vowels are matched before consonants, and longer phonemes before
+        # shorter ones, the same as in split_ipa_into_syllables().
+        self._vowels = sorted(vowels, key=len, reverse=True)
+        self._consonants = sorted(consonants, key=len, reverse=True)
+        self._ignored_symbols = list(ignored_symbols)
+
+        self._phoneme_to_marker = {}
+        for phoneme in self._vowels + self._consonants:
+            self._phoneme_to_marker[phoneme] = chr(_FIRST_MARKER + len(self._phoneme_to_marker))
+        self._marker_to_phoneme = {value: key for key, value in self._phoneme_to_marker.items()}
+        self._markers_pattern = re.compile(
+            f"[{chr(_FIRST_MARKER)}-{chr(_FIRST_MARKER + len(self._phoneme_to_marker) - 1)}]+"
+        )
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a tokenizer for the phonemes and ignored IPA symbols of a Config."""
+
+        return cls(config.get_vowels(), config.get_consonants(), config.get_ignored_ipa_symbols())
+
+    def get_phonemes(self):
+        """Return a list of every phoneme, vowels first."""
+
+        return list(self._phoneme_to_marker)
+
+    def get_marker(self, phoneme):
+        """Return the character mark_phonemes() replaces a phoneme with."""
+
+        return self._phoneme_to_marker[phoneme]
+
+    def normalize(self, ipa):
+        """Normalize IPA with ipa_utils.normalize_ipa() and the ignored symbols."""
+
+        return ipa_utils.normalize_ipa(ipa, self._ignored_symbols)
+
+    def mark_phonemes(self, ipa):
+        """Replace each phoneme in normalized IPA with a marker character.
+
+        Phonemes never span a newline or a slash, so this can be given many
+        pronunciations joined by them at once.
+
+        Returns:
+            The marked string. Use get_marked_phoneme() to tell which
+            characters are markers.
+        """
+
+        marked = ipa
+        for phoneme in self._vowels:
+            marked = marked.replace(phoneme, self._phoneme_to_marker[phoneme])
+
+        # Consonants can't match across a vowel's marker, the same as when a
+        # syllable's onset and coda are split into consonants.
+        for phoneme in self._consonants:
+            marked = marked.replace(phoneme, self._phoneme_to_marker[phoneme])
+
+        return marked
+
+    def remove_markers(self, marked):
+        """Return the result of mark_phonemes() with only the symbols that aren't phonemes."""
+
+        return self._markers_pattern.sub("", marked)
+
+    def get_marked_phoneme(self, char):
+        """Return the phoneme a character of mark_phonemes() stands for, or None."""
+
+        return self._marker_to_phoneme.get(char)
+
+    def tokenize(self, ipa):
+        """Split a pronunciation into phonemes and leftover symbols.
+
+        Returns:
+            A list of strings in order, each either a phoneme of the config
+            or a single symbol that isn't part of any phoneme.
+        """
+
+        marked = self.mark_phonemes(self.normalize(ipa))
+        return [self._marker_to_phoneme.get(char, char) for char in marked]
+
+
+class IpaInventory:
+    """The symbols and phonemes used by an IPA file.
+
+    Attributes:
+        num_words: The number of words. Words with more than one line are
+            only counted once, unless the lines are far apart in a large
+            file.
+        num_pronunciations: The number of pronunciations of all the words.
+        symbol_counts: A Counter of each symbol in the pronunciations, as
+            written.
+        phoneme_counts: A Counter of each phoneme, after the pronunciations
+            are normalized.
+        uncovered_symbol_counts: A Counter of each symbol that was left over
+            after splitting normalized pronunciations into phonemes.
+        uncovered_symbol_num_words: A Counter of the number of words using
+            each uncovered symbol.
+        uncovered_symbol_examples: A dictionary mapping each uncovered symbol
+            to a list of the first words using it, in file order.
+        unused_phonemes: A list of phonemes of the config that were never used.
+    """
+
+    def __init__(self):
+        self.num_words = 0
+        self.num_pronunciations = 0
+        self.symbol_counts = collections.Counter()
+        self.phoneme_counts = collections.Counter()
+        self.uncovered_symbol_counts = collections.Counter()
+        self.uncovered_symbol_num_words = collections.Counter()
+        self.uncovered_symbol_examples = {}
+        self.unused_phonemes = []
+
+    def merge(self, other, max_examples):
+        """Add the counts of an inventory for a later part of the same file."""
+
+        self.num_words += other.num_words
+        self.num_pronunciations += other.num_pronunciations
+        self.symbol_counts.update(other.symbol_counts)
+        self.phoneme_counts.update(other.phoneme_counts)
+        self.uncovered_symbol_counts.update(other.uncovered_symbol_counts)
+        self.uncovered_symbol_num_words.update(other.uncovered_symbol_num_words)
+
+        for symbol, words in other.uncovered_symbol_examples.items():
+            examples = self.uncovered_symbol_examples.setdefault(symbol, [])
+            examples += words[: max_examples - len(examples)]
+
+    def get_uncovered_symbols(self):
+        """Return the uncovered symbols, the one used by the most words first."""
+
+        return sorted(
+            self.uncovered_symbol_num_words,
+            key=lambda symbol: (
+                -self.uncovered_symbol_num_words[symbol],
+                -self.uncovered_symbol_counts[symbol],
+                symbol,
+            ),
+        )
+
+    def to_json(self):
+        """Return the inventory as a dictionary that can be written as JSON."""
+
+        return {
+            _STR_NUM_WORDS: self.num_words,
+            _STR_NUM_PRONUNCIATIONS: self.num_pronunciations,
+            _STR_SYMBOL_COUNTS: dict(self.symbol_counts.most_common()),
+            _STR_PHONEME_COUNTS: dict(self.phoneme_counts.most_common()),
+            _STR_UNCOVERED_SYMBOLS: [
+                {
+                    _STR_SYMBOL: symbol,
+                    _STR_COUNT: self.uncovered_symbol_counts[symbol],
+                    _STR_NUM_WORDS_USING: self.uncovered_symbol_num_words[symbol],
+                    _STR_EXAMPLE_WORDS: self.uncovered_symbol_examples[symbol],
+                }
+                for symbol in self.get_uncovered_symbols()
+            ],
+            _STR_UNUSED_PHONEMES: self.unused_phonemes,
+        }
+
+
+def count_ipa_symbols(word_to_ipa, tokenizer, max_examples=5):
+    """Take the inventory of the pronunciations in a dictionary.
+
+    Args:
+        word_to_ipa: A dictionary like the one returned by
+            ipa_utils.create_ipa_lookup_dictionary().
+        tokenizer: The IpaTokenizer for the config to check against.
+        max_examples: The most example words to keep for each uncovered
+            symbol.
+
+    Returns:
+        An IpaInventory. Its unused_phonemes aren't filled in, since they
+        depend on the rest of the file.
+    """
+
+    inventory = IpaInventory()
+    inventory.num_words = len(word_to_ipa)
+    inventory.num_pronunciations = sum(map(len, word_to_ipa.values()))
+
+    # Handle every pronunciation at once so that the work is done in C instead
+    # of once per pronunciation. Each word gets a line, with its pronunciations
+    # separated by slashes, which can't be part of a pronunciation. There are
+    # few distinct symbols, and counting each with str.count() is about twice
+    # as fast as a Counter.
+    lines = "\n".join(map("/".join, word_to_ipa.values()))
+    # Sort the symbols so that the order of symbols with the same count doesn't
+    # change from run to run.
+    symbols = sorted(set(lines).difference("\n/"))
+    for symbol in symbols:
+        inventory.symbol_counts[symbol] = lines.count(symbol)
+
+    normalized_lines = tokenizer.normalize(lines)
+    if normalized_lines != lines:
+        symbols = sorted(set(normalized_lines).difference("\n/"))
+    marked_lines = tokenizer.mark_phonemes(normalized_lines)
+
+    for phoneme in tokenizer.get_phonemes():
+        count = marked_lines.count(tokenizer.get_marker(phoneme))
+        if count > 0:
+            inventory.phoneme_counts[phoneme] = count
+
+    for symbol in symbols:
+        count = marked_lines.count(symbol)
+        if count > 0:
+            inventory.uncovered_symbol_counts[symbol] = count
+
+    # Find the lines, and so the words, that use each uncovered symbol. The
+    # lines are much shorter without the phonemes.
+    marked_lines = tokenizer.remove_markers(marked_lines)
+    words = None
+    for symbol in inventory.uncovered_symbol_counts:
+        pattern = re.compile(f"^(?=[^\n]*{re.escape(symbol)})", re.MULTILINE)
+        inventory.uncovered_symbol_num_words[symbol] = len(pattern.findall(marked_lines))
+
+        if words is None:
+            words = list(word_to_ipa)
+
+        examples = inventory.uncovered_symbol_examples[symbol] = []
+        line_number = 0
+        line_start = 0
+        for match in itertools.islice(pattern.finditer(marked_lines), max_examples):
+            line_number += marked_lines.count("\n", line_start, match.start())
+            line_start = match.start()
+            examples.append(words[line_number])
+
+    return inventory
+
+
+def analyze_ipa_file(ipa_file, config, num_processes=None, max_examples=5):
+    """Take the inventory of every line of an IPA file.
+
+    Args:
+        ipa_file: The IPA file.
+        config: The Config to check the phonemes against.
+        num_processes: The most processes to use, or None to use one for each
+            CPU.
+        max_examples: The most example words to keep for each uncovered
+            symbol.
+
+    Returns:
+        An IpaInventory.
+
+    Raises:
+        OSError: If the IPA file can't be read.
+    """
+
+    tokenizer = IpaTokenizer.from_config(config)
+    inventory = IpaInventory()
+
+    count_chunk = functools.partial(
+        count_ipa_symbols, tokenizer=tokenizer, max_examples=max_examples
+    )
+    for chunk_inventory in ipa_utils.map_ipa_chunks(
+        ipa_file, count_chunk, num_processes=num_processes
+    ):
+        inventory.merge(chunk_inventory, max_examples)
+
+    inventory.unused_phonemes = [
+        phoneme for phoneme in tokenizer.get_phonemes() if inventory.phoneme_counts[phoneme] == 0
+    ]
+
+    return inventory
+
+
+def _describe_symbol(symbol):
+    return f"{symbol} (U+{ord(symbol):04X})"
+
+
+def print_inventory(inventory, limit):
+    """Print an IpaInventory, with up to `limit` examples of each uncovered symbol."""
+
+    print(f"Words: {inventory.num_words}")
+    print(f"Pronunciations: {inventory.num_pronunciations}")
+
+    print(f"\nSymbols ({len(inventory.symbol_counts)}):")
+    for symbol, count in inventory.symbol_counts.most_common():
+        print(f"  {_describe_symbol(symbol)}: {count}")
+
+    print(f"\nPhonemes ({len(inventory.phoneme_counts)}):")
+    for phoneme, count in inventory.phoneme_counts.most_common():
+        print(f"  {phoneme}: {count}")
+
+    uncovered_symbols = inventory.get_uncovered_symbols()
+    print(f"\nSymbols not covered by the config ({len(uncovered_symbols)}):")
+    for symbol in uncovered_symbols:
+        examples = inventory.uncovered_symbol_examples[symbol][:limit]
+        print(
+            f"  {_describe_symbol(symbol)}: {inventory.uncovered_symbol_counts[symbol]} times in "
+            + f"{inventory.uncovered_symbol_num_words[symbol]} words, e.g. {', '.join(examples)}"
+        )
+
+    print(f"\nPhonemes in the config that are never used ({len(inventory.unused_phonemes)}):")
+    if len(inventory.unused_phonemes) > 0:
+        print(f"  {' '.join(inventory.unused_phonemes)}")
+
+
+def main():
+    """Take the inventory of an IPA file using command-line arguments."""
+
+    parser = argparse.ArgumentParser(
+        description="Count the IPA symbols and phonemes used by an IPA file."
+    )
+    parser.add_argument("ipa_file", type=str, help="the IPA CSV dictionary")
+    parser.add_argument(
+        "--config_file",
+        type=str,
+        required=True,
+        help="the config file whose phonemes the IPA file is checked against",
+    )
+    parser.add_argument(
+        "--limit", type=int, default=5, help="how many example words to print for each symbol"
+    )
+    parser.add_argument(
+        "--num_processes",
+        type=int,
+        help="the most processes to read the IPA file with (default: one for each CPU)",
+    )
+    parser.add_argument("-o", "--output_file", help="also write the full inventory as JSON here")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+    log = logging.getLogger("dictionary_generator")
+
+    try:
+        config = Config(args.config_file)
+    except InvalidConfigError as err:
+        log.critical(err)
+        sys.exit(1)
+
+    try:
+        inventory = analyze_ipa_file(args.ipa_file, config, args.num_processes, args.limit)
+    except OSError as err:
+        log.critical("Unable to read the IPA file: %s", err)
+        sys.exit(1)
+
+    print_inventory(inventory, args.limit)
+
+    if args.output_file is not None:
+        with open(args.output_file, "w", encoding="UTF-8") as file:
+            json.dump(inventory.to_json(), file, ensure_ascii=False, indent=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Look up IPA pronunciations without loading the whole IPA file.
+
+Loading a large IPA file takes seconds, which dominates when only a few words
+need to be translated. An IpaLexicon memory-maps the IPA file along with a
+sidecar index of its keys, sorted, with the byte offset of each line, so a
+lookup is a binary search that only reads the lines it compares against.
+
+The index is written next to the IPA file the first time it's needed and is
+rebuilt whenever the IPA file's size or modification time changes.
+
+A LayeredIpaLexicon looks words up in a list of IPA files, such as a file of
+corrections in front of a large base file, using the first file that has the
+word. Each file's lexicon is only opened once a lookup reaches it.
+
+The index layout, with all integers little-endian, is:
+    1. A header (see _HEADER) with the magic bytes, format version, the size
+       and modification time of the IPA file it was built from, and the
+       number of keys.
+    2. One record per key (see _RECORD), sorted by the UTF-8 encoded key. If a
+       key appears on more than one line, only the last line is indexed, the
+       same as for ipa_utils.create_ipa_lookup_dictionary().
+
+Usage:
+    python ipa_lexicon.py <ipa_file> <word>...
+"""
+
+import argparse
+import logging
+import mmap
+import os
+import struct
+
+import ipa_utils
+
+INDEX_EXTENSION = ".idx"
+
+_MAGIC = b"STENOIPA"
+_VERSION = 1
+
+# Magic, version, the IPA file's size and modification time in nanoseconds,
+# and the number of keys.
+_HEADER = struct.Struct("<8sIQQI")
+
+# The byte offset of the key in the IPA file, the key's length in bytes, and
+# the length of the line starting from the key, without the line ending.
+_RECORD = struct.Struct("<QII")
+
+
+def get_default_index_file(ipa_file):
+    """Return the sidecar index filename used for an IPA file."""
+
+    return ipa_file + INDEX_EXTENSION
+
+
+def build_index(ipa_file):
+    """Index the lines of an IPA file.
+
+    Args:
+        ipa_file: A CSV file of IPA pronunciations; see
+            ipa_utils.create_ipa_lookup_dictionary() for the format.
+
+    Returns:
+        The contents of the index as bytes.
+    """
+
+    ipa_stat = os.stat(ipa_file)
+    key_to_record = {}
+    offset = 0
+
+    with open(ipa_file, "rb") as file:
+        for line in file:
+            comma = line.find(b",")
+            if comma >= 0:
+                key = line[:comma].lstrip()
+                key_offset = offset + comma - len(key)
+                key_to_record[key] = (key_offset, len(key), len(line.rstrip()) - comma + len(key))
+
+            offset += len(line)
+
+    index = bytearray(
+        _HEADER.pack(_MAGIC, _VERSION, ipa_stat.st_size, ipa_stat.st_mtime_ns, len(key_to_record))
+    )
+    for key in sorted(key_to_record):
+        index += _RECORD.pack(*key_to_record[key])
+
+    return bytes(index)
+
+
+def _is_index_current(index_file, ipa_file):
+    try:
+        with open(index_file, "rb") as file:
+            header = file.read(_HEADER.size)
+    except OSError:
+        return False
+
+    if len(header) < _HEADER.size:
+        return False
+
+    magic, version, size, mtime_ns, _ = _HEADER.unpack(header)
+    ipa_stat = os.stat(ipa_file)
+
+    return (
+        magic == _MAGIC
+        and version == _VERSION
+        and size == ipa_stat.st_size
+        and mtime_ns == ipa_stat.st_mtime_ns
+    )
+
+
+def update_index(ipa_file, index_file=None):
+    """Rebuild the sidecar index of an IPA file if it's missing or out of date.
+
+    Args:
+        ipa_file: The IPA file.
+        index_file: The index filename, or None to use
+            get_default_index_file().
+
+    Returns:
+        The contents of a freshly built index if it couldn't be written, e.g.
+        because the IPA file's directory is read-only. Otherwise None, and the
+        index file is current.
+    """
+
+    log = logging.getLogger("dictionary_generator")
+    index_file = index_file or get_default_index_file(ipa_file)
+
+    if _is_index_current(index_file, ipa_file):
+        return None
+
+    log.info("Indexing `%s`", ipa_file)
+    index = build_index(ipa_file)
+
+    # Write to a temporary file first so that a concurrent reader never sees a
+    # partly written index.
+    temp_file = index_file + ".tmp"
+    try:
+        with open(temp_file, "wb") as file:
+            file.write(index)
+        os.replace(temp_file, index_file)
+    except OSError as err:
+        log.warning("Unable to write the index `%s`: %s", index_file, err)
+        return index
+
+    return None
+
+
+class IpaLexicon:
+    """A memory-mapped IPA file that can be used in place of a word_to_ipa dict.
+
+    Lookups are by key exactly as it appears in the IPA file, the same as for
+    the dictionary returned by ipa_utils.create_ipa_lookup_dictionary(), so
+    callers should lowercase words first.
+
+    This can be used as a context manager, which closes the lexicon on exit.
+    """
+
+    def __init__(self, ipa_file, index_file=None):
+        """Open an IPA file, building its index first if needed.
+
+        Args:
+            ipa_file: The IPA file.
+            index_file: The index filename, or None to use
+                get_default_index_file().
+        """
+
+        index_file = index_file or get_default_index_file(ipa_file)
+        index = update_index(ipa_file, index_file)
+
+        self._maps = []
+        self._ipa = self._map_file(ipa_file)
+        if index is None:
+            index = self._map_file(index_file)
+        self._index = index
+
+        _, _, _, _, self._num_keys = _HEADER.unpack_from(self._index, 0)
+
+    def _map_file(self, filename):
+        with open(filename, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # mmap can't map an empty file.
+                return b""
+
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._maps.append(mapped)
+        return mapped
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._num_keys
+
+    def close(self):
+        """Release the memory maps."""
+
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = []
+
+    def __contains__(self, word):
+        return self._find(word) is not None
+
+    def __getitem__(self, word):
+        pronunciations = self.get(word)
+        if pronunciations is None:
+            raise KeyError(word)
+
+        return pronunciations
+
+    def get(self, word, default=None):
+        """Return the list of pronunciations for a word, or `default` if there are none."""
+
+        record = self._find(word)
+        if record is None:
+            return default
+
+        key_offset, _, line_length = record
+        line = self._ipa[key_offset : key_offset + line_length].decode("UTF-8")
+
+        return ipa_utils.extract_key_and_value(line)[1]
+
+    def _find(self, word):
+        """Return the record for a key, or None if it isn't in the index."""
+
+        key = word.encode("UTF-8")
+        low = 0
+        high = self._num_keys
+
+        while low < high:
+            middle = (low + high) // 2
+            record = _RECORD.unpack_from(self._index, _HEADER.size + middle * _RECORD.size)
+            key_offset, key_length, _ = record
+            found_key = self._ipa[key_offset : key_offset + key_length]
+
+            if found_key == key:
+                return record
+
+            if found_key < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return None
+
+
+class LayeredIpaLexicon:
+    """A stack of IpaLexicons, where the first one with a word is used for it.
+
+    This can be used as a context manager, which closes the lexicons on exit.
+    """
+
+    def __init__(self, ipa_files, normalizer=None):
+        """Prepare to look up words in a list of IPA files.
+
+        Args:
+            ipa_files: An IPA filename, or a list of them highest priority
+                first. Each file's index is built when it's first needed.
+            normalizer: An optional ipa_utils.IpaNormalizer to apply to the
+                pronunciations that are looked up.
+        """
+
+        self._ipa_files = ipa_utils.get_ipa_files(ipa_files)
+        self._normalizer = normalizer
+        self._lexicons = [None] * len(self._ipa_files)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the lexicons that were opened."""
+
+        for lexicon in self._lexicons:
+            if lexicon is not None:
+                lexicon.close()
+        self._lexicons = [None] * len(self._ipa_files)
+
+    def __contains__(self, word):
+        return self.get(word) is not None
+
+    def __getitem__(self, word):
+        pronunciations = self.get(word)
+        if pronunciations is None:
+            raise KeyError(word)
+
+        return pronunciations
+
+    def get(self, word, default=None):
+        """Return the pronunciations from the first file with a word, or `default`."""
+
+        for i, ipa_file in enumerate(self._ipa_files):
+            lexicon = self._lexicons[i]
+            if lexicon is None:
+                lexicon = self._lexicons[i] = IpaLexicon(ipa_file)
+
+            pronunciations = lexicon.get(word)
+            if pronunciations is not None:
+                if self._normalizer is not None:
+                    pronunciations = self._normalizer.normalize_pronunciations(pronunciations)
+                return pronunciations
+
+        return default
+
+
+def main():
+    """Print the pronunciations of words from an IPA file."""
+
+    parser = argparse.ArgumentParser(description="Look up the IPA pronunciations of words.")
+    parser.add_argument("ipa_file", help="the IPA CSV dictionary")
+    parser.add_argument("words", nargs="+", help="the words to look up")
+    parser.add_argument("--index_file", help="the sidecar index to use (default: <ipa_file>.idx)")
+    args = parser.parse_args()
+
+    with IpaLexicon(args.ipa_file, args.index_file) as lexicon:
+        for word in args.words:
+            pronunciations = lexicon.get(word.lower(), [])
+            print(f"{word}: {', '.join(f'/{ipa}/' for ipa in pronunciations)}")
+
+
+if __name__ == "__main__":
+    main()
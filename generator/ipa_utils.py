@@ -1,43 +1,309 @@
 """Read IPA pronunciations for words and split IPA words into syllables."""
 
+import array
+import concurrent.futures
+import contextlib
 import dataclasses
+import gc
+import itertools
 import logging
-import random
+import os
 import re
 import sys
+import unicodedata
 
 from syllable import Syllable
 
+# The approximate size of the chunks an IPA file is split into for parsing.
+_BYTES_PER_CHUNK = 1 << 23
 
-def create_ipa_lookup_dictionary(filename):
+
+def get_ipa_files(ipa_file):
+    """Return a list of IPA files, highest priority first.
+
+    Args:
+        ipa_file: An IPA filename, or a list of them highest priority first.
+    """
+
+    if isinstance(ipa_file, str):
+        return [ipa_file]
+
+    return list(ipa_file)
+
+
+def create_ipa_lookup_dictionary(filename, words=None, num_processes=None):
     """Create a dictionary mapping words to IPA pronunciations.
 
+    Large files are split into chunks that end at line boundaries, and the
+    chunks are parsed in parallel by a pool of processes. If a word has more
+    than one line, the last line is used.
+
     Args:
         filename: The name of a file specifying pronunciation in IPA for words.
             It should be a CSV file where each line has the format
             <word>,/<ipa1>/,/<ipa2>/...
             so that each prononciation (ipa1, ipa2, ...) is between slashes.
+            This can also be a list of files, highest priority first, in which
+            case each word's pronunciations come from the first file that has
+            the word.
+        words: An optional iterable of the words that will be looked up. If
+            it's given, only the lines for these words (compared after
+            lowercasing them) are kept, so memory use depends on the number of
+            words instead of the size of the file. Other lines are skipped
+            without being decoded or split.
+        num_processes: The most processes to parse the file with, or None to
+            use one for each CPU. Files with a single chunk are always parsed
+            in this process.
 
     Returns:
         A dictionary where each key is a word from the specified file and the
         value is a list with each element being the pronunciation for that word
         as specified by the IPA entries in the file for that word.
     """
+    if not isinstance(filename, str):
+        return _create_layered_ipa_lookup_dictionary(filename, words, num_processes)
+
     word_to_ipa = {}
-    try:
-        with open(filename, newline="", encoding="UTF-8") as csv_file:
-            for line in csv_file:
-                (key, value) = extract_key_and_value(line)
-                word_to_ipa[key] = value
+    targets = None
+    if words is not None:
+        targets = {word.lower().encode("UTF-8") for word in words}
 
+    try:
+        ranges = _split_into_line_ranges(filename, _BYTES_PER_CHUNK)
     except FileNotFoundError:
         log = logging.getLogger("dictionary_generator")
         log.error("The file `%s` does not exist.", filename)
         sys.exit(1)
 
+    num_processes = min(num_processes or os.cpu_count() or 1, len(ranges))
+
+    with _gc_paused():
+        if num_processes <= 1:
+            for start, end in ranges:
+                word_to_ipa.update(_read_ipa_range(filename, start, end, targets))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(num_processes) as executor:
+                # map() returns the chunks in file order, so updating the
+                # dictionary with each chunk in turn keeps the last line for
+                # each word.
+                for packed_chunk in executor.map(
+                    _read_packed_ipa_range,
+                    itertools.repeat(filename),
+                    *zip(*ranges),
+                    itertools.repeat(targets),
+                ):
+                    word_to_ipa.update(_unpack_ipa_chunk(packed_chunk))
+
+    return word_to_ipa
+
+
+def _create_layered_ipa_lookup_dictionary(filenames, words, num_processes):
+    """Merge the pronunciations from a list of IPA files, highest priority first."""
+
+    word_to_ipa = {}
+
+    if words is None:
+        # Every word is needed, so load the lowest priority file first and let
+        # each file after it replace the entries it has.
+        for filename in reversed(filenames):
+            word_to_ipa.update(create_ipa_lookup_dictionary(filename, None, num_processes))
+
+        return word_to_ipa
+
+    # Only look for each word until a file has it, and don't read the rest of
+    # the files once every word has been found.
+    remaining_words = {word.lower() for word in words}
+    for filename in filenames:
+        if len(remaining_words) == 0:
+            break
+
+        layer = create_ipa_lookup_dictionary(filename, remaining_words, num_processes)
+        word_to_ipa.update(layer)
+        remaining_words.difference_update(layer)
+
+    return word_to_ipa
+
+
+def map_ipa_chunks(filename, function, words=None, num_processes=None):
+    """Apply a function to each chunk of an IPA file.
+
+    The file is split into chunks the same way as by
+    create_ipa_lookup_dictionary(), and each chunk is parsed and passed to
+    `function` in a pool of processes. This allows a single pass over a large
+    file without holding all of it in memory at once.
+
+    Args:
+        filename: The name of an IPA file.
+        function: A function that takes a dictionary from each word in a chunk
+            to its list of pronunciations. It and its returned values must be
+            picklable, e.g. a module-level function or functools.partial of
+            one.
+        words: An optional iterable of the words to keep; see
+            create_ipa_lookup_dictionary().
+        num_processes: The most processes to use, or None to use one for each
+            CPU.
+
+    Returns:
+        An iterator of the returned values for each chunk, in file order.
+
+    Raises:
+        OSError: If the file can't be read.
+    """
+
+    targets = None
+    if words is not None:
+        targets = {word.lower().encode("UTF-8") for word in words}
+
+    ranges = _split_into_line_ranges(filename, _BYTES_PER_CHUNK)
+    num_processes = min(num_processes or os.cpu_count() or 1, len(ranges))
+
+    if num_processes <= 1:
+        for start, end in ranges:
+            yield _apply_to_ipa_range(function, filename, start, end, targets)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(num_processes) as executor:
+        yield from executor.map(
+            _apply_to_ipa_range,
+            itertools.repeat(function),
+            itertools.repeat(filename),
+            *zip(*ranges),
+            itertools.repeat(targets),
+        )
+
+
+def _apply_to_ipa_range(function, filename, start, end, targets):
+    with _gc_paused():
+        return function(_read_ipa_range(filename, start, end, targets))
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Turn off the garbage collector while loading a large file.
+
+    Parsing creates a list for every word, and each batch of new lists would
+    otherwise start a collection pass over everything loaded so far.
+    """
+
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _split_into_line_ranges(filename, bytes_per_range):
+    """Split a file into byte ranges of about the given size that end at newlines.
+
+    Returns:
+        A list of (start, end) tuples covering the whole file, in order.
+    """
+
+    size = os.path.getsize(filename)
+    ranges = []
+
+    with open(filename, "rb") as file:
+        start = 0
+        while start < size:
+            end = start + bytes_per_range
+            if end < size:
+                # Extend the range to the end of the line it stops in.
+                file.seek(end)
+                end += len(file.readline())
+
+            end = min(end, size)
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+
+def _read_ipa_range(filename, start, end, targets):
+    """Parse the lines in a byte range of an IPA file.
+
+    Args:
+        filename: The IPA file.
+        start: The byte offset of the first line.
+        end: The byte offset just past the last line.
+        targets: A set of UTF-8 encoded words to keep, or None to keep every
+            word.
+
+    Returns:
+        A dictionary from each word in the range to its list of
+        pronunciations.
+    """
+
+    with open(filename, "rb") as csv_file:
+        csv_file.seek(start)
+        data = csv_file.read(end - start)
+
+    word_to_ipa = {}
+
+    if targets is None:
+        for line in data.decode("UTF-8").split("\n"):
+            if line != "":
+                key, value = extract_key_and_value(line)
+                word_to_ipa[key] = value
+
+        return word_to_ipa
+
+    for line in data.split(b"\n"):
+        # Compare the raw key before doing any other work, since most lines
+        # of a large IPA file are for words that aren't needed.
+        comma = line.find(b",")
+        if comma < 0 or line[:comma].lstrip() not in targets:
+            continue
+
+        key, value = extract_key_and_value(line.decode("UTF-8"))
+        word_to_ipa[key] = value
+
     return word_to_ipa
 
 
+def _read_packed_ipa_range(filename, start, end, targets):
+    """Parse a byte range like _read_ipa_range() in a worker process.
+
+    Sending a dictionary back to the main process would mean pickling and
+    unpickling every string in it, which takes longer than parsing the lines.
+    Instead the words and pronunciations are each joined into one string, which
+    can be split apart again quickly. Neither can contain a newline.
+
+    Returns:
+        A tuple of the words joined by newlines, every pronunciation joined by
+        newlines, and an array with the number of pronunciations for each word.
+    """
+
+    with _gc_paused():
+        word_to_ipa = _read_ipa_range(filename, start, end, targets)
+
+    return (
+        "\n".join(word_to_ipa.keys()),
+        "\n".join(itertools.chain.from_iterable(word_to_ipa.values())),
+        array.array("I", map(len, word_to_ipa.values())),
+    )
+
+
+def _unpack_ipa_chunk(packed_chunk):
+    """Rebuild the dictionary packed by _read_packed_ipa_range()."""
+
+    joined_words, joined_pronunciations, counts = packed_chunk
+    if len(counts) == 0:
+        return {}
+
+    pronunciations = joined_pronunciations.split("\n")
+    ends = list(itertools.accumulate(counts))
+    starts = [0] + ends[:-1]
+
+    return dict(
+        zip(
+            joined_words.split("\n"),
+            map(pronunciations.__getitem__, map(slice, starts, ends)),
+        )
+    )
+
+
 def extract_key_and_value(line):
     """Extract the key and values from a string.
 
@@ -64,9 +330,8 @@ def extract_key_and_value(line):
 def get_ipa_symbols(word_to_ipa):
     """Compile a set of IPA symbols used in the provided corpus.
 
-    This function randomly selects entries of `word_to_ipa` and collects the
-    IPA symbols used. So it's possible that not all symbols used in
-    `word_to_ipa` will be given in the returned value.
+    Every pronunciation is checked; see ipa_inventory.py for counts of each
+    symbol in an IPA file.
 
     Args:
         word_to_ipa: A dictionary where each key is a string for a word, and
@@ -77,29 +342,145 @@ def get_ipa_symbols(word_to_ipa):
         A Set of the IPA symbols used in `word_to_ipa`
     """
 
-    if len(word_to_ipa) == 0:
-        return set()
+    symbols = set()
+    for pronunciations in word_to_ipa.values():
+        for ipa in pronunciations:
+            symbols.update(ipa)
 
-    # Check the IPA symbols used in a bunch of random words.
-    num_words_to_check = 10000
+    return symbols
 
-    words = []
-    keys = list(word_to_ipa.keys())
-    for _ in range(num_words_to_check):
-        words.append(random.choice(keys))
 
-    symbols = set()
-    for word in words:
-        for ipa in word_to_ipa[word]:
-            for char in ipa:
-                symbols.add(char)
+def normalize_ipa(ipa, ignored_symbols=()):
+    """Convert IPA to Unicode normalization form NFC and remove ignored symbols.
 
-    return symbols
+    Neither step crosses a newline, so this can also be used to normalize many
+    pronunciations joined by newlines at once.
+
+    Args:
+        ipa: A pronunciation in IPA.
+        ignored_symbols: Strings to remove, normalized to NFC.
+    """
+
+    if not unicodedata.is_normalized("NFC", ipa):
+        ipa = unicodedata.normalize("NFC", ipa)
+    for symbol in ignored_symbols:
+        ipa = ipa.replace(symbol, "")
+
+    return ipa
+
+
+class IpaNormalizer:
+    """Clean up pronunciations once before they're split into syllables.
+
+    Each pronunciation is converted to Unicode normalization form NFC, so that
+    precomposed and decomposed spellings of a symbol both match the config, and
+    the config's ignored IPA symbols are removed. Equal results share one
+    string, and a word's pronunciations that become equal are only kept once.
+    """
+
+    def __init__(self, ignored_symbols=()):
+        """Create a normalizer.
+
+        Args:
+            ignored_symbols: Strings to remove from every pronunciation, e.g.
+                Config.get_ignored_ipa_symbols().
+        """
+
+        self._ignored_symbols = list(ignored_symbols)
+
+        # Map each pronunciation seen so far to its normalized, shared string.
+        self._normalized = {}
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a normalizer for the ignored IPA symbols of a Config."""
+
+        return cls(config.get_ignored_ipa_symbols())
+
+    def normalize(self, ipa):
+        """Return the normalized form of one pronunciation."""
+
+        normalized = self._normalized.get(ipa)
+        if normalized is not None:
+            return normalized
+
+        normalized = normalize_ipa(ipa, self._ignored_symbols)
+
+        # Share one string between every pronunciation that normalizes to it.
+        normalized = self._normalized.setdefault(normalized, normalized)
+        self._normalized[ipa] = normalized
+
+        return normalized
+
+    def normalize_pronunciations(self, pronunciations):
+        """Return a list of normalized pronunciations without duplicates, in order."""
+
+        return list(dict.fromkeys(map(self.normalize, pronunciations)))
+
+    def normalize_lookup_dictionary(self, word_to_ipa):
+        """Normalize the pronunciations of every word in a dictionary, in place.
+
+        Args:
+            word_to_ipa: A dictionary like the one returned by
+                create_ipa_lookup_dictionary().
+
+        Returns:
+            `word_to_ipa`.
+        """
+
+        for word, pronunciations in word_to_ipa.items():
+            word_to_ipa[word] = self.normalize_pronunciations(pronunciations)
+
+        return word_to_ipa
+
+
+@dataclasses.dataclass(slots=True)
+class _SyllablePhonemes:
+    """A struct used internally to store phonemes for a syllable."""
+
+    onset: list[str]
+    nucleus: str
+    coda: list[str]
+
+
+class SyllableSplitError(Exception):
+    """Error for when a pronunciation can't be split into syllables."""
+
+
+class NoSyllablesError(SyllableSplitError):
+    """Error for when a pronunciation has no vowel phonemes."""
+
+
+class LeadingConsonantsError(SyllableSplitError):
+    """Error for when the consonants before the first vowel can't form an onset.
+
+    This should be raised when the config's phonology rules don't allow the
+    consonants at the start of a pronunciation to be prepended to the first
+    syllable's onset, so they can't go anywhere.
+    """
 
 
 def split_ipa_into_syllables(ipa, config):
     """Split the pronunciation of a word given by IPA into syllables.
 
+    This is the same as split_ipa_into_syllables_or_raise(), but logs a warning
+    and returns None if the pronunciation can't be split.
+    """
+    log = logging.getLogger("dictionary_generator")
+
+    try:
+        return split_ipa_into_syllables_or_raise(ipa, config)
+    except NoSyllablesError:
+        log.warning("No syllables found for `%s`", ipa)
+    except LeadingConsonantsError:
+        log.warning("Unable to assign leading consonants for `%s`", ipa)
+
+    return None
+
+
+def split_ipa_into_syllables_or_raise(ipa, config):
+    """Split the pronunciation of a word given by IPA into syllables.
+
     This function was designed for splitting English words into syllables, and
     may not work properly for other languages. The algorithm used to split
     syllables is:
@@ -118,8 +499,12 @@ def split_ipa_into_syllables(ipa, config):
 
     Returns:
         A list of Syllables (see syllable.py) for the word.
+
+    Raises:
+        NoSyllablesError: If the pronunciation has no vowels.
+        LeadingConsonantsError: If the consonants at the start of the
+            pronunciation can't be assigned to the first syllable.
     """
-    log = logging.getLogger("dictionary_generator")
 
     # The vowels and consonants lists must be sorted so that entries with more
     # characters appear earlier. This is so that when we look for these
@@ -140,14 +525,6 @@ def split_ipa_into_syllables(ipa, config):
     for vowel in vowels:
         ipa_copy = ipa_copy.replace(vowel, phoneme_to_marker[vowel])
 
-    @dataclasses.dataclass
-    class SyllablePhonemes:
-        """A struct used internally to strore phonemes for a syllable."""
-
-        onset: list[str]
-        nucleus: str
-        coda: list[str]
-
     syllables = []
     syllable_start_index = 0
     matches = re.finditer(r"\([0-9]+\)", ipa_copy)
@@ -157,12 +534,11 @@ def split_ipa_into_syllables(ipa, config):
         marker = ipa_copy[match.start() : match.end()]
         nucleus = marker_to_phoneme[marker]
         coda = []
-        syllables.append(SyllablePhonemes(onset, nucleus, coda))
+        syllables.append(_SyllablePhonemes(onset, nucleus, coda))
         syllable_start_index = match.end()
 
     if len(syllables) == 0:
-        log.warning("No syllables found for `%s`", ipa)
-        return None
+        raise NoSyllablesError(f"No syllables found for `{ipa}`")
 
     # Step 2: Work backwards from each nucleus to form the onset.
     leftovers = ipa_copy[syllable_start_index:]
@@ -202,8 +578,9 @@ def split_ipa_into_syllables(ipa, config):
             else:
                 if i == 0:
                     # This syllable must take the leading consonants.
-                    log.warning("Unable to assign leading consonants for `%s`", ipa)
-                    return None
+                    raise LeadingConsonantsError(
+                        f"Unable to assign leading consonants for `{ipa}`"
+                    )
 
                 # We can't prepend this phoneme to the syllable, so give
                 # all the unused phonems to the previous syllable's coda.
@@ -213,4 +590,5 @@ def split_ipa_into_syllables(ipa, config):
 
         syllables[i].onset = new_onset
 
-    return [Syllable(syll.onset, syll.nucleus, syll.coda) for syll in syllables]
+    phoneme_ids = config.get_phoneme_ids()
+    return [Syllable(syll.onset, syll.nucleus, syll.coda, phoneme_ids) for syll in syllables]
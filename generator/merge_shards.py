@@ -0,0 +1,127 @@
+"""Merge dictionary shards generated on separate machines.
+
+Each shard is made by running generate_phonetic_dictionary.py with the
+`--shard i/N` flag. Merging the shards resolves conflicts in word list order
+and writes the final dictionary, which is identical to the dictionary made by
+a single run without `--shard`.
+"""
+
+import argparse
+import logging
+import sys
+
+from config import Config, InvalidConfigError
+import core
+import existing_dictionaries
+import reverse_index
+import sharding
+
+
+def get_args():
+    """Parse command-line arguments."""
+
+    parser = argparse.ArgumentParser(description="Merge generated dictionary shards.")
+
+    parser.add_argument("shard_files", nargs="+", help="the shard files to merge")
+    parser.add_argument(
+        "--config_file",
+        type=str,
+        required=True,
+        help="the config file the shards were generated with",
+    )
+    parser.add_argument(
+        "-o", "--output_file", help="Path to the output file", default="output.json"
+    )
+    parser.add_argument(
+        "--output_format",
+        choices=core.OUTPUT_FORMATS,
+        default=core.OUTPUT_FORMAT_JSON,
+        help="write a JSON dictionary, a compact memory-mappable binary dictionary, "
+        + "or an indexed SQLite database",
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="write the JSON output without whitespace"
+    )
+    parser.add_argument(
+        "--sort_by_stroke",
+        action="store_true",
+        help="sort the output by stroke sequence instead of by word list order",
+    )
+    parser.add_argument(
+        "--existing-dictionary",
+        action="append",
+        default=[],
+        dest="existing_dictionaries",
+        metavar="DICTIONARY",
+        help="a JSON dictionary the output will be used with; words it defines are skipped and "
+        + "its strokes aren't reused (can be given more than once)",
+    )
+    parser.add_argument(
+        "--reverse_index_file",
+        help="also write a word to strokes index for reverse_index.py to this file",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="count", default=0, help="increase output verbosity"
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Merge shards using command-line arguments."""
+
+    args = get_args()
+
+    # Setup logging.
+    log_level = logging.WARNING
+    if args.verbose == 1:
+        log_level = logging.INFO
+    elif args.verbose >= 2:
+        log_level = logging.DEBUG
+
+    log_format = "%(levelname)s: %(message)s"
+    logging.basicConfig(level=log_level, format=log_format)
+    log = logging.getLogger("dictionary_generator")
+
+    try:
+        config = Config(args.config_file)
+    except InvalidConfigError as err:
+        log.critical(err)
+        sys.exit(1)
+
+    try:
+        existing = existing_dictionaries.load_existing_dictionaries(
+            args.existing_dictionaries, config
+        )
+    except (OSError, ValueError) as err:
+        log.critical("Unable to load existing dictionaries: %s", err)
+        sys.exit(1)
+
+    try:
+        words_and_strokes = sharding.merge_shards(args.shard_files, config, existing)
+
+        word_to_syllables = None
+        word_list_file = None
+        if args.output_format == core.OUTPUT_FORMAT_SQLITE:
+            word_to_syllables = sharding.describe_shard_syllables(args.shard_files, config)
+            word_list_file = sharding.get_shard_word_list_file(args.shard_files)
+    except sharding.InvalidShardError as err:
+        log.critical(err)
+        sys.exit(1)
+
+    core.write_dictionary_to_file(
+        words_and_strokes,
+        args.output_file,
+        args.compact,
+        args.sort_by_stroke,
+        args.output_format,
+        word_to_syllables,
+        word_list_file,
+    )
+
+    if args.reverse_index_file is not None:
+        reverse_index.write_reverse_index(words_and_strokes, args.reverse_index_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Find entries that are one key away from each other.
+
+If two entries' strokes only differ by a single key, pressing or missing that
+key while writing one word gives the other, which makes them a common source
+of misstrokes.
+
+Rather than comparing every pair of entries, each key that's missing from a
+stroke of an entry is added to it in turn, by setting its bit in the packed
+stroke (see Stroke.to_int()), and the resulting stroke sequence is looked up in
+a hash index of the dictionary. This finds every pair from the entry without
+the extra key, in time proportional to the number of strokes in the
+dictionary.
+
+Usage:
+    python misstrokes.py <dictionary>... [--frequency_file <file>]
+"""
+
+import argparse
+
+import binary_dictionary
+from steno import Key, Stroke
+
+_KEY_BITS = [(1 << key.index, key) for key in Key]
+
+
+class RiskyPair:
+    """Two entries whose stroke sequences differ by a single key.
+
+    Attributes:
+        key: The tuple of packed strokes of the first entry.
+        translation: The translation of the first entry.
+        neighbor_key: The tuple of packed strokes of the second entry.
+        neighbor_translation: The translation of the second entry.
+        position: The index of the stroke that differs.
+        steno_key: The Key that's in the second entry but not the first.
+    """
+
+    __slots__ = [
+        "key",
+        "translation",
+        "neighbor_key",
+        "neighbor_translation",
+        "position",
+        "steno_key",
+    ]
+
+    def __init__(
+        self, key, translation, neighbor_key, neighbor_translation, position, steno_key
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.key = key
+        self.translation = translation
+        self.neighbor_key = neighbor_key
+        self.neighbor_translation = neighbor_translation
+        self.position = position
+        self.steno_key = steno_key
+
+    def __str__(self):
+        return (
+            f"{_key_to_string(self.key)} ({self.translation}) / "
+            + f"{_key_to_string(self.neighbor_key)} ({self.neighbor_translation}): "
+            + f"{self.steno_key.letter} in stroke {self.position + 1}"
+        )
+
+
+def _key_to_string(key):
+    return "/".join(str(Stroke.from_int(packed)) for packed in key)
+
+
+def find_risky_pairs(entries):
+    """Find every pair of entries whose strokes differ by a single key.
+
+    Pairs of entries with the same translation are skipped, since writing one
+    instead of the other gives the same output.
+
+    Args:
+        entries: A dictionary mapping tuples of packed strokes (see
+            binary_dictionary.pack_stroke_sequence()) to translations.
+
+    Returns:
+        A list of RiskyPairs. Each pair is only listed once, with the first
+        entry being the one without the extra key.
+    """
+
+    pairs = []
+
+    for key, translation in entries.items():
+        for position, packed in enumerate(key):
+            prefix = key[:position]
+            suffix = key[position + 1 :]
+
+            for bit, steno_key in _KEY_BITS:
+                # Each pair is found from the entry without the extra key, so
+                # it's only listed once.
+                if packed & bit:
+                    continue
+
+                neighbor_key = prefix + (packed | bit,) + suffix
+                neighbor_translation = entries.get(neighbor_key)
+                if neighbor_translation is None or neighbor_translation == translation:
+                    continue
+
+                pairs.append(
+                    RiskyPair(
+                        key, translation, neighbor_key, neighbor_translation, position, steno_key
+                    )
+                )
+
+    return pairs
+
+
+def read_frequency_ranks(frequency_file):
+    """Read a frequency list with the most common word first, one per line.
+
+    Returns:
+        A dictionary mapping each word to its rank, starting at 0.
+    """
+
+    with open(frequency_file, "r", encoding="UTF-8") as file:
+        ranks = {}
+        for rank, line in enumerate(file):
+            ranks.setdefault(line.strip(), rank)
+        return ranks
+
+
+def rank_pairs(pairs, frequency_ranks):
+    """Sort risky pairs so the ones involving the most common words are first.
+
+    Pairs are ordered by the rank of their more common word, then by the rank of
+    the other word. Words that aren't in the frequency list are ranked last.
+
+    Args:
+        pairs: A list of RiskyPairs.
+        frequency_ranks: The returned value of read_frequency_ranks().
+
+    Returns:
+        A sorted list of the RiskyPairs.
+    """
+
+    unranked = len(frequency_ranks)
+
+    def sort_key(pair):
+        ranks = sorted(
+            (
+                frequency_ranks.get(pair.translation, unranked),
+                frequency_ranks.get(pair.neighbor_translation, unranked),
+            )
+        )
+        return (ranks, pair.key, pair.neighbor_key)
+
+    return sorted(pairs, key=sort_key)
+
+
+def main():
+    """Print the entries of dictionaries that are one key apart."""
+
+    parser = argparse.ArgumentParser(description="Find entries that are one key apart.")
+    parser.add_argument(
+        "dictionaries", nargs="+", help="JSON or binary dictionaries, highest priority first"
+    )
+    parser.add_argument(
+        "--frequency_file",
+        help="a list of words with the most common first, to rank the pairs by",
+    )
+    parser.add_argument(
+        "--limit", type=int, help="the most pairs to print (default: print every pair)"
+    )
+    args = parser.parse_args()
+
+    entries = binary_dictionary.read_packed_entries(args.dictionaries)
+    pairs = find_risky_pairs(entries)
+
+    if args.frequency_file is not None:
+        pairs = rank_pairs(pairs, read_frequency_ranks(args.frequency_file))
+    else:
+        pairs.sort(key=lambda pair: (pair.key, pair.neighbor_key))
+
+    print(f"Found {len(pairs)} pairs of entries that are one key apart")
+    for pair in pairs[: args.limit]:
+        print(pair)
+
+
+if __name__ == "__main__":
+    main()
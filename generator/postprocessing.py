@@ -52,7 +52,189 @@ def _disallow_f_for_final_s_sound(strokes, syllables_ipa):
             strokes.clear()
 
 
-def postprocess_generated_dictionary(word_and_translations, config):
+# The number of bits each packed stroke takes up in a sequence key. See
+# Stroke.to_int().
+_BITS_PER_STROKE = len(Key)
+
+
+def _get_key_and_num_strokes(packed_strokes):
+    key = 0
+    shift = 0
+
+    for packed in packed_strokes:
+        # Empty strokes are dropped, the same as when a StrokeSequence is
+        # converted to a string.
+        if packed != 0:
+            key |= packed << shift
+            shift += _BITS_PER_STROKE
+
+    return (key, shift // _BITS_PER_STROKE)
+
+
+def get_sequence_key(stroke_sequence):
+    """Return an integer that identifies how a StrokeSequence is written.
+
+    The non-empty strokes are packed (see Stroke.to_int()) into consecutive
+    groups of bits, starting from the least significant bits. Two sequences
+    have the same key exactly when they're written the same, so keys can be
+    used in place of strings like "KAT/HRAOG" while using much less memory.
+    """
+
+    return _get_key_and_num_strokes(stroke_sequence.to_ints())[0]
+
+
+def get_packed_sequence_key(packed_strokes):
+    """Return the same key as get_sequence_key() for a list of packed strokes.
+
+    Args:
+        packed_strokes: A list of packed strokes, as returned by
+            StrokeSequence.to_ints().
+    """
+
+    return _get_key_and_num_strokes(packed_strokes)[0]
+
+
+class Disambiguator:
+    """Resolve conflicts between stroke sequences for different words.
+
+    Stroke sequences are claimed in the order they are given to
+    disambiguate(). If a sequence is already taken, the disambiguator stroke is
+    appended to it until it's unique.
+
+    Sequences are tracked by their keys (see get_sequence_key()). For each base
+    sequence, the disambiguator also remembers how many disambiguator strokes
+    the last conflicting word needed. Every sequence with fewer disambiguator
+    strokes is already taken, so the next word with that base sequence starts
+    from there instead of checking each of them again.
+    """
+
+    def __init__(self, disambiguator_stroke, used_keys=None, next_counts=None):
+        """Create a Disambiguator.
+
+        Args:
+            disambiguator_stroke: The Stroke to append to conflicting
+                StrokeSequences.
+            used_keys: An optional set of keys for stroke sequences that are
+                already taken.
+            next_counts: An optional dictionary from get_next_counts() of a
+                Disambiguator that had the same used keys.
+        """
+
+        self._disambiguator_stroke = disambiguator_stroke
+        self._disambiguator_packed = disambiguator_stroke.to_int()
+        self._used_keys = used_keys if used_keys is not None else set()
+        self._next_counts = next_counts if next_counts is not None else {}
+        # The keys for 0, 1, 2, ... disambiguator strokes in a row.
+        self._repeated_disambiguator = [0]
+
+    def claim(self, translation):
+        """Claim a StrokeSequence without modifying it.
+
+        Args:
+            translation: A StrokeSequence for a word.
+
+        Returns:
+            The number of disambiguator strokes that have to be appended to
+            `translation` for it to be unique. The sequence with those strokes
+            appended is marked as taken.
+        """
+
+        base_key, num_strokes = _get_key_and_num_strokes(translation.to_ints())
+        count = self._next_counts.get(base_key, 0)
+
+        shift = num_strokes * _BITS_PER_STROKE
+        key = base_key | self._get_repeated_disambiguator(count) << shift
+        shift += count * _BITS_PER_STROKE
+
+        while key in self._used_keys:
+            key |= self._disambiguator_packed << shift
+            shift += _BITS_PER_STROKE
+            count += 1
+
+        self._used_keys.add(key)
+        # Only remember base sequences that had a conflict to save memory.
+        # Starting from 0 for the rest is still correct.
+        if count > 0 or base_key in self._next_counts:
+            self._next_counts[base_key] = count + 1
+
+        return count
+
+    def _get_repeated_disambiguator(self, count):
+        """Return the key for `count` disambiguator strokes in a row."""
+
+        repeated = self._repeated_disambiguator
+        while len(repeated) <= count:
+            repeated.append(
+                repeated[-1] | self._disambiguator_packed << (len(repeated) - 1) * _BITS_PER_STROKE
+            )
+
+        return repeated[count]
+
+    def disambiguate(self, translations):
+        """Make each StrokeSequence unique, updating them in place.
+
+        Args:
+            translations: A list of StrokeSequences for a single word.
+        """
+
+        for translation in translations:
+            for _ in range(self.claim(translation)):
+                translation.append_stroke(self._disambiguator_stroke)
+
+    def mark_used(self, translations):
+        """Claim the StrokeSequences without modifying them.
+
+        Args:
+            translations: A list of StrokeSequences that are already unique.
+        """
+
+        for translation in translations:
+            self._used_keys.add(get_sequence_key(translation))
+
+    def mark_used_packed(self, packed_translations):
+        """Claim stroke sequences given as lists of packed strokes.
+
+        Args:
+            packed_translations: A list of lists of packed strokes (see
+                StrokeSequence.to_ints()) that are already unique.
+        """
+
+        for packed_strokes in packed_translations:
+            self._used_keys.add(get_packed_sequence_key(packed_strokes))
+
+    def get_used_keys(self):
+        """Return the set of keys for stroke sequences that are taken."""
+
+        return self._used_keys
+
+    def get_next_counts(self):
+        """Return the number of disambiguator strokes to start from for each base key."""
+
+        return self._next_counts
+
+
+def create_disambiguator(config, used_keys=None, next_counts=None):
+    """Create a Disambiguator based on the config.
+
+    Args:
+        config: The Config specifying how strokes should be generated.
+        used_keys: An optional set of keys for stroke sequences that are
+            already taken (see get_sequence_key()).
+        next_counts: An optional dictionary from Disambiguator.get_next_counts()
+            to restore along with `used_keys`.
+
+    Returns:
+        A Disambiguator, or None if the config doesn't enable appending the
+        disambiguator stroke.
+    """
+
+    if not config.should_append_disambiguator_stroke():
+        return None
+
+    return Disambiguator(config.get_disambiguator_stroke(), used_keys, next_counts)
+
+
+def postprocess_generated_dictionary(word_and_translations, config, disambiguator=None):
     """Make custom modifications to the generated steno dictionary.
 
     This can be used to resolve homophone conflicts for example, by looping
@@ -66,6 +248,9 @@ def postprocess_generated_dictionary(word_and_translations, config):
             the tuple is a StrokeSequences, with each StrokeSequence being a way
             to write the word in steno.
         config: The Config specifying how strokes should be generated.
+        disambiguator: An optional Disambiguator to resolve conflicts with. Pass
+            one in when some stroke sequences are already taken, e.g. by words
+            earlier in the word list that were processed separately.
 
     Returns:
         An updated version of the input after applying any modifications to the
@@ -75,14 +260,10 @@ def postprocess_generated_dictionary(word_and_translations, config):
     if config.should_append_disambiguator_stroke():
         # If a desired definition is already taken, append a the disambiguator
         # stroke until it's unique.
-        used_translation_strings = set()
-        disambiguator_stroke = config.get_disambiguator_stroke()
+        if disambiguator is None:
+            disambiguator = create_disambiguator(config)
 
         for _, translations in word_and_translations:
-            for translation in translations:
-                while str(translation) in used_translation_strings:
-                    translation.append_stroke(disambiguator_stroke)
-
-                used_translation_strings.add(str(translation))
+            disambiguator.disambiguate(translations)
 
     return word_and_translations
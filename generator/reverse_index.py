@@ -0,0 +1,349 @@
+"""Look up how to write a word in steno with a memory-mappable reverse index.
+
+A steno dictionary maps stroke sequences to words, so finding the strokes for a
+word means scanning every entry. A reverse index maps each word to its stroke
+sequences instead. Words are sorted by their lowercased form so that exact,
+case-insensitive, and prefix queries are all answered with a binary search of
+the memory-mapped file.
+
+The file layout, with all integers little-endian, is:
+    1. A header (see _HEADER) with the magic bytes, format version, number of
+       words, and the byte offsets of the four sections below.
+    2. The records section, with one record per word (see _RECORD), sorted by
+       the lowercased word, then the word, then the word's position in the
+       generated dictionary.
+    3. The sequences section, with one record per stroke sequence (see
+       _SEQUENCE) giving where its strokes are in the strokes section. A
+       word's sequences are in the same order as in the generated dictionary.
+    4. The strokes section, an array of 32-bit packed strokes (see
+       binary_dictionary.pack_stroke_sequence()).
+    5. The strings section, with the UTF-8 encoded words and lowercased words.
+
+Usage:
+    python reverse_index.py [--prefix] [--ignore_case] <word> <index>...
+"""
+
+import argparse
+import mmap
+import struct
+
+import binary_dictionary
+from generated_dictionary import iter_packed
+from steno import StrokeSequence
+
+REVERSE_INDEX_EXTENSION = ".stenorev"
+
+_MAGIC = b"STENOREV"
+_VERSION = 1
+
+# Magic, version, number of words, and the offsets of the records, sequences,
+# strokes, and strings sections.
+_HEADER = struct.Struct("<8sIIQQQQ")
+
+# The byte offset and length of the lowercased word in the strings section,
+# the byte offset and length of the word, the index of the word's first
+# sequence in the sequences section, and the number of sequences.
+_RECORD = struct.Struct("<IIIIII")
+
+# The index of the sequence's first stroke in the strokes section and the
+# number of strokes.
+_SEQUENCE = struct.Struct("<II")
+
+_STROKE = struct.Struct("<I")
+
+
+class InvalidReverseIndexError(Exception):
+    """Error for when a file is not a reverse index this module can read."""
+
+
+def write_reverse_index(words_and_translations, output_file):
+    """Write a reverse index for a generated dictionary.
+
+    Args:
+        words_and_translations: The returned value from
+            core.generate_dictionary().
+        output_file: The name of the file to write.
+
+    Returns:
+        The number of words written.
+    """
+
+    # Sorting by position as well keeps the order of repeated words stable.
+    entries = sorted(
+        (word.lower().encode("UTF-8"), word.encode("UTF-8"), position, packed_translations)
+        for position, (word, packed_translations) in enumerate(iter_packed(words_and_translations))
+    )
+
+    records = bytearray()
+    sequences = bytearray()
+    strokes = bytearray()
+    strings = bytearray()
+    num_sequences = 0
+    num_strokes = 0
+
+    for encoded_key, encoded_word, _, packed_translations in entries:
+        records += _RECORD.pack(
+            len(strings),
+            len(encoded_key),
+            len(strings) + len(encoded_key),
+            len(encoded_word),
+            num_sequences,
+            len(packed_translations),
+        )
+        strings += encoded_key
+        strings += encoded_word
+
+        for packed_strokes in packed_translations:
+            packed = binary_dictionary.get_lookup_key(packed_strokes)
+            sequences += _SEQUENCE.pack(num_strokes, len(packed))
+            strokes += struct.pack(f"<{len(packed)}I", *packed)
+            num_strokes += len(packed)
+
+        num_sequences += len(packed_translations)
+
+    records_offset = _HEADER.size
+    sequences_offset = records_offset + len(records)
+    strokes_offset = sequences_offset + len(sequences)
+    strings_offset = strokes_offset + len(strokes)
+
+    with open(output_file, "wb") as file:
+        file.write(
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                len(entries),
+                records_offset,
+                sequences_offset,
+                strokes_offset,
+                strings_offset,
+            )
+        )
+        file.write(records)
+        file.write(sequences)
+        file.write(strokes)
+        file.write(strings)
+
+    return len(entries)
+
+
+class ReverseIndex:
+    """A memory-mapped reverse index.
+
+    Opening an index only reads its header. Each query takes O(log n) time plus
+    the time to read the matching words.
+
+    Queries return a list of tuples where the first item in each tuple is a
+    word and the second is the list of StrokeSequences for it, in the order of
+    the lowercased words.
+
+    This can be used as a context manager, which closes the index on exit.
+    """
+
+    def __init__(self, filename):
+        """Open a reverse index.
+
+        Raises:
+            InvalidReverseIndexError: If the file is not a reverse index.
+        """
+
+        self.filename = str(filename)
+        self._file = open(filename, "rb")  # pylint: disable=consider-using-with
+
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as err:
+            # mmap can't map an empty file.
+            self._file.close()
+            raise InvalidReverseIndexError(f"`{filename}` is empty") from err
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise InvalidReverseIndexError(f"`{filename}` is not a reverse index")
+
+        (
+            magic,
+            version,
+            self._num_words,
+            self._records_offset,
+            self._sequences_offset,
+            self._strokes_offset,
+            self._strings_offset,
+        ) = _HEADER.unpack_from(self._map, 0)
+
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise InvalidReverseIndexError(
+                f"`{filename}` is not a reverse index of a supported version"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._num_words
+
+    def close(self):
+        """Release the memory map and the file."""
+
+        self._map.close()
+        self._file.close()
+
+    def lookup(self, word, ignore_case=False):
+        """Find the stroke sequences for a word.
+
+        Args:
+            word: The word to look up.
+            ignore_case: True if words that only differ from `word` by case
+                should also be returned.
+
+        Returns:
+            A list of (word, StrokeSequences) tuples. It's empty if there's no
+            match.
+        """
+
+        key = word.lower().encode("UTF-8")
+        results = []
+
+        for index in range(self._find_first(key), self._num_words):
+            if self._read_key(index) != key:
+                break
+
+            if ignore_case or self._read_word(index) == word:
+                results.append(self._read_entry(index))
+
+        return results
+
+    def lookup_prefix(self, prefix, ignore_case=False, limit=None):
+        """Find the stroke sequences for words starting with a prefix.
+
+        Args:
+            prefix: The start of the words to look up.
+            ignore_case: True if the prefix should match regardless of case.
+            limit: The most results to return, or None to return all of them.
+
+        Returns:
+            A list of (word, StrokeSequences) tuples. It's empty if there's no
+            match.
+        """
+
+        key = prefix.lower().encode("UTF-8")
+        results = []
+
+        for index in range(self._find_first(key), self._num_words):
+            if limit is not None and len(results) >= limit:
+                break
+
+            if not self._read_key(index).startswith(key):
+                break
+
+            if ignore_case or self._read_word(index).startswith(prefix):
+                results.append(self._read_entry(index))
+
+        return results
+
+    def items(self):
+        """Yield every (word, StrokeSequences) entry in sorted order."""
+
+        for index in range(self._num_words):
+            yield self._read_entry(index)
+
+    def _find_first(self, key):
+        """Return the index of the first record whose key is not less than `key`."""
+
+        low = 0
+        high = self._num_words
+
+        while low < high:
+            middle = (low + high) // 2
+            if self._read_key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def _read_record(self, index):
+        return _RECORD.unpack_from(self._map, self._records_offset + index * _RECORD.size)
+
+    def _read_string(self, start, length):
+        start += self._strings_offset
+        return self._map[start : start + length]
+
+    def _read_key(self, index):
+        key_start, key_length, _, _, _, _ = self._read_record(index)
+        return self._read_string(key_start, key_length)
+
+    def _read_word(self, index):
+        _, _, word_start, word_length, _, _ = self._read_record(index)
+        return self._read_string(word_start, word_length).decode("UTF-8")
+
+    def _read_entry(self, index):
+        _, _, word_start, word_length, first_sequence, num_sequences = self._read_record(index)
+
+        translations = []
+        for sequence in range(first_sequence, first_sequence + num_sequences):
+            first_stroke, num_strokes = _SEQUENCE.unpack_from(
+                self._map, self._sequences_offset + sequence * _SEQUENCE.size
+            )
+            packed = struct.unpack_from(
+                f"<{num_strokes}I", self._map, self._strokes_offset + first_stroke * _STROKE.size
+            )
+            translations.append(StrokeSequence.from_ints(packed))
+
+        return (self._read_string(word_start, word_length).decode("UTF-8"), translations)
+
+
+def lookup_in_indexes(indexes, word, prefix=False, ignore_case=False):
+    """Query several reverse indexes at once.
+
+    Args:
+        indexes: A list of ReverseIndex objects.
+        word: The word, or the start of the words if `prefix` is True.
+        prefix: True if every word starting with `word` should be found.
+        ignore_case: True if words should match regardless of case.
+
+    Returns:
+        A list of tuples of the index's filename, the word, and the list of
+        StrokeSequences for it, in the order the indexes are given.
+    """
+
+    results = []
+    for index in indexes:
+        if prefix:
+            matches = index.lookup_prefix(word, ignore_case)
+        else:
+            matches = index.lookup(word, ignore_case)
+
+        results += [(index.filename, found, translations) for found, translations in matches]
+
+    return results
+
+
+def main():
+    """Look up how to write words in one or more reverse indexes."""
+
+    parser = argparse.ArgumentParser(description="Look up the strokes for a word.")
+    parser.add_argument("word", help="the word to look up")
+    parser.add_argument("indexes", nargs="+", help="the reverse index files to search")
+    parser.add_argument(
+        "--prefix", action="store_true", help="find every word starting with the given word"
+    )
+    parser.add_argument("--ignore_case", action="store_true", help="ignore case when matching")
+    args = parser.parse_args()
+
+    indexes = [ReverseIndex(filename) for filename in args.indexes]
+    try:
+        results = lookup_in_indexes(indexes, args.word, args.prefix, args.ignore_case)
+    finally:
+        for index in indexes:
+            index.close()
+
+    for filename, word, translations in results:
+        print(f"{filename}: {word}: {', '.join(str(t) for t in translations)}")
+
+
+if __name__ == "__main__":
+    main()
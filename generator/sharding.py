@@ -0,0 +1,364 @@
+"""Split dictionary generation across machines and merge the results.
+
+Shard `i` of `N` translates every word whose position in the word list is
+congruent to `i` modulo `N`, so every shard gets a similar mix of common and
+rare words. Each shard writes its translations before conflicts are resolved,
+along with each word's position in the word list. Merging puts the
+translations back in word list order and then resolves conflicts, which gives
+the same result as generating the whole dictionary on one machine.
+"""
+
+import hashlib
+import json
+
+import core
+from existing_dictionaries import fingerprint_config
+from generated_dictionary import GeneratedDictionary
+import ipa_utils
+import postprocessing
+from steno import StrokeSequence
+import stroke_builder
+
+SHARD_VERSION = 4
+
+_STR_VERSION = "version"
+_STR_SHARD_INDEX = "shard_index"
+_STR_SHARD_COUNT = "shard_count"
+_STR_CONFIG_FINGERPRINT = "config_fingerprint"
+_STR_WORD_LIST_FILE = "word_list_file"
+_STR_WORD_LIST_FINGERPRINT = "word_list_fingerprint"
+_STR_IPA_FINGERPRINT = "ipa_fingerprint"
+_STR_NUM_WORDS_REQUESTED = "num_words_requested"
+_STR_POSITIONS = "positions"
+_STR_WORDS = "words"
+_STR_TRANSLATIONS = "translations"
+_STR_IPA = "ipa"
+
+# The number of bytes of an IPA file to read at a time when fingerprinting it.
+_FINGERPRINT_CHUNK_SIZE = 1 << 20
+
+# The type of each field of a shard file.
+_SHARD_FIELD_TYPES = {
+    _STR_SHARD_INDEX: int,
+    _STR_SHARD_COUNT: int,
+    _STR_CONFIG_FINGERPRINT: str,
+    _STR_WORD_LIST_FILE: str,
+    _STR_WORD_LIST_FINGERPRINT: str,
+    _STR_IPA_FINGERPRINT: str,
+    _STR_NUM_WORDS_REQUESTED: int,
+    _STR_POSITIONS: list,
+    _STR_WORDS: list,
+    _STR_TRANSLATIONS: list,
+    _STR_IPA: list,
+}
+
+
+class InvalidShardError(Exception):
+    """Error for when shard files can't be merged.
+
+    This should be raised when a shard file is malformed, when shards were made
+    from different inputs, or when some shards are missing.
+    """
+
+
+def parse_shard_spec(spec):
+    """Parse a shard specification of the form "i/N".
+
+    Args:
+        spec: A string like "0/4", meaning the first of four shards.
+
+    Raises:
+        ValueError: If the string isn't of the form "i/N" with 0 <= i < N.
+
+    Returns:
+        A tuple of the shard index and the number of shards.
+    """
+
+    try:
+        index_str, count_str = spec.split("/")
+        shard_index = int(index_str)
+        shard_count = int(count_str)
+    except ValueError as err:
+        raise ValueError(f"`{spec}` is not of the form i/N") from err
+
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"`{spec}` must satisfy 0 <= i < N")
+
+    return (shard_index, shard_count)
+
+
+def get_shard_file(output_file, shard_index, shard_count):
+    """Return the filename a shard's results are written to."""
+
+    return f"{output_file}.shard-{shard_index}-of-{shard_count}"
+
+
+def fingerprint_word_list(word_list_file):
+    """Return a string that changes whenever the word list's contents change."""
+
+    with open(word_list_file, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def fingerprint_ipa_files(ipa_file):
+    """Return a string that changes whenever the IPA files' contents change.
+
+    Unlike checkpoint.fingerprint_inputs(), this reads the files in full,
+    since a copy of an IPA file on another machine has a different
+    modification time.
+
+    Args:
+        ipa_file: An IPA filename, or a list of them in priority order.
+    """
+
+    digest = hashlib.sha256()
+    for filename in ipa_utils.get_ipa_files(ipa_file):
+        file_digest = hashlib.sha256()
+        with open(filename, "rb") as file:
+            while chunk := file.read(_FINGERPRINT_CHUNK_SIZE):
+                file_digest.update(chunk)
+
+        digest.update(file_digest.digest())
+
+    return digest.hexdigest()
+
+
+def generate_shard(
+    ipa_file,
+    word_list_file,
+    config,
+    shard_index,
+    shard_count,
+    shard_file,
+    existing_dictionaries=None,
+    use_ipa_index=False,
+    reuse_strokes=False,
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    """Translate one shard of the word list and save the results.
+
+    Conflicts are not resolved; that's done by merge_shards().
+
+    Args:
+        ipa_file: A CSV file that gives the pronunciation in IPA for a word.
+            See core.generate_dictionary() for the expected format.
+        word_list_file: A file of words that should be translated into steno
+            strokes, with one word per line.
+        config: The Config specifying how strokes should be generated.
+        shard_index: Which shard to translate, from 0 to `shard_count - 1`.
+        shard_count: The total number of shards.
+        shard_file: The file to write the shard's results to.
+        existing_dictionaries: An optional ExistingDictionaries whose words
+            aren't translated. The same dictionaries must be given to
+            merge_shards().
+        use_ipa_index: True if pronunciations should be looked up with an
+            index of each IPA file; see core.generate_dictionary().
+        reuse_strokes: True if strokes should be reused between words; see
+            core.generate_dictionary().
+    """
+
+    words = core.read_word_list(word_list_file)
+
+    if existing_dictionaries is not None:
+        words = existing_dictionaries.filter_words(words)
+
+    stroke_cache = stroke_builder.StrokeCache() if reuse_strokes else None
+    positions = []
+    shard_words = []
+    translations = []
+    pronunciations = []
+
+    with core.open_pronunciations(
+        ipa_file, words[shard_index::shard_count], config, use_ipa_index
+    ) as word_to_ipa:
+        for position in range(shard_index, len(words), shard_count):
+            word = words[position]
+            translations_for_word = core.translate_word(word, word_to_ipa, config, stroke_cache)
+
+            if len(translations_for_word) > 0:
+                positions.append(position)
+                shard_words.append(word)
+                translations.append(
+                    [translation.to_ints() for translation in translations_for_word]
+                )
+                pronunciations.append(word_to_ipa[word.lower()])
+
+    shard = {
+        _STR_VERSION: SHARD_VERSION,
+        _STR_SHARD_INDEX: shard_index,
+        _STR_SHARD_COUNT: shard_count,
+        _STR_CONFIG_FINGERPRINT: fingerprint_config(config, existing_dictionaries),
+        _STR_WORD_LIST_FILE: word_list_file,
+        _STR_WORD_LIST_FINGERPRINT: fingerprint_word_list(word_list_file),
+        _STR_IPA_FINGERPRINT: fingerprint_ipa_files(ipa_file),
+        _STR_NUM_WORDS_REQUESTED: len(words),
+        _STR_POSITIONS: positions,
+        _STR_WORDS: shard_words,
+        _STR_TRANSLATIONS: translations,
+        _STR_IPA: pronunciations,
+    }
+
+    with open(shard_file, "w", encoding="UTF-8") as file:
+        json.dump(shard, file, ensure_ascii=False, separators=(",", ":"))
+
+    print(f"Translated {len(shard_words)} words for shard {shard_index} of {shard_count}")
+
+
+def _load_shard(shard_file):
+    try:
+        with open(shard_file, "r", encoding="UTF-8") as file:
+            shard = json.load(file)
+    except (OSError, ValueError) as err:
+        raise InvalidShardError(f"Unable to read shard `{shard_file}`: {err}") from err
+
+    if not isinstance(shard, dict) or shard.get(_STR_VERSION) != SHARD_VERSION:
+        raise InvalidShardError(f"`{shard_file}` is not a shard file of a supported version")
+
+    for field, field_type in _SHARD_FIELD_TYPES.items():
+        if not isinstance(shard.get(field), field_type):
+            raise InvalidShardError(
+                f"`{shard_file}` is malformed: `{field}` should be a {field_type.__name__}"
+            )
+
+    num_entries = len(shard[_STR_POSITIONS])
+    if any(
+        len(shard[field]) != num_entries for field in (_STR_WORDS, _STR_TRANSLATIONS, _STR_IPA)
+    ):
+        raise InvalidShardError(
+            f"`{shard_file}` is malformed: it has a different number of positions, words, "
+            + "translations and pronunciations"
+        )
+
+    if not 0 <= shard[_STR_SHARD_INDEX] < shard[_STR_SHARD_COUNT]:
+        raise InvalidShardError(
+            f"`{shard_file}` is malformed: shard {shard[_STR_SHARD_INDEX]} of "
+            + f"{shard[_STR_SHARD_COUNT]} doesn't exist"
+        )
+
+    return shard
+
+
+def merge_shards(shard_files, config, existing_dictionaries=None):
+    """Combine the shards of a word list and resolve conflicts.
+
+    Args:
+        shard_files: A list of files written by generate_shard(), one for each
+            shard, in any order.
+        config: The Config specifying how strokes should be generated. This
+            must be the config the shards were generated with.
+        existing_dictionaries: An optional ExistingDictionaries whose stroke
+            sequences are treated as taken. These must be the existing
+            dictionaries the shards were generated with.
+
+    Raises:
+        InvalidShardError: If a shard file can't be read, the shards were made
+            from different word lists, IPA files, configs, or existing
+            dictionaries, or any shard is missing or duplicated.
+
+    Returns:
+        A GeneratedDictionary, the same as core.generate_dictionary() returns.
+    """
+
+    shards = [_load_shard(shard_file) for shard_file in shard_files]
+    if len(shards) == 0:
+        raise InvalidShardError("No shards to merge")
+
+    first = shards[0]
+    shard_count = first[_STR_SHARD_COUNT]
+    config_fingerprint = fingerprint_config(config, existing_dictionaries)
+    seen_indices = set()
+
+    for shard_file, shard in zip(shard_files, shards):
+        if (
+            shard[_STR_WORD_LIST_FINGERPRINT] != first[_STR_WORD_LIST_FINGERPRINT]
+            or shard[_STR_SHARD_COUNT] != shard_count
+        ):
+            raise InvalidShardError(f"`{shard_file}` was made from a different word list")
+
+        if shard[_STR_IPA_FINGERPRINT] != first[_STR_IPA_FINGERPRINT]:
+            raise InvalidShardError(f"`{shard_file}` was made from different IPA files")
+
+        if shard[_STR_CONFIG_FINGERPRINT] != config_fingerprint:
+            raise InvalidShardError(
+                f"`{shard_file}` was generated with a different config or existing dictionaries"
+            )
+
+        if shard[_STR_SHARD_INDEX] in seen_indices:
+            raise InvalidShardError(f"Shard {shard[_STR_SHARD_INDEX]} was given more than once")
+
+        seen_indices.add(shard[_STR_SHARD_INDEX])
+
+    missing = sorted(set(range(shard_count)) - seen_indices)
+    if missing:
+        raise InvalidShardError(f"Missing shards {missing} of {shard_count}")
+
+    entries = []
+    for shard in shards:
+        entries += zip(shard[_STR_POSITIONS], shard[_STR_WORDS], shard[_STR_TRANSLATIONS])
+
+    # Conflicts must be resolved in word list order.
+    entries.sort(key=lambda entry: entry[0])
+
+    core.print_translation_summary(len(entries), first[_STR_NUM_WORDS_REQUESTED])
+
+    used_keys = None
+    if existing_dictionaries is not None:
+        used_keys = existing_dictionaries.get_used_keys()
+
+    disambiguator = postprocessing.create_disambiguator(config, used_keys)
+    words_and_translations = GeneratedDictionary()
+
+    for _, word, packed_translations in entries:
+        translations = [StrokeSequence.from_ints(ints) for ints in packed_translations]
+        postprocessing.postprocess_generated_dictionary(
+            [(word, translations)], config, disambiguator
+        )
+        words_and_translations.append(word, translations)
+
+    return words_and_translations
+
+
+def describe_shard_syllables(shard_files, config):
+    """Describe how each word in a set of shards was split into syllables.
+
+    This gives the same result as core.describe_syllables() for the merged
+    dictionary, without needing the IPA files the shards were made from.
+
+    Args:
+        shard_files: A list of files written by generate_shard().
+        config: The Config the shards were generated with.
+
+    Raises:
+        InvalidShardError: If a shard file can't be read.
+
+    Returns:
+        A dictionary from each translated word to a description of its
+        syllables; see core.describe_syllables().
+    """
+
+    word_to_syllables = {}
+
+    for shard_file in shard_files:
+        shard = _load_shard(shard_file)
+        for word, pronunciations in zip(shard[_STR_WORDS], shard[_STR_IPA]):
+            word_to_syllables[word] = core.describe_pronunciations(pronunciations, config)
+
+    return word_to_syllables
+
+
+def get_shard_word_list_file(shard_files):
+    """Return the word list file a set of shards was made from.
+
+    Every shard is made from the same word list, but it may have been given
+    with a different path on each machine, so the first shard's path is used.
+
+    Args:
+        shard_files: A non-empty list of files written by generate_shard().
+
+    Raises:
+        InvalidShardError: If the first shard file can't be read.
+
+    Returns:
+        The word list file, as it was given to generate_shard().
+    """
+
+    return _load_shard(shard_files[0])[_STR_WORD_LIST_FILE]
@@ -0,0 +1,255 @@
+"""Store steno dictionaries in an indexed SQLite database.
+
+Tools like conflict reviewers and practice apps often only need a few entries
+from a dictionary. Storing the dictionary in SQLite lets them query it with
+indexes instead of loading a whole JSON file.
+
+Each row of the `entries` table is one entry:
+    strokes: The stroke sequence as a string, e.g. "KAT/HRAOG".
+    packed_strokes: The strokes packed as little-endian 32-bit integers (see
+        StrokeSequence.to_ints()), or NULL if the strokes couldn't be parsed.
+    first_stroke: The first stroke as a string, e.g. "KAT".
+    stroke_count: The number of strokes in the sequence.
+    word: The translation.
+    source_file: The dictionary file the entry came from.
+    priority: The order the entry was added in; entries with a lower priority
+        take precedence over entries for the same strokes with a higher one.
+    overridden: 1 if another entry for the same strokes takes precedence over
+        this one, otherwise 0.
+    syllables: The syllables the entry was generated from, if known.
+"""
+
+import os
+import pathlib
+import sqlite3
+import struct
+
+import binary_dictionary
+from generated_dictionary import format_packed_strokes, iter_packed
+
+_SCHEMA = """
+CREATE TABLE entries (
+    id INTEGER PRIMARY KEY,
+    strokes TEXT NOT NULL,
+    packed_strokes BLOB,
+    first_stroke TEXT NOT NULL,
+    stroke_count INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    source_file TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    overridden INTEGER NOT NULL,
+    syllables TEXT
+);
+"""
+
+# Indexes are created after all rows are inserted, which is much faster than
+# updating them on every insert.
+_INDEXES = """
+CREATE INDEX entries_strokes ON entries (strokes);
+CREATE INDEX entries_first_stroke ON entries (first_stroke);
+CREATE INDEX entries_stroke_count ON entries (stroke_count);
+CREATE INDEX entries_word ON entries (word);
+CREATE INDEX entries_source_file ON entries (source_file, overridden);
+"""
+
+_INSERT = """
+INSERT INTO entries (
+    strokes,
+    packed_strokes,
+    first_stroke,
+    stroke_count,
+    word,
+    source_file,
+    priority,
+    overridden,
+    syllables
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_COLUMNS = "strokes, word, source_file, priority, overridden, syllables"
+
+SQLITE_EXTENSION = ".sqlite"
+
+
+class SqliteEntry:
+    """A dictionary entry to store in the database.
+
+    Attributes:
+        strokes: The stroke sequence string.
+        packed_strokes: A tuple of packed strokes (see
+            binary_dictionary.pack_stroke_sequence()), or None if the strokes
+            couldn't be parsed.
+        word: The translation.
+        source_file: The dictionary file the entry came from.
+        syllables: The syllables the entry was generated from, or None.
+    """
+
+    __slots__ = ["strokes", "packed_strokes", "word", "source_file", "syllables"]
+
+    def __init__(self, strokes, packed_strokes, word, source_file, syllables=None):
+        self.strokes = strokes
+        self.packed_strokes = packed_strokes
+        self.word = word
+        self.source_file = source_file
+        self.syllables = syllables
+
+
+def write_sqlite_dictionary(entries, output_file, first_entry_wins):
+    """Write dictionary entries to a new SQLite database.
+
+    Args:
+        entries: An iterable of SqliteEntry, in priority order.
+        output_file: The database filename. Any existing file is replaced.
+        first_entry_wins: True if the first entry for a stroke sequence takes
+            precedence over later ones, as when combining dictionaries. False
+            if the last entry does, as when a JSON file with duplicate keys is
+            loaded.
+
+    Returns:
+        The number of rows written.
+    """
+
+    if os.path.exists(output_file):
+        os.remove(output_file)
+
+    # The overridden flag depends on every entry for the same strokes, so work
+    # it out before inserting anything.
+    entries = list(entries)
+    winning_priority = {}
+    for priority, entry in enumerate(entries):
+        if first_entry_wins:
+            winning_priority.setdefault(entry.strokes, priority)
+        else:
+            winning_priority[entry.strokes] = priority
+
+    rows = (
+        (
+            entry.strokes,
+            _pack(entry.packed_strokes),
+            entry.strokes.split("/", 1)[0],
+            entry.strokes.count("/") + 1,
+            entry.word,
+            entry.source_file,
+            priority,
+            int(winning_priority[entry.strokes] != priority),
+            entry.syllables,
+        )
+        for priority, entry in enumerate(entries)
+    )
+
+    connection = sqlite3.connect(output_file)
+    try:
+        # Nothing else is using the new database, so skip journaling and
+        # syncing while writing it.
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        with connection:
+            connection.execute(_SCHEMA)
+            connection.executemany(_INSERT, rows)
+            connection.executescript(_INDEXES)
+    finally:
+        connection.close()
+
+    return len(entries)
+
+
+def write_generated_dictionary(
+    words_and_translations, output_file, source_file, word_to_syllables=None
+):
+    """Write a generated dictionary to a new SQLite database.
+
+    Args:
+        words_and_translations: The returned value from
+            core.generate_dictionary().
+        output_file: The database filename. Any existing file is replaced.
+        source_file: The word list the dictionary was generated from, stored
+            as the source file of every entry.
+        word_to_syllables: An optional dictionary mapping each word to a string
+            describing its syllables, as returned by core.describe_syllables().
+
+    Returns:
+        The number of rows written.
+    """
+
+    word_to_syllables = word_to_syllables or {}
+
+    return write_sqlite_dictionary(
+        (
+            SqliteEntry(
+                format_packed_strokes(packed_strokes),
+                binary_dictionary.get_lookup_key(packed_strokes),
+                word,
+                source_file,
+                word_to_syllables.get(word),
+            )
+            for word, packed_translations in iter_packed(words_and_translations)
+            for packed_strokes in packed_translations
+        ),
+        output_file,
+        first_entry_wins=False,
+    )
+
+
+def _pack(packed_strokes):
+    if packed_strokes is None:
+        return None
+
+    return struct.pack(f"<{len(packed_strokes)}I", *packed_strokes)
+
+
+class SqliteDictionary:
+    """Query a dictionary database written by this module.
+
+    Each query returns a list of dictionaries with the keys `strokes`, `word`,
+    `source_file`, `priority`, `overridden`, and `syllables`.
+
+    This can be used as a context manager, which closes the database on exit.
+    """
+
+    def __init__(self, filename):
+        uri = pathlib.Path(filename).resolve().as_uri() + "?mode=ro"
+        self._connection = sqlite3.connect(uri, uri=True)
+        self._connection.row_factory = sqlite3.Row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the database."""
+
+        self._connection.close()
+
+    def lookup(self, strokes):
+        """Return the entry that takes precedence for a stroke string, or None."""
+
+        rows = self._query("strokes = ? AND overridden = 0", (strokes,))
+        return rows[0] if rows else None
+
+    def entries_for_word(self, word):
+        """Return every entry that translates to `word`."""
+
+        return self._query("word = ?", (word,))
+
+    def entries_with_first_stroke(self, stroke):
+        """Return every entry whose first stroke is the stroke string given."""
+
+        return self._query("first_stroke = ?", (stroke,))
+
+    def entries_with_stroke_count(self, stroke_count):
+        """Return every entry with the given number of strokes."""
+
+        return self._query("stroke_count = ?", (stroke_count,))
+
+    def overridden_entries(self, source_file):
+        """Return the entries from `source_file` that another entry overrides."""
+
+        return self._query("source_file = ? AND overridden = 1", (source_file,))
+
+    def _query(self, condition, parameters):
+        cursor = self._connection.execute(
+            f"SELECT {_COLUMNS} FROM entries WHERE {condition} ORDER BY priority", parameters
+        )
+        return [dict(row) for row in cursor]
@@ -48,6 +48,33 @@ class Key(Enum):
         self.letter = letter
 
 
+# Map a packed stroke (see Stroke.to_int()) to the stroke's string and sort key.
+# Many strokes share the same keys, so this avoids rebuilding them.
+_STROKE_STRINGS = {}
+_STROKE_SORT_KEYS = {}
+
+# Map a tuple of a Stroke's active keys bitmap to the Stroke's packed integer.
+_STROKE_INTS = {}
+
+# Map a packed stroke (see Stroke.to_int()) to a Stroke to copy for it.
+_PACKED_STROKES = {}
+
+# The most strokes to keep in each cache above. A dictionary only uses a small
+# fraction of the 2^23 possible strokes, but a long-running process given
+# arbitrary strokes could otherwise fill the caches without limit. A full cache
+# is emptied and filled again.
+_MAX_CACHED_STROKES = 1 << 16
+
+
+def _add_to_cache(cache, key, value):
+    """Store a value in one of the stroke caches, emptying it first if it's full."""
+
+    if len(cache) >= _MAX_CACHED_STROKES:
+        cache.clear()
+
+    cache[key] = value
+
+
 class Stroke:
     """A single steno stroke."""
 
@@ -100,7 +127,63 @@ class Stroke:
     def __hash__(self):
         return hash(tuple(self._active_keys_bitmap))
 
+    def sort_key(self):
+        """Return a value that orders strokes the same way as `<` does.
+
+        Sorting with this key is much faster than comparing Strokes directly.
+        """
+
+        packed = self.to_int()
+        result = _STROKE_SORT_KEYS.get(packed)
+
+        if result is None:
+            result = Stroke.sort_key_from_int(packed)
+
+        return result
+
+    @staticmethod
+    def sort_key_from_int(packed):
+        """Return the same value as Stroke.from_int(packed).sort_key().
+
+        This doesn't create a Stroke, so it's faster for packed strokes.
+        """
+
+        result = _STROKE_SORT_KEYS.get(packed)
+
+        if result is None:
+            keys_sans_star = tuple(
+                i for i in range(len(Key)) if packed >> i & 1 and i != Key.STAR.index
+            )
+            result = (keys_sans_star, bool(packed >> Key.STAR.index & 1))
+            _add_to_cache(_STROKE_SORT_KEYS, packed, result)
+
+        return result
+
     def __str__(self):
+        packed = self.to_int()
+        result = _STROKE_STRINGS.get(packed)
+
+        if result is None:
+            result = self._build_string()
+            _add_to_cache(_STROKE_STRINGS, packed, result)
+
+        return result
+
+    @staticmethod
+    def string_from_int(packed):
+        """Return the same string as str(Stroke.from_int(packed)).
+
+        This doesn't create a Stroke if the string is cached.
+        """
+
+        result = _STROKE_STRINGS.get(packed)
+
+        if result is None:
+            result = str(Stroke.from_int(packed))
+
+        return result
+
+    def _build_string(self):
         result = ""
         has_vowel_or_star = False
 
@@ -201,6 +284,60 @@ class Stroke:
 
         return stroke
 
+    def to_int(self):
+        """Pack this stroke into an integer.
+
+        Returns:
+            An integer where bit `key.index` is set if and only if `key` is
+            active in this stroke. Since there are 23 keys, the result always
+            fits in 23 bits.
+        """
+
+        active_keys = tuple(self._active_keys_bitmap)
+        packed = _STROKE_INTS.get(active_keys)
+
+        if packed is None:
+            packed = 0
+            for i, is_active in enumerate(active_keys):
+                if is_active:
+                    packed |= 1 << i
+
+            _add_to_cache(_STROKE_INTS, active_keys, packed)
+
+        return packed
+
+    @staticmethod
+    def from_int(packed):
+        """Create a stroke from its packed integer representation.
+
+        Args:
+            packed: An integer as returned by to_int().
+
+        Returns:
+            The stroke with the keys set in `packed` active.
+        """
+
+        stroke = _PACKED_STROKES.get(packed)
+
+        if stroke is None:
+            stroke = Stroke()
+            stroke.add_keys_ignore_steno_order([key for key in Key if packed >> key.index & 1])
+            _add_to_cache(_PACKED_STROKES, packed, stroke)
+
+        return stroke.copy()
+
+    def copy(self):
+        """Return a copy of this stroke that can be changed independently.
+
+        This gives the same result as copy.deepcopy() but is much faster.
+        """
+
+        stroke = Stroke.__new__(Stroke)
+        stroke._active_keys_bitmap = self._active_keys_bitmap.copy()
+        stroke._last_active_pos = self._last_active_pos
+
+        return stroke
+
     def add_keys_maintain_steno_order(self, keys):
         """Add keys to this stroke while ensuring steno order is maintained.
 
@@ -294,7 +431,7 @@ class Stroke:
     def is_empty(self):
         """Return True if no keys are active."""
 
-        return not self.get_keys()
+        return not any(self._active_keys_bitmap)
 
     def has_left_consonant(self):
         """Return True if the stroke has a left consonant key active."""
@@ -377,10 +514,48 @@ class StrokeSequence:
 
         return False
 
+    def sort_key(self):
+        """Return a value that orders sequences the same way as `<` does."""
+
+        return (len(self._strokes), tuple(stroke.sort_key() for stroke in self._strokes))
+
     def __str__(self):
         stroke_strings = [str(stroke) for stroke in self._strokes if not stroke.is_empty()]
         return "/".join(stroke_strings)
 
+    @staticmethod
+    def from_string(sequence_str):
+        """Create a StrokeSequence from its string representation.
+
+        Args:
+            sequence_str: Strokes separated by slashes, e.g. "KAT/HRAOG".
+
+        Raises:
+            MissingDashInStrokeError: If a stroke is missing a dash; see
+                Stroke.from_string().
+            OutOfStenoOrderError: If a stroke is out of steno order.
+
+        Returns:
+            The StrokeSequence corresponding to the input string.
+        """
+
+        return StrokeSequence([Stroke.from_string(part) for part in sequence_str.split("/")])
+
+    def to_ints(self):
+        """Return a list of the packed integer form of each stroke."""
+
+        return [stroke.to_int() for stroke in self._strokes]
+
+    @staticmethod
+    def from_ints(packed_strokes):
+        """Create a StrokeSequence from a list of packed integer strokes.
+
+        Args:
+            packed_strokes: A list of integers as returned by to_ints().
+        """
+
+        return StrokeSequence([Stroke.from_int(packed) for packed in packed_strokes])
+
     def get_strokes(self):
         """Return the list of strokes comprising this sequence."""
 
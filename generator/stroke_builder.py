@@ -1,6 +1,5 @@
 """Convert IPA syllables into steno strokes."""
 
-import copy
 import itertools
 import logging
 import more_itertools
@@ -8,12 +7,58 @@ import more_itertools
 import postprocessing
 import steno
 
+# The most entries a StrokeCache keeps in each of its caches by default.
+_MAX_CACHED_ENTRIES = 1 << 16
 
-def syllables_to_steno(syllables, config):
+
+def map_syllable_to_key_clusters(syllable, config):
+    """Find the possible steno keys for each phoneme cluster of a syllable.
+
+    Args:
+        syllable: A Syllable (see syllable.py).
+        config: The Config specifying how to map phonemes to keys.
+
+    Returns:
+        A list with a list of the possible key clusters for each phoneme
+        cluster of the syllable, in order, or None if some phoneme has no
+        mapping in the config.
+    """
+
+    if syllable.get_atom_ids() is not None:
+        return syllable.map_atom_ids(
+            config.get_atom_ids_to_possible_key_clusters(), config.get_max_atom_cluster_length()
+        )
+
+    return syllable.map_atoms(config.get_phoneme_tuples_to_possible_key_clusters())
+
+
+def has_valid_stroke(possible_keys_for_each_phoneme_cluster):
+    """Return True if some choice of keys for a syllable is in steno order.
+
+    Args:
+        possible_keys_for_each_phoneme_cluster: The value returned by
+            map_syllable_to_key_clusters().
+    """
+
+    for keys in itertools.product(*possible_keys_for_each_phoneme_cluster):
+        try:
+            steno.Stroke(list(more_itertools.flatten(keys)))
+        except steno.OutOfStenoOrderError:
+            continue
+
+        return True
+
+    return False
+
+
+def syllables_to_steno(syllables, config, stroke_cache=None):
     """Create a list of possible steno strokes to form the given syllables.
 
     Args:
         syllables: A list of Syllables (see syllable.py)
+        config: The Config specifying how strokes should be generated.
+        stroke_cache: An optional StrokeCache to reuse the strokes built for
+            earlier words from. The result is the same either way.
 
     Returns:
         A list of StrokeSequences. Each stroke sequence is a way to steno the
@@ -21,40 +66,18 @@ def syllables_to_steno(syllables, config):
         postprocessing, and phoneme to steno key conversion.
     """
 
-    log = logging.getLogger("dictionary_generator")
-    translations = []  # List of all ways to stroke the syllable sequence.
-    phoneme_tuples_to_possible_key_clusters = config.get_phoneme_tuples_to_possible_key_clusters()
-
-    possible_strokes_for_each_syllable = []
+    if stroke_cache is not None:
+        possible_strokes = stroke_cache.get_possible_strokes(syllables, config)
+    else:
+        possible_strokes = _get_possible_strokes(syllables, config)
 
-    for syllable in syllables:
-        possible_keys_for_each_phoneme_cluster = syllable.map_atoms(
-            phoneme_tuples_to_possible_key_clusters
-        )
-
-        possible_keys_for_syllable = itertools.product(*possible_keys_for_each_phoneme_cluster)
-        possible_keys_for_syllable = [
-            list(more_itertools.flatten(tpl)) for tpl in possible_keys_for_syllable
-        ]
-
-        possible_strokes_for_syllable = []
-        for keys in possible_keys_for_syllable:
-            try:
-                stroke = steno.Stroke(keys)
-            except steno.OutOfStenoOrderError:
-                log.debug("Out of steno order `%s`", keys)
-            else:
-                possible_strokes_for_syllable.append(stroke)
-
-        if len(possible_strokes_for_syllable) == 0:
-            log.info("No valid way to stroke the syllable `%s`", syllable)
-            return None
+    if possible_strokes is None:
+        return None
 
-        possible_strokes_for_each_syllable.append(possible_strokes_for_syllable)
-
-    possible_strokes = itertools.product(*possible_strokes_for_each_syllable)
+    # Postprocessing changes strokes in place, so each sequence gets its own
+    # copies.
     translations = [
-        steno.StrokeSequence(copy.deepcopy(list(strokes_tuple)))
+        steno.StrokeSequence([stroke.copy() for stroke in strokes_tuple])
         for strokes_tuple in possible_strokes
     ]
 
@@ -72,3 +95,130 @@ def syllables_to_steno(syllables, config):
     translations = new_translations
 
     return translations
+
+
+class StrokeCache:
+    """Remember the possible strokes built for syllables and runs of them.
+
+    Words often share their first syllables with other words, like the forms
+    of a stem (walk, walks, walked, walking), and every word shares most of its
+    syllables with some other word. With a cache, the possible strokes for each
+    distinct syllable are only built once, and the product of the possible
+    strokes for a word's first syllables is only built once for every word that
+    starts with them. Only the syllables after the longest cached prefix are
+    built and multiplied out.
+
+    Syllables are identified by their atom ids, since the strokes built for a
+    syllable depend only on its phonemes and their regions. Syllables that
+    can't be translated aren't cached, so they're logged every time.
+    """
+
+    def __init__(self, max_entries=_MAX_CACHED_ENTRIES):
+        """Create an empty cache.
+
+        Args:
+            max_entries: The most syllables, and separately the most runs of
+                syllables, to remember. The cache is emptied when it's full.
+        """
+
+        self._max_entries = max_entries
+        self._syllable_strokes = {}
+        self._prefix_products = {}
+
+    def get_possible_strokes(self, syllables, config):
+        """Find every combination of a possible stroke for each syllable.
+
+        Args:
+            syllables: A list of Syllables (see syllable.py).
+            config: The Config specifying how strokes should be generated. The
+                same Config must be used with a cache every time.
+
+        Returns:
+            A list of tuples with a Stroke for each syllable, in the same order
+            as itertools.product() gives them, or None if some syllable can't
+            be stroked. The Strokes are shared, so they must not be changed.
+        """
+
+        keys = tuple(syllable.get_atom_ids() for syllable in syllables)
+        if None in keys:
+            return _get_possible_strokes(syllables, config)
+
+        product = self._prefix_products.get(keys)
+        if product is not None:
+            return product
+
+        # Start from the longest prefix that's cached.
+        length = len(keys) - 1
+        while length > 0 and keys[:length] not in self._prefix_products:
+            length -= 1
+
+        product = self._prefix_products[keys[:length]] if length > 0 else [()]
+
+        for i in range(length, len(keys)):
+            possible_strokes_for_syllable = self._syllable_strokes.get(keys[i])
+
+            if possible_strokes_for_syllable is None:
+                possible_strokes_for_syllable = _get_possible_strokes_for_syllable(
+                    syllables[i], config
+                )
+                if possible_strokes_for_syllable is None:
+                    return None
+
+                self._add(self._syllable_strokes, keys[i], possible_strokes_for_syllable)
+
+            product = [
+                strokes + (stroke,)
+                for strokes in product
+                for stroke in possible_strokes_for_syllable
+            ]
+            self._add(self._prefix_products, keys[: i + 1], product)
+
+        return product
+
+    def _add(self, cache, key, value):
+        if len(cache) >= self._max_entries:
+            cache.clear()
+
+        cache[key] = value
+
+
+def _get_possible_strokes(syllables, config):
+    possible_strokes_for_each_syllable = []
+
+    for syllable in syllables:
+        possible_strokes_for_syllable = _get_possible_strokes_for_syllable(syllable, config)
+        if possible_strokes_for_syllable is None:
+            return None
+
+        possible_strokes_for_each_syllable.append(possible_strokes_for_syllable)
+
+    return itertools.product(*possible_strokes_for_each_syllable)
+
+
+def _get_possible_strokes_for_syllable(syllable, config):
+    log = logging.getLogger("dictionary_generator")
+
+    possible_keys_for_each_phoneme_cluster = map_syllable_to_key_clusters(syllable, config)
+    if possible_keys_for_each_phoneme_cluster is None:
+        log.info("No keys for a phoneme in the syllable `%s`", syllable)
+        return None
+
+    possible_keys_for_syllable = itertools.product(*possible_keys_for_each_phoneme_cluster)
+    possible_keys_for_syllable = [
+        list(more_itertools.flatten(tpl)) for tpl in possible_keys_for_syllable
+    ]
+
+    possible_strokes_for_syllable = []
+    for keys in possible_keys_for_syllable:
+        try:
+            stroke = steno.Stroke(keys)
+        except steno.OutOfStenoOrderError:
+            log.debug("Out of steno order `%s`", keys)
+        else:
+            possible_strokes_for_syllable.append(stroke)
+
+    if len(possible_strokes_for_syllable) == 0:
+        log.info("No valid way to stroke the syllable `%s`", syllable)
+        return None
+
+    return possible_strokes_for_syllable
@@ -0,0 +1,332 @@
+"""Translate a stream of strokes the way Plover does.
+
+Entries are stored in a trie keyed by packed strokes (see Stroke.to_int()), so
+each stroke only has to follow one edge of the trie. Strokes are translated
+greedily: a stroke is added to the pending strokes as long as some entry starts
+with them, and once no entry does, the longest pending sequence with a
+translation is output and the remaining strokes are translated again.
+
+Usage:
+    python stroke_translator.py <stroke_log> <dictionary>... [--benchmark]
+
+The stroke log is a text file of strokes separated by whitespace or slashes,
+e.g. "KAT/HRAOG TKOG". Dictionaries can be JSON or binary (see
+binary_dictionary.py), with the first dictionary given having the highest
+priority.
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+import binary_dictionary
+from generated_dictionary import iter_packed
+import steno
+
+# The key in a trie node that holds the node's translation. Every other key is
+# a packed stroke.
+_TRANSLATION = None
+
+
+class StrokeTrie:
+    """A trie mapping stroke sequences to translations."""
+
+    def __init__(self):
+        self.root = {}
+        self._num_entries = 0
+
+    def __len__(self):
+        return self._num_entries
+
+    def add(self, key, translation):
+        """Add an entry, replacing any existing translation for the strokes.
+
+        Args:
+            key: A tuple of packed strokes (see
+                binary_dictionary.pack_stroke_sequence()).
+            translation: The translation string.
+        """
+
+        node = self.root
+        for packed in key:
+            node = node.setdefault(packed, {})
+
+        if _TRANSLATION not in node:
+            self._num_entries += 1
+
+        node[_TRANSLATION] = translation
+
+    def lookup(self, key):
+        """Return the translation for a tuple of packed strokes, or None."""
+
+        node = self.root
+        for packed in key:
+            node = node.get(packed)
+            if node is None:
+                return None
+
+        return node.get(_TRANSLATION)
+
+
+def create_trie_from_generated_dictionary(words_and_translations):
+    """Build a StrokeTrie from the returned value of core.generate_dictionary().
+
+    If a stroke sequence appears more than once, the last translation is kept,
+    matching how the JSON output would be loaded.
+    """
+
+    trie = StrokeTrie()
+    for word, packed_translations in iter_packed(words_and_translations):
+        for packed_strokes in packed_translations:
+            trie.add(binary_dictionary.get_lookup_key(packed_strokes), word)
+
+    return trie
+
+
+def load_dictionaries(filenames):
+    """Build a StrokeTrie from dictionary files.
+
+    Args:
+        filenames: JSON or binary dictionary files, from highest to lowest
+            priority. See binary_dictionary.read_packed_entries().
+
+    Returns:
+        A StrokeTrie.
+    """
+
+    trie = StrokeTrie()
+    for key, translation in binary_dictionary.read_packed_entries(filenames).items():
+        trie.add(key, translation)
+
+    return trie
+
+
+class StrokeTranslator:
+    """Translate strokes one at a time with greedy longest matching.
+
+    Translations are only output once they can't be extended by later strokes,
+    so call flush() at the end of the stream to get the rest.
+    """
+
+    def __init__(self, trie):
+        self._root = trie.root
+        self._pending = []
+        self._node = self._root
+
+    def add_stroke(self, packed):
+        """Translate the next stroke.
+
+        Args:
+            packed: The packed stroke (see Stroke.to_int()).
+
+        Returns:
+            A list of the translations that are now final, each a tuple of the
+            packed strokes used and the translation. The translation is None
+            for a stroke with no entry.
+        """
+
+        child = self._node.get(packed)
+        if child is not None:
+            self._pending.append(packed)
+            self._node = child
+            return []
+
+        if not self._pending:
+            # Nothing starts with this stroke, so it's untranslated.
+            return [((packed,), None)]
+
+        output = []
+        # Strokes after the match start a new translation along with the new
+        # stroke.
+        for stroke in self._take_longest_match(output) + [packed]:
+            output += self.add_stroke(stroke)
+
+        return output
+
+    def flush(self):
+        """Return the translations of every pending stroke.
+
+        Returns:
+            A list of translations, in the same form as add_stroke().
+        """
+
+        output = []
+        while self._pending:
+            for stroke in self._take_longest_match(output):
+                output += self.add_stroke(stroke)
+
+        return output
+
+    def _take_longest_match(self, output):
+        """Output the longest pending sequence with a translation.
+
+        If no pending sequence has a translation, the first stroke is output as
+        untranslated. The pending strokes are cleared.
+
+        Returns:
+            A list of the pending strokes after the ones that were output.
+        """
+
+        node = self._root
+        match_length = 1
+        match_translation = None
+        for i, packed in enumerate(self._pending):
+            node = node[packed]
+            if _TRANSLATION in node:
+                match_length = i + 1
+                match_translation = node[_TRANSLATION]
+
+        output.append((tuple(self._pending[:match_length]), match_translation))
+        remaining = self._pending[match_length:]
+
+        self._pending = []
+        self._node = self._root
+
+        return remaining
+
+
+def translate_strokes(trie, strokes):
+    """Translate a whole stream of strokes.
+
+    Args:
+        trie: A StrokeTrie.
+        strokes: An iterable of packed strokes.
+
+    Returns:
+        A list of translations, in the same form as StrokeTranslator.add_stroke().
+    """
+
+    translator = StrokeTranslator(trie)
+    output = []
+    for packed in strokes:
+        output += translator.add_stroke(packed)
+
+    return output + translator.flush()
+
+
+def read_stroke_log(stroke_log_file):
+    """Read a stroke log.
+
+    Args:
+        stroke_log_file: A file of strokes separated by whitespace or slashes.
+
+    Raises:
+        MissingDashInStrokeError: If a stroke is missing a dash. The error's
+            argument is the stroke.
+        OutOfStenoOrderError: If a stroke is out of steno order. The error's
+            argument is the stroke.
+
+    Returns:
+        A list of packed strokes.
+    """
+
+    with open(stroke_log_file, "r", encoding="UTF-8") as file:
+        contents = file.read()
+
+    strokes = []
+    for stroke_str in contents.replace("/", " ").split():
+        try:
+            strokes.append(steno.Stroke.from_string(stroke_str).to_int())
+        except (steno.MissingDashInStrokeError, steno.OutOfStenoOrderError) as err:
+            raise type(err)(stroke_str) from err
+
+    return strokes
+
+
+def format_translation(key, translation):
+    """Return a translation as text, using the strokes if it's untranslated."""
+
+    if translation is not None:
+        return translation
+
+    return "/".join(str(steno.Stroke.from_int(packed)) for packed in key)
+
+
+def benchmark(trie, strokes, repeat):
+    """Measure how fast a stroke log is translated.
+
+    Args:
+        trie: A StrokeTrie.
+        strokes: A list of packed strokes.
+        repeat: How many times to translate the log. The fastest run is used.
+
+    Raises:
+        ValueError: If `repeat` is less than 1.
+
+    Returns:
+        The number of strokes translated per second.
+    """
+
+    if repeat < 1:
+        raise ValueError(f"The log must be translated at least once, not {repeat} times")
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        translate_strokes(trie, strokes)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return len(strokes) / best if best > 0 else float("inf")
+
+
+def main():
+    """Translate or benchmark a stroke log using command-line arguments."""
+
+    parser = argparse.ArgumentParser(description="Translate a log of strokes.")
+    parser.add_argument("stroke_log", help="a file of strokes separated by whitespace or slashes")
+    parser.add_argument(
+        "dictionaries", nargs="+", help="JSON or binary dictionaries, highest priority first"
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="report how many strokes are translated per second instead of the translation",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="how many times to replay the log when benchmarking"
+    )
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    logging.basicConfig(format="%(levelname)s: %(message)s")
+    log = logging.getLogger("dictionary_generator")
+
+    try:
+        strokes = read_stroke_log(args.stroke_log)
+    except steno.MissingDashInStrokeError as err:
+        log.critical("Unable to parse `%s` in `%s`; it's missing a dash", err, args.stroke_log)
+        sys.exit(1)
+    except steno.OutOfStenoOrderError as err:
+        log.critical("Unable to parse `%s` in `%s`; it's out of steno order", err, args.stroke_log)
+        sys.exit(1)
+
+    if args.benchmark and len(strokes) == 0:
+        parser.error(f"`{args.stroke_log}` has no strokes to benchmark")
+
+    start = time.perf_counter()
+    trie = load_dictionaries(args.dictionaries)
+    load_seconds = time.perf_counter() - start
+
+    if args.benchmark:
+        strokes_per_second = benchmark(trie, strokes, args.repeat)
+        print(f"Loaded {len(trie)} entries in {load_seconds:.2f} s")
+        print(
+            f"Translated {len(strokes)} strokes at {strokes_per_second:,.0f} strokes/s "
+            + f"({1e6 / strokes_per_second:.2f} µs per stroke)"
+        )
+        return
+
+    print(
+        " ".join(
+            format_translation(key, translation)
+            for key, translation in translate_strokes(trie, strokes)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""Compare how well several configs translate the same word list.
+
+This is much faster than a separate run for each config. The IPA file and the
+word list are only loaded once, and each word's pronunciations are only split
+into syllables once for all configs with the same vowels, consonants and
+phonology rules (see Config.get_syllabification_fingerprint()), so only
+mapping syllables to strokes and resolving conflicts is done for every config.
+The configs are evaluated in parallel.
+
+For each config, the comparison table shows how many words could be
+translated, how many stroke sequences conflict with another word's before
+conflicts are resolved (see conflicts.py), how many disambiguator strokes are
+appended to resolve them, and the average number of strokes in each translated
+word's shortest stroke sequence once they're resolved.
+
+Usage:
+    python sweep.py <ipa_file> <word_list_file> <config_file> [<config_file> ...]
+"""
+
+import argparse
+import concurrent.futures
+import json
+import logging
+import os
+import sys
+
+from config import Config, InvalidConfigError
+import conflicts
+import core
+import ipa_utils
+import postprocessing
+import stroke_builder
+
+_STR_CONFIG_FILE = "config_file"
+_STR_NUM_WORDS = "num_words"
+_STR_NUM_TRANSLATED = "num_translated"
+_STR_NUM_TRANSLATIONS = "num_translations"
+_STR_NUM_CONFLICTING_TRANSLATIONS = "num_conflicting_translations"
+_STR_NUM_CONFLICT_GROUPS = "num_conflict_groups"
+_STR_NUM_DISAMBIGUATOR_STROKES = "num_disambiguator_strokes"
+_STR_AVERAGE_STROKES_PER_WORD = "average_strokes_per_word"
+
+# The word list and its syllables used by a worker process, set by
+# _init_worker().
+_WORKER_STATE = {}
+
+
+class SweepResult:
+    """How well one config translated the word list.
+
+    Attributes:
+        config_file: The config file.
+        num_words: The number of words in the word list.
+        num_translated: The number of words that could be translated.
+        num_translations: The number of stroke sequences for all words.
+        num_conflicting_translations: The number of stroke sequences that
+            another word was also translated to, before conflicts were
+            resolved.
+        num_conflict_groups: The number of stroke sequences that more than one
+            word was translated to.
+        num_disambiguator_strokes: The number of disambiguator strokes appended
+            to resolve conflicts.
+        num_strokes: The total number of strokes in the shortest stroke
+            sequence of each translated word, after conflicts were resolved.
+    """
+
+    def __init__(self, config_file, num_words):
+        self.config_file = config_file
+        self.num_words = num_words
+        self.num_translated = 0
+        self.num_translations = 0
+        self.num_conflicting_translations = 0
+        self.num_conflict_groups = 0
+        self.num_disambiguator_strokes = 0
+        self.num_strokes = 0
+
+    def get_average_strokes_per_word(self):
+        """Return the average number of strokes for each translated word."""
+
+        return self.num_strokes / self.num_translated if self.num_translated else 0
+
+    def to_json(self):
+        """Return the result as a dictionary that can be written as JSON."""
+
+        return {
+            _STR_CONFIG_FILE: self.config_file,
+            _STR_NUM_WORDS: self.num_words,
+            _STR_NUM_TRANSLATED: self.num_translated,
+            _STR_NUM_TRANSLATIONS: self.num_translations,
+            _STR_NUM_CONFLICTING_TRANSLATIONS: self.num_conflicting_translations,
+            _STR_NUM_CONFLICT_GROUPS: self.num_conflict_groups,
+            _STR_NUM_DISAMBIGUATOR_STROKES: self.num_disambiguator_strokes,
+            _STR_AVERAGE_STROKES_PER_WORD: self.get_average_strokes_per_word(),
+        }
+
+
+def split_words(words, word_to_ipa, config):
+    """Split the pronunciations of each word into syllables.
+
+    Args:
+        words: The list of words.
+        word_to_ipa: A dictionary mapping lowercased words to a list of their
+            IPA pronunciations, as returned by
+            ipa_utils.create_ipa_lookup_dictionary(). It isn't changed.
+        config: The Config specifying how to normalize and split
+            pronunciations.
+
+    Returns:
+        A list with an item for each word: None if it has no IPA entry, or
+        otherwise the list of Syllables for each of its pronunciations, as
+        expected by core.translate_syllables().
+    """
+
+    normalizer = ipa_utils.IpaNormalizer.from_config(config)
+    syllables_by_word = {}
+    syllables_for_each_word = []
+
+    for word in words:
+        word_lower = word.lower()
+        if word_lower not in syllables_by_word:
+            pronunciations = word_to_ipa.get(word_lower)
+            if pronunciations is not None:
+                pronunciations = [
+                    ipa_utils.split_ipa_into_syllables(ipa, config)
+                    for ipa in normalizer.normalize_pronunciations(pronunciations)
+                ]
+
+            syllables_by_word[word_lower] = pronunciations
+
+        syllables_for_each_word.append(syllables_by_word[word_lower])
+
+    return syllables_for_each_word
+
+
+def evaluate_config(config_file, config, words, syllables_for_each_word):
+    """Translate a word list with a config and measure the result.
+
+    Args:
+        config_file: The config file, to label the result with.
+        config: The Config loaded from `config_file`.
+        words: The list of words to translate.
+        syllables_for_each_word: The value returned by split_words() for
+            `words` and a Config with the same syllabification fingerprint as
+            `config`.
+
+    Returns:
+        A SweepResult.
+    """
+
+    result = SweepResult(config_file, len(words))
+    stroke_cache = stroke_builder.StrokeCache()
+    words_and_translations = []
+
+    for word, syllables_for_each_pronunciation in zip(words, syllables_for_each_word):
+        if syllables_for_each_pronunciation is None:
+            continue
+
+        translations = core.translate_syllables(
+            word, syllables_for_each_pronunciation, config, stroke_cache
+        )
+        if len(translations) > 0:
+            words_and_translations.append((word, translations))
+
+    # Conflicts have to be analyzed before they're resolved.
+    report = conflicts.analyze_conflicts(words_and_translations, config)
+    postprocessing.postprocess_generated_dictionary(words_and_translations, config)
+
+    result.num_translated = report.num_words
+    result.num_translations = report.num_translations
+    result.num_conflicting_translations = report.get_num_conflicting_translations()
+    result.num_conflict_groups = len(report.conflict_groups)
+    result.num_disambiguator_strokes = report.get_num_disambiguator_strokes()
+    result.num_strokes = sum(
+        min(len(translation.get_strokes()) for translation in translations)
+        for _, translations in words_and_translations
+    )
+
+    return result
+
+
+def sweep(ipa_file, word_list_file, config_files, num_processes=None):
+    """Evaluate several configs on the same word list.
+
+    Args:
+        ipa_file: A CSV file that gives the pronunciation in IPA for a word, or
+            a list of them. See core.generate_dictionary() for the expected
+            format.
+        word_list_file: A file of words to translate, with one word per line.
+        config_files: The list of config files to compare.
+        num_processes: The most processes to evaluate the configs with, or
+            None to use one for each CPU.
+
+    Raises:
+        InvalidConfigError: If a config file is invalid.
+
+    Returns:
+        A list with the SweepResult for each config file, in the same order.
+    """
+
+    log = logging.getLogger("dictionary_generator")
+    configs = [Config(config_file) for config_file in config_files]
+    words = core.read_word_list(word_list_file)
+    word_to_ipa = ipa_utils.create_ipa_lookup_dictionary(ipa_file, words)
+
+    # Configs that split pronunciations the same way share their syllables.
+    fingerprints = [config.get_syllabification_fingerprint() for config in configs]
+    syllables_by_fingerprint = {}
+    for config, fingerprint in zip(configs, fingerprints):
+        if fingerprint not in syllables_by_fingerprint:
+            syllables_by_fingerprint[fingerprint] = split_words(words, word_to_ipa, config)
+
+    log.info(
+        "Split the word list into syllables %d times for %d configs",
+        len(syllables_by_fingerprint),
+        len(configs),
+    )
+
+    num_processes = min(num_processes or os.cpu_count() or 1, len(configs))
+    if num_processes <= 1:
+        return [
+            evaluate_config(config_file, config, words, syllables_by_fingerprint[fingerprint])
+            for config_file, config, fingerprint in zip(config_files, configs, fingerprints)
+        ]
+
+    with concurrent.futures.ProcessPoolExecutor(
+        num_processes, initializer=_init_worker, initargs=(words, syllables_by_fingerprint)
+    ) as executor:
+        return list(executor.map(_evaluate_in_worker, config_files, configs, fingerprints))
+
+
+def _init_worker(words, syllables_by_fingerprint):
+    _WORKER_STATE["words"] = words
+    _WORKER_STATE["syllables_by_fingerprint"] = syllables_by_fingerprint
+
+
+def _evaluate_in_worker(config_file, config, fingerprint):
+    return evaluate_config(
+        config_file,
+        config,
+        _WORKER_STATE["words"],
+        _WORKER_STATE["syllables_by_fingerprint"][fingerprint],
+    )
+
+
+def print_comparison_table(results):
+    """Print a table comparing a list of SweepResults."""
+
+    header = [
+        "Config",
+        "Translated",
+        "Coverage",
+        "Conflicting",
+        "Conflict groups",
+        "Disambiguators",
+        "Strokes/word",
+    ]
+    rows = [header]
+
+    for result in results:
+        coverage = 100 * result.num_translated / result.num_words if result.num_words else 0
+        rows.append(
+            [
+                result.config_file,
+                str(result.num_translated),
+                f"{coverage:.1f}%",
+                str(result.num_conflicting_translations),
+                str(result.num_conflict_groups),
+                str(result.num_disambiguator_strokes),
+                f"{result.get_average_strokes_per_word():.3f}",
+            ]
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    for row in rows:
+        # Left align the config files and right align the numbers.
+        cells = [row[0].ljust(widths[0])]
+        cells += [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+        print("  ".join(cells))
+
+
+def main():
+    """Compare configs using command-line arguments."""
+
+    parser = argparse.ArgumentParser(description="Compare how well several configs translate.")
+    parser.add_argument("ipa_file", type=str, help="the IPA CSV dictionary")
+    parser.add_argument(
+        "word_list_file", type=str, help="the file containing words generate strokes for"
+    )
+    parser.add_argument("config_files", nargs="+", help="the config files to compare")
+    parser.add_argument(
+        "--num_processes",
+        type=int,
+        help="the most configs to evaluate at once (default: one for each CPU)",
+    )
+    parser.add_argument("-o", "--output_file", help="also write the results as JSON here")
+    parser.add_argument(
+        "-v", "--verbose", action="count", default=0, help="increase output verbosity"
+    )
+    args = parser.parse_args()
+
+    # Translation warnings for individual words aren't useful here.
+    log_level = logging.ERROR
+    if args.verbose == 1:
+        log_level = logging.INFO
+    elif args.verbose >= 2:
+        log_level = logging.DEBUG
+
+    logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s")
+    log = logging.getLogger("dictionary_generator")
+
+    try:
+        results = sweep(args.ipa_file, args.word_list_file, args.config_files, args.num_processes)
+    except InvalidConfigError as err:
+        log.critical(err)
+        sys.exit(1)
+
+    print_comparison_table(results)
+
+    if args.output_file is not None:
+        with open(args.output_file, "w", encoding="UTF-8") as file:
+            json.dump([result.to_json() for result in results], file, ensure_ascii=False, indent=0)
+
+
+if __name__ == "__main__":
+    main()
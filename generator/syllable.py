@@ -19,21 +19,43 @@ class SyllableAtom(NamedTuple):
     region: SyllableRegion
 
 
+def get_atom_id(phoneme_id, region):
+    """Encode a phoneme and the region it's in as a single integer.
+
+    Args:
+        phoneme_id: The phoneme's id (see Config.get_phoneme_ids()).
+        region: The SyllableRegion the phoneme is in.
+
+    Returns:
+        An integer that's different for every phoneme and region.
+    """
+
+    return phoneme_id * len(SyllableRegion) + region.value - 1
+
+
 class Syllable:
     """A collection of SyllableAtoms constituting a single syllable.
 
     Attributes:
         atoms: A list of SyllableAtoms. Concatenating the atoms and reading the
             phonemes from each atom gives the pronunciation of the syllable.
+        atom_ids: A tuple of the atoms encoded as integers (see
+            get_atom_id()), or None if the syllable was created without
+            phoneme ids.
     """
 
-    def __init__(self, onset, nucleus, coda):
+    __slots__ = ["_atoms", "_atom_ids"]
+
+    def __init__(self, onset, nucleus, coda, phoneme_ids=None):
         """Creates a Syllable.
 
         Args:
             onset: A list of strings. Each string is a phoneme in the onset.
             nucleus: A string specifying the IPA symbols for the nucleus.
             coda: A list of strings. Each string is a phoneme in the coda.
+            phoneme_ids: An optional dictionary mapping each phoneme to its
+                id, as returned by Config.get_phoneme_ids(). If it's given,
+                the atoms are also stored as integers for map_atom_ids().
         """
 
         self._atoms = []
@@ -47,6 +69,12 @@ class Syllable:
         for phoneme in coda:
             self._atoms.append(SyllableAtom(phoneme, SyllableRegion.CODA))
 
+        self._atom_ids = None
+        if phoneme_ids is not None:
+            self._atom_ids = tuple(
+                get_atom_id(phoneme_ids[phoneme], region) for phoneme, region in self._atoms
+            )
+
     def __str__(self):
         return "".join([phoneme for phoneme, _ in self._atoms])
 
@@ -65,19 +93,48 @@ class Syllable:
             is the length of that specific key); those SyllableAtoms are then
             mapped to the corresponding value in `atom_tuples_to_obj`.
         """
+        return self._map_longest_matches(self._atoms, atom_tuples_to_obj, None)
+
+    def get_atom_ids(self):
+        """Return the tuple of integer atoms, or None if there aren't any."""
+
+        return self._atom_ids
+
+    def map_atom_ids(self, atom_ids_to_obj, max_tuple_length=None):
+        """Map the phonemes of this syllable to objects using integer atoms.
+
+        This works the same as map_atoms() but hashes integers instead of
+        SyllableAtoms, so it's much faster. The syllable must have been created
+        with phoneme ids.
+
+        Args:
+            atom_ids_to_obj: A dictionary where the keys are tuples of atom ids
+                (see get_atom_id()), e.g. from
+                Config.get_atom_ids_to_possible_key_clusters().
+            max_tuple_length: The length of the longest key in
+                `atom_ids_to_obj`. It's computed if it isn't given.
+
+        Returns:
+            The same as map_atoms().
+        """
+
+        return self._map_longest_matches(self._atom_ids, atom_ids_to_obj, max_tuple_length)
+
+    def _map_longest_matches(self, atoms, tuples_to_obj, max_tuple_length):
         objs = []
-        max_tuple_length = len(max(atom_tuples_to_obj, key=len))
+        if max_tuple_length is None:
+            max_tuple_length = len(max(tuples_to_obj, key=len))
 
         start = 0
-        while start < len(self._atoms):
+        while start < len(atoms):
             found_match = False
 
             for length in range(max_tuple_length + 1, 0, -1):
                 end = start + length
-                if end > len(self._atoms):
+                if end > len(atoms):
                     continue
 
-                obj = atom_tuples_to_obj.get(tuple(self._atoms[start:end]), None)
+                obj = tuples_to_obj.get(tuple(atoms[start:end]), None)
 
                 if obj is not None:
                     objs.append(obj)
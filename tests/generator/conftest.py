@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+import pytest
+
+CONFIG_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "generator", "configs", "config.yaml"
+)
+
+# Several words are written the same, so conflicts have to be resolved in word
+# list order.
+IPA_LINES = [
+    "cat,/ˈkæt/",
+    "kat,/ˈkæt/",
+    "catt,/ˈkæt/",
+    "dog,/ˈdɔɡ/",
+    "dot,/ˈdɑt/",
+    "tad,/ˈtæd/",
+    "tat,/ˈtæt/",
+    "pit,/ˈpɪt/",
+    "pitt,/ˈpɪt/",
+    "kit,/ˈkɪt/",
+]
+WORDS = ["cat", "dog", "kat", "missing", "dot", "tad", "catt", "tat", "pit", "pitt", "kit"]
+
+
+@pytest.fixture
+def directory():
+    """A temporary directory with IPA_LINES in ipa.csv and WORDS in words.txt."""
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_lines(os.path.join(directory, "ipa.csv"), IPA_LINES)
+        write_lines(os.path.join(directory, "words.txt"), WORDS)
+        yield directory
+
+
+def write_lines(filename, lines):
+    with open(filename, "w", encoding="UTF-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def to_strings(words_and_translations):
+    return [
+        (word, [str(translation) for translation in translations])
+        for word, translations in words_and_translations
+    ]
+
+
+def write_variant(directory, name, old, new):
+    """Write a copy of CONFIG_FILE with the first `old` replaced by `new`."""
+
+    with open(CONFIG_FILE, "r", encoding="UTF-8") as file:
+        contents = file.read()
+
+    assert old in contents
+    filename = os.path.join(directory, name)
+    with open(filename, "w", encoding="UTF-8") as file:
+        file.write(contents.replace(old, new, 1))
+
+    return filename
@@ -0,0 +1,88 @@
+import pytest
+
+from binary_dictionary import BinaryDictionary, InvalidBinaryDictionaryError
+from binary_dictionary import pack_stroke_sequence, write_binary_dictionary
+from binary_dictionary import write_generated_dictionary
+from steno import Stroke, StrokeSequence
+
+
+def _key(sequence_str):
+    return pack_stroke_sequence(StrokeSequence.from_string(sequence_str))
+
+
+#####################################################################
+# Test pack_stroke_sequence()
+#####################################################################
+
+
+def test_pack_stroke_sequence_drops_empty_strokes():
+    sequence = StrokeSequence([Stroke(), Stroke.from_string("KAT"), Stroke()])
+
+    assert pack_stroke_sequence(sequence) == (Stroke.from_string("KAT").to_int(),)
+
+
+#####################################################################
+# Test writing and reading
+#####################################################################
+
+
+def test_lookup_finds_every_entry(tmp_path):
+    filename = tmp_path / "dictionary.stenodict"
+    entries = {"KAT": "cat", "KAT/HRAOG": "catalog", "TKOG": "dog", "A": "a", "*E": "é"}
+    write_binary_dictionary(((_key(k), v) for k, v in entries.items()), filename)
+
+    with BinaryDictionary(filename) as dictionary:
+        assert len(dictionary) == len(entries)
+        for sequence_str, translation in entries.items():
+            assert dictionary.lookup_string(sequence_str) == translation
+
+
+def test_lookup_missing_entry(tmp_path):
+    filename = tmp_path / "dictionary.stenodict"
+    write_binary_dictionary([(_key("KAT"), "cat")], filename)
+
+    with BinaryDictionary(filename) as dictionary:
+        assert dictionary.lookup_string("TKOG") is None
+        assert dictionary.lookup_string("KAT/KAT") is None
+        assert _key("KAT") in dictionary
+
+
+def test_last_duplicate_wins(tmp_path):
+    filename = tmp_path / "dictionary.stenodict"
+    write_binary_dictionary([(_key("KAT"), "cat"), (_key("KAT"), "kat")], filename)
+
+    with BinaryDictionary(filename) as dictionary:
+        assert len(dictionary) == 1
+        assert dictionary.lookup_string("KAT") == "kat"
+
+
+def test_empty_dictionary(tmp_path):
+    filename = tmp_path / "dictionary.stenodict"
+    write_binary_dictionary([], filename)
+
+    with BinaryDictionary(filename) as dictionary:
+        assert len(dictionary) == 0
+        assert dictionary.lookup_string("KAT") is None
+
+
+def test_write_generated_dictionary(tmp_path):
+    filename = tmp_path / "dictionary.stenodict"
+    words_and_translations = [
+        ("cat", [StrokeSequence.from_string("KAT")]),
+        ("catalog", [StrokeSequence.from_string("KAT/HRAOG"), StrokeSequence.from_string("KAT")]),
+    ]
+    write_generated_dictionary(words_and_translations, filename)
+
+    with BinaryDictionary(filename) as dictionary:
+        assert list(dictionary.items()) == [
+            (_key("KAT"), "catalog"),
+            (_key("KAT/HRAOG"), "catalog"),
+        ]
+
+
+def test_not_a_binary_dictionary(tmp_path):
+    filename = tmp_path / "dictionary.json"
+    filename.write_text('{"KAT": "cat", "TKOG": "dog", "A": "a"}', encoding="UTF-8")
+
+    with pytest.raises(InvalidBinaryDictionaryError):
+        BinaryDictionary(filename)
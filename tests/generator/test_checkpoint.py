@@ -0,0 +1,271 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+import checkpoint
+from config import Config
+from conftest import CONFIG_FILE, IPA_LINES, WORDS, to_strings, write_lines
+import core
+from generated_dictionary import GeneratedDictionary
+from steno import StrokeSequence
+
+# The number of seconds of the fake clock between checkpoints. The clock
+# advances one second each time it's read, which happens once for each word.
+INTERVAL = 3
+
+
+class Interrupted(Exception):
+    """Raised in place of the process being killed after a checkpoint."""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+@pytest.fixture
+def saves(monkeypatch):
+    """Count checkpoint writes, with a checkpoint every INTERVAL words."""
+
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_INTERVAL_SECONDS", INTERVAL)
+    monkeypatch.setattr(core.time, "monotonic", FakeClock())
+
+    saved_positions = []
+    save_checkpoint = checkpoint.save_checkpoint
+
+    def counting_save_checkpoint(checkpoint_file, inputs_fingerprint, state):
+        save_checkpoint(checkpoint_file, inputs_fingerprint, state)
+        saved_positions.append(state.position)
+
+    monkeypatch.setattr(checkpoint, "save_checkpoint", counting_save_checkpoint)
+
+    return saved_positions
+
+
+def generate(directory, config, checkpoint_file=None, resume=False):
+    return to_strings(
+        core.generate_dictionary(
+            os.path.join(directory, "ipa.csv"),
+            os.path.join(directory, "words.txt"),
+            config,
+            checkpoint_file,
+            resume,
+        )
+    )
+
+
+def interrupt_after_first_checkpoint(monkeypatch, directory, config, checkpoint_file):
+    save_checkpoint = checkpoint.save_checkpoint
+
+    def interrupting_save_checkpoint(*args):
+        save_checkpoint(*args)
+        raise Interrupted()
+
+    monkeypatch.setattr(checkpoint, "save_checkpoint", interrupting_save_checkpoint)
+    with pytest.raises(Interrupted):
+        generate(directory, config, checkpoint_file)
+
+    monkeypatch.setattr(checkpoint, "save_checkpoint", save_checkpoint)
+    assert os.path.exists(checkpoint_file)
+
+
+#####################################################################
+# Test save_checkpoint() and load_checkpoint()
+#####################################################################
+
+
+def test_save_and_load_checkpoint():
+    words_and_translations = GeneratedDictionary()
+    words_and_translations.append("cat", [StrokeSequence.from_string("KAT")])
+    words_and_translations.append(
+        "kat", [StrokeSequence.from_string("KAT/W-B"), StrokeSequence.from_string("KA*T")]
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoint_file = os.path.join(directory, "out.json.checkpoint")
+        checkpoint.save_checkpoint(
+            checkpoint_file,
+            "fingerprint",
+            checkpoint.Checkpoint(3, words_and_translations, {1, 2, 3}, {1: 2, 3: 1}),
+        )
+        saved = checkpoint.load_checkpoint(checkpoint_file, "fingerprint")
+
+        assert not os.path.exists(checkpoint_file + ".tmp")
+
+    assert saved.position == 3
+    assert to_strings(saved.words_and_translations) == to_strings(words_and_translations)
+    assert saved.used_keys == {1, 2, 3}
+    assert saved.next_counts == {1: 2, 3: 1}
+
+
+def test_save_and_load_checkpoint_without_disambiguator():
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoint_file = os.path.join(directory, "out.json.checkpoint")
+        checkpoint.save_checkpoint(
+            checkpoint_file,
+            "fingerprint",
+            checkpoint.Checkpoint(0, GeneratedDictionary(), None, None),
+        )
+        saved = checkpoint.load_checkpoint(checkpoint_file, "fingerprint")
+
+    assert saved.position == 0
+    assert len(saved.words_and_translations) == 0
+    assert saved.used_keys is None
+    assert saved.next_counts is None
+
+
+def test_load_missing_checkpoint():
+    with tempfile.TemporaryDirectory() as directory:
+        assert checkpoint.load_checkpoint(os.path.join(directory, "missing"), "x") is None
+
+
+def test_load_unreadable_checkpoint():
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoint_file = os.path.join(directory, "out.json.checkpoint")
+        with open(checkpoint_file, "w", encoding="UTF-8") as file:
+            file.write('{"version": ')
+
+        assert checkpoint.load_checkpoint(checkpoint_file, "fingerprint") is None
+
+
+def test_load_checkpoint_rejects_fingerprint_mismatch():
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoint_file = os.path.join(directory, "out.json.checkpoint")
+        checkpoint.save_checkpoint(
+            checkpoint_file, "old", checkpoint.Checkpoint(0, GeneratedDictionary(), None, None)
+        )
+
+        assert checkpoint.load_checkpoint(checkpoint_file, "new") is None
+
+
+@pytest.mark.parametrize("version", [1, checkpoint.CHECKPOINT_VERSION + 1, None])
+def test_load_checkpoint_rejects_unsupported_version(version):
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoint_file = os.path.join(directory, "out.json.checkpoint")
+        checkpoint.save_checkpoint(
+            checkpoint_file,
+            "fingerprint",
+            checkpoint.Checkpoint(0, GeneratedDictionary(), None, None),
+        )
+
+        with open(checkpoint_file, "r", encoding="UTF-8") as file:
+            state = json.load(file)
+        state["version"] = version
+        with open(checkpoint_file, "w", encoding="UTF-8") as file:
+            json.dump(state, file)
+
+        assert checkpoint.load_checkpoint(checkpoint_file, "fingerprint") is None
+
+
+def test_remove_checkpoint():
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoint_file = os.path.join(directory, "out.json.checkpoint")
+        checkpoint.remove_checkpoint(checkpoint_file)
+
+        write_lines(checkpoint_file, ["{}"])
+        checkpoint.remove_checkpoint(checkpoint_file)
+        assert not os.path.exists(checkpoint_file)
+
+
+#####################################################################
+# Test fingerprint_inputs()
+#####################################################################
+
+
+def test_fingerprint_inputs_changes_with_inputs(directory):
+    ipa_file = os.path.join(directory, "ipa.csv")
+    word_list_file = os.path.join(directory, "words.txt")
+    config = Config(CONFIG_FILE)
+    fingerprint = checkpoint.fingerprint_inputs(ipa_file, word_list_file, config)
+
+    assert checkpoint.fingerprint_inputs(ipa_file, word_list_file, config) == fingerprint
+
+    write_lines(word_list_file, WORDS + ["dog"])
+    word_list_fingerprint = checkpoint.fingerprint_inputs(ipa_file, word_list_file, config)
+    assert word_list_fingerprint != fingerprint
+
+    write_lines(ipa_file, IPA_LINES + ["bat,/ˈbæt/"])
+    assert checkpoint.fingerprint_inputs(ipa_file, word_list_file, config) != (
+        word_list_fingerprint
+    )
+
+
+#####################################################################
+# Test resuming core.generate_dictionary()
+#####################################################################
+
+
+def test_checkpoints_are_written_at_the_interval(directory, saves):
+    config = Config(CONFIG_FILE)
+    checkpoint_file = os.path.join(directory, "out.json.checkpoint")
+
+    expected = generate(directory, config)
+    assert not saves
+
+    assert generate(directory, config, checkpoint_file) == expected
+    assert saves == list(range(INTERVAL, len(WORDS) + 1, INTERVAL))
+    assert not os.path.exists(checkpoint_file)
+
+
+def test_resume_gives_same_output(monkeypatch, directory, saves):
+    config = Config(CONFIG_FILE)
+    checkpoint_file = os.path.join(directory, "out.json.checkpoint")
+    expected = generate(directory, config)
+
+    interrupt_after_first_checkpoint(monkeypatch, directory, config, checkpoint_file)
+    saves.clear()
+
+    assert generate(directory, config, checkpoint_file, resume=True) == expected
+    # Only the words after the checkpoint were translated again.
+    assert len(saves) == (len(WORDS) - INTERVAL) // INTERVAL
+    assert not os.path.exists(checkpoint_file)
+
+
+def test_resume_without_checkpoint_starts_from_the_beginning(directory, saves):
+    config = Config(CONFIG_FILE)
+    checkpoint_file = os.path.join(directory, "out.json.checkpoint")
+
+    assert generate(directory, config, checkpoint_file, resume=True) == generate(directory, config)
+
+
+@pytest.mark.parametrize("changed_input", ["config", "word_list", "ipa"])
+def test_resume_starts_from_the_beginning_if_inputs_changed(
+    monkeypatch, directory, saves, changed_input
+):
+    config = Config(CONFIG_FILE)
+    checkpoint_file = os.path.join(directory, "out.json.checkpoint")
+    interrupt_after_first_checkpoint(monkeypatch, directory, config, checkpoint_file)
+
+    if changed_input == "config":
+        with open(CONFIG_FILE, "r", encoding="UTF-8") as file:
+            contents = file.read()
+        assert 'keys_right: ["-D"]' in contents
+
+        config_file = os.path.join(directory, "new.yaml")
+        with open(config_file, "w", encoding="UTF-8") as file:
+            file.write(contents.replace('keys_right: ["-D"]', 'keys_right: ["-D", "-T"]', 1))
+        config = Config(config_file)
+    elif changed_input == "word_list":
+        write_lines(os.path.join(directory, "words.txt"), ["kit"] + WORDS)
+    else:
+        write_lines(
+            os.path.join(directory, "ipa.csv"),
+            [line.replace("/ˈkæt/", "/ˈkɪt/") for line in IPA_LINES],
+        )
+
+    expected = generate(directory, config)
+    saves.clear()
+
+    assert generate(directory, config, checkpoint_file, resume=True) == expected
+    # Every word was translated again.
+    assert len(saves) == len(read_words(directory)) // INTERVAL
+
+
+def read_words(directory):
+    return core.read_word_list(os.path.join(directory, "words.txt"))
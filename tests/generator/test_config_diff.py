@@ -0,0 +1,144 @@
+import os
+import tempfile
+
+import pytest
+
+from config import Config
+from conftest import CONFIG_FILE, write_lines, write_variant
+import config_diff
+import incremental
+
+IPA_LINES = [
+    "cat,/ˈkæt/",
+    "dog,/ˈdɔɡ/",
+    "dot,/ˈdɑt/",
+    "tad,/ˈtæd/",
+    "tat,/ˈtæt/",
+    "pit,/ˈpɪt/",
+]
+WORDS = ["cat", "dog", "dot", "missing", "tad", "tat", "pit"]
+
+
+def generate(directory, config, name):
+    manifest_file = os.path.join(directory, name + ".manifest")
+    incremental.generate_dictionary_incrementally(
+        os.path.join(directory, "ipa.csv"),
+        os.path.join(directory, "words.txt"),
+        config,
+        manifest_file,
+    )
+
+    return manifest_file
+
+
+def get_expected_changes(old_manifest_file, new_manifest_file, config):
+    fingerprint = config.get_fingerprint()
+    old_entries = incremental.load_manifest(
+        old_manifest_file, Config(CONFIG_FILE).get_fingerprint()
+    )
+    new_entries = incremental.load_manifest(new_manifest_file, fingerprint)
+
+    return [
+        old.word
+        for old, new in zip(old_entries, new_entries)
+        if old.resolved_translations != new.resolved_translations
+    ]
+
+
+@pytest.fixture
+def directory():
+    with tempfile.TemporaryDirectory() as directory:
+        write_lines(os.path.join(directory, "ipa.csv"), IPA_LINES)
+        write_lines(os.path.join(directory, "words.txt"), WORDS)
+        yield directory
+
+
+#####################################################################
+# Test diff_configs()
+#####################################################################
+
+
+def test_diff_configs_only_retranslates_affected_words(directory):
+    old_config = Config(CONFIG_FILE)
+    new_config = Config(
+        write_variant(directory, "new.yaml", 'keys_right: ["-D"]', 'keys_right: ["-D", "-T"]')
+    )
+    manifest_file = generate(directory, old_config, "old")
+
+    diff = config_diff.diff_configs(manifest_file, old_config, new_config)
+
+    # Only "tad" has a "d" in a coda, but "tat" comes after it and now needs
+    # the disambiguator stroke.
+    assert diff.num_words == len(WORDS)
+    assert diff.num_retranslated == 1
+    assert [change.word for change in diff.changes] == ["tad", "tat"]
+    assert (diff.changes[0].removed, diff.changes[0].added) == ([], ["TAT"])
+    assert (diff.changes[1].removed, diff.changes[1].added) == (["TAT"], ["TAT/W-B"])
+    assert os.path.exists(config_diff.get_default_index_file(manifest_file))
+
+    # The result is the same with the saved index, and the same as
+    # regenerating the dictionary with the new config.
+    saved_diff = config_diff.diff_configs(manifest_file, old_config, new_config)
+    assert saved_diff.to_json() == diff.to_json()
+    assert [change.word for change in diff.changes] == get_expected_changes(
+        manifest_file, generate(directory, new_config, "new"), new_config
+    )
+
+
+def test_diff_configs_disambiguator_change(directory):
+    old_config = Config(CONFIG_FILE)
+    new_config = Config(
+        write_variant(
+            directory,
+            "new.yaml",
+            'disambiguator_stroke: "W-B"',
+            'disambiguator_stroke: "SKWR-"',
+        )
+    )
+    manifest_file = generate(directory, old_config, "old")
+
+    diff = config_diff.diff_configs(manifest_file, old_config, new_config)
+
+    assert diff.num_retranslated == 0
+    assert [change.word for change in diff.changes] == get_expected_changes(
+        manifest_file, generate(directory, new_config, "new"), new_config
+    )
+
+
+def test_diff_configs_phonology_change_retranslates_everything(directory):
+    old_config = Config(CONFIG_FILE)
+    new_config = Config(
+        write_variant(
+            directory,
+            "new.yaml",
+            "immediately_before_vowel: []",
+            'immediately_before_vowel: ["ŋ"]',
+        )
+    )
+    manifest_file = generate(directory, old_config, "old")
+
+    assert config_diff.diff_configs(manifest_file, old_config, new_config).num_retranslated == 7
+
+
+def test_diff_configs_manifest_mismatch(directory):
+    old_config = Config(CONFIG_FILE)
+    new_config = Config(
+        write_variant(directory, "new.yaml", 'keys_right: ["-D"]', 'keys_right: ["-D", "-T"]')
+    )
+    manifest_file = generate(directory, new_config, "new")
+
+    with pytest.raises(config_diff.ManifestMismatchError):
+        config_diff.diff_configs(manifest_file, old_config, new_config)
+
+
+#####################################################################
+# Test find_affected_positions()
+#####################################################################
+
+
+def test_find_affected_positions():
+    atom_index = {1: [0, 2, 5], 2: [2, 3, 5], 3: [4]}
+
+    assert config_diff.find_affected_positions(atom_index, [(1, 2)]) == [2, 5]
+    assert config_diff.find_affected_positions(atom_index, [(1, 2), (3,)]) == [2, 4, 5]
+    assert config_diff.find_affected_positions(atom_index, [(4,)]) == []
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from config import Config
+from conflicts import analyze_conflicts
+import postprocessing
+from steno import StrokeSequence
+
+CONFIG_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "generator", "configs", "config.yaml"
+)
+
+
+@pytest.fixture(scope="module")
+def config():
+    return Config(CONFIG_FILE)
+
+
+def _words_and_translations():
+    return [
+        ("right", [StrokeSequence.from_string("RAOEUT")]),
+        ("write", [StrokeSequence.from_string("RAOEUT"), StrokeSequence.from_string("WRAOEUT")]),
+        ("rite", [StrokeSequence.from_string("RAOEUT")]),
+        ("cat", [StrokeSequence.from_string("KAT")]),
+    ]
+
+
+#####################################################################
+# Test analyze_conflicts()
+#####################################################################
+
+
+def test_conflict_groups(config):
+    report = analyze_conflicts(_words_and_translations(), config)
+
+    assert report.num_words == 4
+    assert report.num_translations == 5
+    assert report.conflict_groups == {"RAOEUT": ["right", "write", "rite"]}
+    assert report.get_num_conflicting_translations() == 3
+    assert report.get_largest_conflict_groups(1) == [("RAOEUT", ["right", "write", "rite"])]
+
+
+def test_disambiguator_strokes_match_disambiguator(config):
+    report = analyze_conflicts(_words_and_translations(), config)
+
+    words_and_translations = postprocessing.postprocess_generated_dictionary(
+        _words_and_translations(), config
+    )
+    disambiguator_str = str(config.get_disambiguator_stroke())
+    expected = {}
+    for word, translations in words_and_translations:
+        num_strokes = sum(
+            str(translation).split("/").count(disambiguator_str) for translation in translations
+        )
+        if num_strokes > 0:
+            expected[word] = num_strokes
+
+    assert report.disambiguator_strokes_per_word == expected
+    assert report.get_words_with_most_disambiguator_strokes(1) == [("rite", 2)]
+    assert report.get_num_disambiguator_strokes() == 3
@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+import core
+from generated_dictionary import GeneratedDictionary
+from steno import StrokeSequence
+
+# Words that have to be escaped in JSON, and non-ASCII words that shouldn't be.
+WORDS_AND_STROKES = [
+    ('say "cat"', ["KAT", "KAT/W-B"]),
+    ("back\\slash", ["TKOG"]),
+    ("café", ["KA*T"]),
+    ('\\"', ["A"]),
+    ("naïve\tword", ["S-", "-T"]),
+]
+
+
+def make_dictionary(words_and_strokes):
+    dictionary = GeneratedDictionary()
+    for word, strokes in words_and_strokes:
+        dictionary.append(word, [StrokeSequence.from_string(s) for s in strokes])
+
+    return dictionary
+
+
+def write_and_read(words_and_strokes, compact=False, sort_by_stroke=False):
+    with tempfile.TemporaryDirectory() as directory:
+        output_file = os.path.join(directory, "out.json")
+        core.write_dictionary_to_file(
+            make_dictionary(words_and_strokes), output_file, compact, sort_by_stroke
+        )
+
+        with open(output_file, "r", encoding="UTF-8") as file:
+            contents = file.read()
+
+    # Keep the entries in the order they were written.
+    return contents, json.loads(contents, object_pairs_hook=list)
+
+
+#####################################################################
+# Test write_dictionary_to_file() with the JSON format
+#####################################################################
+
+
+def test_write_json_in_word_list_order():
+    contents, entries = write_and_read(WORDS_AND_STROKES)
+
+    assert entries == [
+        ("KAT", 'say "cat"'),
+        ("KAT/W-B", 'say "cat"'),
+        ("TKOG", "back\\slash"),
+        ("KA*T", "café"),
+        ("A", '\\"'),
+        ("S-", "naïve\tword"),
+        ("-T", "naïve\tword"),
+    ]
+
+    # Each entry is on its own line, and non-ASCII characters aren't escaped.
+    lines = contents.split("\n")
+    assert lines[0] == "{"
+    assert lines[1] == '"KAT": "say \\"cat\\"",'
+    assert lines[3] == '"TKOG": "back\\\\slash",'
+    assert lines[4] == '"KA*T": "café",'
+    assert lines[-1] == "}"
+    assert len(lines) == len(entries) + 2
+
+
+def test_write_compact_json():
+    contents, entries = write_and_read(WORDS_AND_STROKES, compact=True)
+
+    assert entries == write_and_read(WORDS_AND_STROKES)[1]
+    assert "\n" not in contents
+    assert contents.startswith('{"KAT":"say \\"cat\\"","KAT/W-B":')
+    assert "café" in contents
+
+
+def test_write_json_sorted_by_stroke():
+    contents, entries = write_and_read(WORDS_AND_STROKES, sort_by_stroke=True)
+
+    # Single strokes come first, in steno order.
+    assert entries == [
+        ("S-", "naïve\tword"),
+        ("TKOG", "back\\slash"),
+        ("KAT", 'say "cat"'),
+        ("KA*T", "café"),
+        ("A", '\\"'),
+        ("-T", "naïve\tword"),
+        ("KAT/W-B", 'say "cat"'),
+    ]
+    assert len(contents.split("\n")) == len(entries) + 2
+
+
+def test_write_compact_json_sorted_by_stroke():
+    contents, entries = write_and_read(WORDS_AND_STROKES, compact=True, sort_by_stroke=True)
+
+    assert entries == write_and_read(WORDS_AND_STROKES, sort_by_stroke=True)[1]
+    assert "\n" not in contents
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_write_empty_json(compact):
+    _, entries = write_and_read([], compact=compact)
+
+    assert entries == []
+
+
+def test_write_json_matches_json_module():
+    contents, _ = write_and_read(WORDS_AND_STROKES, compact=True)
+
+    expected = {}
+    for word, strokes in WORDS_AND_STROKES:
+        for stroke in strokes:
+            expected[stroke] = word
+
+    assert contents == json.dumps(expected, ensure_ascii=False, separators=(",", ":"))
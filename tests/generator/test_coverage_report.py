@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from config import Config
+import core
+import coverage_report
+
+CONFIG_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "generator", "configs", "config.yaml"
+)
+
+
+@pytest.fixture(scope="module")
+def config():
+    return Config(CONFIG_FILE)
+
+
+#####################################################################
+# Test get_failure_reason()
+#####################################################################
+
+
+def test_get_failure_reason(config):
+    assert coverage_report.get_failure_reason(["kæt"], config) is None
+    assert coverage_report.get_failure_reason(None, config) == coverage_report.REASON_MISSING_IPA
+    assert (
+        coverage_report.get_failure_reason(["pst"], config) == coverage_report.REASON_NO_SYLLABLES
+    )
+    assert (
+        coverage_report.get_failure_reason(["ŋæt"], config)
+        == coverage_report.REASON_LEADING_CONSONANTS
+    )
+    assert (
+        coverage_report.get_failure_reason(["æbf"], config)
+        == coverage_report.REASON_NO_VALID_STROKE
+    )
+
+
+def test_get_failure_reason_for_many_pronunciations(config):
+    assert coverage_report.get_failure_reason(["pst", "kæt"], config) is None
+    assert (
+        coverage_report.get_failure_reason(["æbf", "pst", "ŋæt"], config)
+        == coverage_report.REASON_NO_VALID_STROKE
+    )
+
+
+#####################################################################
+# Test check_coverage()
+#####################################################################
+
+
+def test_check_coverage(config, monkeypatch):
+    word_to_ipa = {
+        "cat": ["kæt"],
+        "pst": ["pst"],
+        "ngat": ["ŋæt"],
+        "abf": ["æbf"],
+        "dog": ["dɔɡ"],
+    }
+    words = ["cat", "pst", "Missing", "ngat", "abf", "Dog", "missing2"]
+
+    report = coverage_report.check_coverage(words, word_to_ipa, config, num_processes=1)
+    monkeypatch.setattr(coverage_report, "_WORDS_PER_CHUNK", 2)
+    parallel_report = coverage_report.check_coverage(words, word_to_ipa, config, num_processes=2)
+
+    for checked in [report, parallel_report]:
+        assert checked.num_words == 7
+        assert checked.num_covered == 2
+        assert checked.failure_counts[coverage_report.REASON_MISSING_IPA] == 2
+        assert checked.failure_examples == {
+            coverage_report.REASON_NO_SYLLABLES: ["pst"],
+            coverage_report.REASON_MISSING_IPA: ["Missing", "missing2"],
+            coverage_report.REASON_LEADING_CONSONANTS: ["ngat"],
+            coverage_report.REASON_NO_VALID_STROKE: ["abf"],
+        }
+
+    # Covered words are exactly the ones that get translated.
+    for word in words:
+        translations = core.translate_word(word, word_to_ipa, config)
+        reason = coverage_report.get_failure_reason(word_to_ipa.get(word.lower()), config)
+        assert (len(translations) > 0) == (reason is None)
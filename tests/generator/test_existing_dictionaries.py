@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from config import Config
+from existing_dictionaries import fingerprint_config, load_existing_dictionaries
+import postprocessing
+from postprocessing import get_sequence_key
+from steno import StrokeSequence
+
+CONFIG_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "generator", "configs", "config.yaml"
+)
+
+
+@pytest.fixture(scope="module")
+def config():
+    return Config(CONFIG_FILE)
+
+
+@pytest.fixture
+def existing_file(tmp_path):
+    filename = tmp_path / "briefs.json"
+    filename.write_text('{"KA-T": "cat", "TKOG": "dog", "1-9": "19"}')
+    return str(filename)
+
+
+#####################################################################
+# Test load_existing_dictionaries()
+#####################################################################
+
+
+def test_no_existing_dictionaries(config):
+    assert load_existing_dictionaries([], config) is None
+
+
+def test_words_and_strokes(config, existing_file):
+    existing = load_existing_dictionaries([existing_file], config)
+
+    assert existing.words == {"cat", "dog", "19"}
+    # Strokes that can't be generated are left out.
+    assert existing.sequence_keys == {
+        get_sequence_key(StrokeSequence.from_string("KAT")),
+        get_sequence_key(StrokeSequence.from_string("TKOG")),
+    }
+    assert existing.filter_words(["the", "cat", "Cat", "dog"]) == ["the", "Cat"]
+
+
+def test_strokes_are_taken(config, existing_file):
+    existing = load_existing_dictionaries([existing_file], config)
+    disambiguator = postprocessing.create_disambiguator(config, existing.get_used_keys())
+    translations = [StrokeSequence.from_string("KAT")]
+
+    disambiguator.disambiguate(translations)
+
+    assert str(translations[0]) == f"KAT/{config.get_disambiguator_stroke()}"
+    # The disambiguator doesn't modify the existing dictionaries' keys.
+    assert len(existing.sequence_keys) == 2
+
+
+def test_fingerprint_config(config, existing_file, tmp_path):
+    existing = load_existing_dictionaries([existing_file], config)
+    other_file = tmp_path / "other.json"
+    other_file.write_text('{"TKOG": "dog"}')
+    other = load_existing_dictionaries([str(other_file)], config)
+
+    assert fingerprint_config(config, None) == config.get_fingerprint()
+    assert fingerprint_config(config, existing) != config.get_fingerprint()
+    assert fingerprint_config(config, existing) != fingerprint_config(config, other)
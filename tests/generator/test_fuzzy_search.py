@@ -0,0 +1,87 @@
+import random
+
+from binary_dictionary import pack_stroke_sequence
+from fuzzy_search import BKTree, FuzzyIndex, create_index_from_generated_dictionary
+from fuzzy_search import get_distance
+from steno import StrokeSequence
+
+
+def _key(sequence_str):
+    return pack_stroke_sequence(StrokeSequence.from_string(sequence_str))
+
+
+def _found(results):
+    return [(distance, translation) for distance, _, translation in results]
+
+
+INDEX = FuzzyIndex(
+    {
+        _key("KAT"): "cat",
+        _key("KAP"): "cap",
+        _key("KAPT"): "capped",
+        _key("TKOG"): "dog",
+        _key("KAT/HRAOG"): "catalog",
+        _key("KAT/HRAOGS"): "catalogs",
+    }
+)
+
+
+#####################################################################
+# Test get_distance()
+#####################################################################
+
+
+def test_get_distance():
+    assert get_distance(_key("KAT"), _key("KAT")) == 0
+    assert get_distance(_key("KAT"), _key("KAPT")) == 1
+    assert get_distance(_key("KAT"), _key("KAP")) == 2
+    assert get_distance(_key("KAT/HRAOG"), _key("KAP/HRAOGS")) == 3
+
+
+#####################################################################
+# Test queries
+#####################################################################
+
+
+def test_find_within():
+    assert len(INDEX) == 6
+    assert _found(INDEX.find_within_string("KAT", 0)) == [(0, "cat")]
+    assert _found(INDEX.find_within_string("KAT", 1)) == [(0, "cat"), (1, "capped")]
+    assert _found(INDEX.find_within_string("KAT", 2)) == [
+        (0, "cat"),
+        (1, "capped"),
+        (2, "cap"),
+    ]
+
+
+def test_only_same_length_sequences_are_compared():
+    assert _found(INDEX.find_within_string("KAT/HRAOG", 1)) == [(0, "catalog"), (1, "catalogs")]
+    assert INDEX.find_within_string("KAT/KAT/KAT", 23) == []
+
+
+def test_matches_full_scan():
+    rng = random.Random(0)
+    keys = {(rng.randrange(1, 1 << 23) & rng.randrange(1, 1 << 23) or 1,) for _ in range(500)}
+    tree = BKTree()
+    for key in keys:
+        tree.add(key, str(key))
+
+    for query in rng.sample(sorted(keys), 20):
+        for max_distance in range(4):
+            expected = sorted(
+                (get_distance(query, key), key, str(key))
+                for key in keys
+                if get_distance(query, key) <= max_distance
+            )
+            assert sorted(tree.find_within(query, max_distance)) == expected
+
+
+def test_create_index_from_generated_dictionary():
+    index = create_index_from_generated_dictionary(
+        [
+            ("cat", [StrokeSequence.from_string("KAT")]),
+            ("cats", [StrokeSequence.from_string("KATS")]),
+        ]
+    )
+
+    assert _found(index.find_within_string("KAT", 1)) == [(0, "cat"), (1, "cats")]
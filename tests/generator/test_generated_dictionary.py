@@ -0,0 +1,107 @@
+import pytest
+
+from generated_dictionary import (
+    GeneratedDictionary,
+    format_packed_strokes,
+    get_packed_sort_key,
+    iter_packed,
+)
+from steno import Stroke, StrokeSequence
+
+
+def _translations(*sequence_strs):
+    return [StrokeSequence.from_string(s) for s in sequence_strs]
+
+
+WORDS_AND_TRANSLATIONS = [
+    ("cat", _translations("KAT", "KAT/W-B")),
+    ("catalog", _translations("KAT/A/HRAOG")),
+    ("a", _translations("A*")),
+]
+
+
+def _create_dictionary():
+    dictionary = GeneratedDictionary()
+    for word, translations in WORDS_AND_TRANSLATIONS:
+        dictionary.append(word, translations)
+
+    return dictionary
+
+
+def test_iterate():
+    dictionary = _create_dictionary()
+
+    assert len(dictionary) == 3
+    assert list(dictionary) == WORDS_AND_TRANSLATIONS
+    assert dictionary[1] == WORDS_AND_TRANSLATIONS[1]
+    assert dictionary.get_word(2) == "a"
+    assert dictionary.get_num_translations() == 4
+    assert dictionary.get_num_strokes() == 7
+
+
+def test_negative_index():
+    dictionary = _create_dictionary()
+
+    assert dictionary[-1] == WORDS_AND_TRANSLATIONS[-1]
+    assert dictionary[-3] == WORDS_AND_TRANSLATIONS[0]
+    assert dictionary.get_word(-2) == "catalog"
+    assert dictionary.get_packed_translations(-3) == [
+        translation.to_ints() for translation in WORDS_AND_TRANSLATIONS[0][1]
+    ]
+
+
+def test_index_out_of_range():
+    dictionary = _create_dictionary()
+
+    for i in [3, -4]:
+        with pytest.raises(IndexError):
+            dictionary[i]  # pylint: disable=pointless-statement
+        with pytest.raises(IndexError):
+            dictionary.get_word(i)
+        with pytest.raises(IndexError):
+            dictionary.get_packed_translations(i)
+
+    with pytest.raises(IndexError):
+        GeneratedDictionary()[0]  # pylint: disable=pointless-statement
+
+
+def test_translations_are_copied():
+    translations = _translations("KAT")
+    dictionary = GeneratedDictionary()
+    dictionary.append("cat", translations)
+
+    translations[0].append_stroke(Stroke.from_string("W-B"))
+    dictionary[0][1][0].append_stroke(Stroke.from_string("W-B"))
+
+    assert dictionary[0] == ("cat", _translations("KAT"))
+
+
+def test_iter_packed():
+    expected = [
+        (word, [translation.to_ints() for translation in translations])
+        for word, translations in WORDS_AND_TRANSLATIONS
+    ]
+
+    assert list(iter_packed(_create_dictionary())) == expected
+    assert list(iter_packed(WORDS_AND_TRANSLATIONS)) == expected
+
+
+def test_append_packed():
+    dictionary = GeneratedDictionary()
+    dictionary.append_packed("cat", [[Stroke.from_string("KAT").to_int()]])
+    dictionary.append_packed("nothing", [])
+
+    assert list(dictionary) == [("cat", _translations("KAT")), ("nothing", [])]
+
+
+def test_format_packed_strokes():
+    sequence = StrokeSequence([Stroke.from_string("KAT"), Stroke(), Stroke.from_string("HRAOG")])
+
+    assert format_packed_strokes(sequence.to_ints()) == "KAT/HRAOG"
+    assert format_packed_strokes([]) == ""
+
+
+def test_get_packed_sort_key():
+    sequences = _translations("KAT/HRAOG", "A*", "KAT", "A", "SKWR-RBGS", "KA*T")
+
+    assert sorted(sequences, key=lambda s: get_packed_sort_key(s.to_ints())) == sorted(sequences)
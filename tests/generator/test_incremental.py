@@ -0,0 +1,270 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+from config import Config
+from conftest import CONFIG_FILE, IPA_LINES, WORDS, to_strings, write_lines
+import core
+from existing_dictionaries import fingerprint_config
+import incremental
+
+
+@pytest.fixture
+def retranslated(monkeypatch):
+    """Record each word translated by core.translate_word()."""
+
+    words = []
+    translate_word = core.translate_word
+
+    def recording_translate_word(word, *args):
+        words.append(word)
+        return translate_word(word, *args)
+
+    monkeypatch.setattr(core, "translate_word", recording_translate_word)
+
+    return words
+
+
+def generate_incrementally(directory, config, use_ipa_index=False):
+    return to_strings(
+        incremental.generate_dictionary_incrementally(
+            os.path.join(directory, "ipa.csv"),
+            os.path.join(directory, "words.txt"),
+            config,
+            os.path.join(directory, "out.json.manifest"),
+            use_ipa_index=use_ipa_index,
+        )
+    )
+
+
+def generate_fully(directory, config):
+    return to_strings(
+        core.generate_dictionary(
+            os.path.join(directory, "ipa.csv"), os.path.join(directory, "words.txt"), config
+        )
+    )
+
+
+#####################################################################
+# Test save_manifest() and load_manifest()
+#####################################################################
+
+
+def test_save_and_load_manifest():
+    entries = [
+        incremental.ManifestEntry("cat", ["kæt"], [[1], [2, 3]], [[1], [2, 3, 4]]),
+        incremental.ManifestEntry("missing", None, [], []),
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        manifest_file = os.path.join(directory, "out.json.manifest")
+        incremental.save_manifest(manifest_file, "fingerprint", entries)
+        loaded = incremental.load_manifest(manifest_file, "fingerprint")
+
+        assert not os.path.exists(manifest_file + ".tmp")
+
+    assert [
+        (entry.word, entry.ipa, entry.translations, entry.resolved_translations)
+        for entry in loaded
+    ] == [
+        ("cat", ["kæt"], [[1], [2, 3]], [[1], [2, 3, 4]]),
+        ("missing", None, [], []),
+    ]
+
+
+def test_load_missing_manifest():
+    with tempfile.TemporaryDirectory() as directory:
+        assert incremental.load_manifest(os.path.join(directory, "missing"), "x") is None
+
+
+def test_load_unreadable_manifest():
+    with tempfile.TemporaryDirectory() as directory:
+        manifest_file = os.path.join(directory, "out.json.manifest")
+        with open(manifest_file, "w", encoding="UTF-8") as file:
+            file.write('{"version": ')
+
+        assert incremental.load_manifest(manifest_file, "fingerprint") is None
+
+
+def test_load_manifest_rejects_config_mismatch():
+    with tempfile.TemporaryDirectory() as directory:
+        manifest_file = os.path.join(directory, "out.json.manifest")
+        incremental.save_manifest(manifest_file, "old", [])
+
+        assert incremental.load_manifest(manifest_file, "new") is None
+
+
+def test_load_manifest_rejects_old_version():
+    with tempfile.TemporaryDirectory() as directory:
+        manifest_file = os.path.join(directory, "out.json.manifest")
+        incremental.save_manifest(manifest_file, "fingerprint", [])
+
+        with open(manifest_file, "r", encoding="UTF-8") as file:
+            manifest = json.load(file)
+        manifest["version"] = incremental.MANIFEST_VERSION - 1
+        with open(manifest_file, "w", encoding="UTF-8") as file:
+            json.dump(manifest, file)
+
+        assert incremental.load_manifest(manifest_file, "fingerprint") is None
+
+
+#####################################################################
+# Test find_first_affected_position()
+#####################################################################
+
+
+def make_entries(words_and_ipa):
+    return [incremental.ManifestEntry(word, ipa, [], []) for word, ipa in words_and_ipa]
+
+
+def test_find_first_affected_position_unchanged():
+    old_entries = make_entries([("cat", ["kæt"]), ("Dog", ["dɔɡ"]), ("missing", None)])
+    word_to_ipa = {"cat": ["kæt"], "dog": ["dɔɡ"]}
+
+    position = incremental.find_first_affected_position(
+        ["cat", "Dog", "missing"], word_to_ipa, old_entries
+    )
+    assert position == 3
+
+
+@pytest.mark.parametrize(
+    "words, word_to_ipa, expected",
+    [
+        # A word was appended.
+        (["cat", "dog", "missing", "kit"], {"cat": ["kæt"], "dog": ["dɔɡ"]}, 3),
+        # A word was removed.
+        (["cat", "missing"], {"cat": ["kæt"], "dog": ["dɔɡ"]}, 1),
+        # Words were reordered.
+        (["dog", "cat", "missing"], {"cat": ["kæt"], "dog": ["dɔɡ"]}, 0),
+        # A word's IPA changed.
+        (["cat", "dog", "missing"], {"cat": ["kæt"], "dog": ["dɑɡ"]}, 1),
+        # A word without IPA has an entry now.
+        (["cat", "dog", "missing"], {"cat": ["kæt"], "dog": ["dɔɡ"], "missing": ["mɪs"]}, 2),
+        # The list was truncated to a prefix, so nothing before its end changed.
+        (["cat"], {"cat": ["kæt"]}, 1),
+    ],
+)
+def test_find_first_affected_position(words, word_to_ipa, expected):
+    old_entries = make_entries([("cat", ["kæt"]), ("dog", ["dɔɡ"]), ("missing", None)])
+
+    assert incremental.find_first_affected_position(words, word_to_ipa, old_entries) == expected
+
+
+#####################################################################
+# Test generate_dictionary_incrementally()
+#####################################################################
+
+
+def test_first_run_translates_every_word(directory, retranslated):
+    config = Config(CONFIG_FILE)
+
+    assert generate_incrementally(directory, config) == generate_fully(directory, config)
+    assert retranslated[: len(WORDS)] == WORDS
+    assert os.path.exists(os.path.join(directory, "out.json.manifest"))
+
+
+def test_unchanged_inputs_reuse_every_word(directory, retranslated):
+    config = Config(CONFIG_FILE)
+    expected = generate_incrementally(directory, config)
+    retranslated.clear()
+
+    assert generate_incrementally(directory, config) == expected
+    assert not retranslated
+
+
+@pytest.mark.parametrize(
+    "words",
+    [
+        # A word was added at the start, moving every other word.
+        ["catt"] + WORDS,
+        # A word was added at the end.
+        WORDS + ["cat"],
+        # A word in the middle was removed.
+        WORDS[:2] + WORDS[3:],
+        # Words were reordered.
+        list(reversed(WORDS)),
+        # The list was truncated.
+        WORDS[:5],
+    ],
+)
+def test_word_list_edits_match_full_run(directory, retranslated, words):
+    config = Config(CONFIG_FILE)
+    generate_incrementally(directory, config)
+    retranslated.clear()
+
+    write_lines(os.path.join(directory, "words.txt"), words)
+    expected = generate_fully(directory, config)
+    retranslated.clear()
+
+    assert generate_incrementally(directory, config) == expected
+    # Every word was in the previous word list with the same IPA.
+    assert not retranslated
+
+    # The updated manifest is used by the next run.
+    assert generate_incrementally(directory, config) == expected
+    assert not retranslated
+
+
+def test_ipa_index_reuses_every_word(directory, retranslated):
+    config = Config(CONFIG_FILE)
+    expected = generate_incrementally(directory, config)
+    retranslated.clear()
+
+    # The pronunciations from the index match the ones saved in the manifest.
+    assert generate_incrementally(directory, config, use_ipa_index=True) == expected
+    assert not retranslated
+
+
+def test_ipa_edits_match_full_run(directory, retranslated):
+    config = Config(CONFIG_FILE)
+    generate_incrementally(directory, config)
+    retranslated.clear()
+
+    ipa_lines = [line.replace("dog,/ˈdɔɡ/", "dog,/ˈkæt/") for line in IPA_LINES]
+    ipa_lines.append("missing,/ˈmɪsɪŋ/")
+    write_lines(os.path.join(directory, "ipa.csv"), ipa_lines)
+    expected = generate_fully(directory, config)
+    retranslated.clear()
+
+    assert generate_incrementally(directory, config) == expected
+    assert sorted(retranslated) == ["dog", "missing"]
+
+
+def test_word_list_and_ipa_edits_match_full_run(directory, retranslated):
+    config = Config(CONFIG_FILE)
+    generate_incrementally(directory, config)
+
+    write_lines(os.path.join(directory, "words.txt"), ["pit", "kat"] + WORDS[4:] + ["bat"])
+    write_lines(
+        os.path.join(directory, "ipa.csv"),
+        [line.replace("tad,/ˈtæd/", "tad,/ˈtæt/") for line in IPA_LINES] + ["bat,/ˈbæt/"],
+    )
+    expected = generate_fully(directory, config)
+    retranslated.clear()
+
+    assert generate_incrementally(directory, config) == expected
+    assert sorted(retranslated) == ["bat", "tad"]
+
+
+def test_config_change_translates_every_word(directory, retranslated):
+    generate_incrementally(directory, Config(CONFIG_FILE))
+
+    with open(CONFIG_FILE, "r", encoding="UTF-8") as file:
+        contents = file.read()
+    assert 'keys_right: ["-D"]' in contents
+
+    config_file = os.path.join(directory, "new.yaml")
+    with open(config_file, "w", encoding="UTF-8") as file:
+        file.write(contents.replace('keys_right: ["-D"]', 'keys_right: ["-D", "-T"]', 1))
+    config = Config(config_file)
+
+    manifest_file = os.path.join(directory, "out.json.manifest")
+    assert incremental.load_manifest(manifest_file, fingerprint_config(config, None)) is None
+
+    expected = generate_fully(directory, config)
+    retranslated.clear()
+
+    assert generate_incrementally(directory, config) == expected
+    assert retranslated == WORDS
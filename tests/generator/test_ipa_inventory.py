@@ -0,0 +1,97 @@
+import os
+import tempfile
+
+import pytest
+
+from config import Config
+import ipa_utils
+from ipa_inventory import IpaTokenizer, analyze_ipa_file, count_ipa_symbols
+
+CONFIG_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "generator", "configs", "config.yaml"
+)
+
+IPA_LINES = [
+    "cat,/ˈkæt/",
+    "bach,/bɑx/,/bɑk/",
+    "uh,/ʔəʔ/",
+    "loch,/ɫɑx/",
+]
+
+
+@pytest.fixture(scope="module")
+def config():
+    return Config(CONFIG_FILE)
+
+
+#####################################################################
+# Test IpaTokenizer
+#####################################################################
+
+
+def test_tokenize():
+    tokenizer = IpaTokenizer(["a", "aɪ"], ["t", "tʃ", "s"])
+
+    assert tokenizer.tokenize("taɪtʃs") == ["t", "aɪ", "tʃ", "s"]
+    assert tokenizer.tokenize("ˈtax") == ["ˈ", "t", "a", "x"]
+
+
+def test_tokenize_ignored_symbols():
+    tokenizer = IpaTokenizer(["a"], ["t", "tʃ"], ["ˈ"])
+
+    assert tokenizer.tokenize("atˈʃa") == ["a", "tʃ", "a"]
+
+
+#####################################################################
+# Test count_ipa_symbols()
+#####################################################################
+
+
+def test_count_ipa_symbols(config):
+    word_to_ipa = dict(ipa_utils.extract_key_and_value(line) for line in IPA_LINES)
+    inventory = count_ipa_symbols(word_to_ipa, IpaTokenizer.from_config(config), max_examples=1)
+
+    assert inventory.num_words == 4
+    assert inventory.num_pronunciations == 5
+    assert inventory.symbol_counts["ɑ"] == 3
+    assert inventory.symbol_counts["x"] == 2
+    assert inventory.phoneme_counts["k"] == 2
+    assert inventory.phoneme_counts["ɑ"] == 3
+    assert "x" not in inventory.phoneme_counts
+
+    assert inventory.get_uncovered_symbols() == ["x", "ʔ", "ˈ"]
+    assert inventory.uncovered_symbol_counts["ʔ"] == 2
+    assert inventory.uncovered_symbol_num_words["ʔ"] == 1
+    assert inventory.uncovered_symbol_examples == {"x": ["bach"], "ʔ": ["uh"], "ˈ": ["cat"]}
+
+
+#####################################################################
+# Test analyze_ipa_file()
+#####################################################################
+
+
+def test_analyze_ipa_file_in_chunks(config, monkeypatch):
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "ipa.csv")
+        with open(filename, "w", encoding="UTF-8") as file:
+            file.write("\n".join(IPA_LINES) + "\n")
+
+        inventory = analyze_ipa_file(filename, config, num_processes=1)
+        monkeypatch.setattr(ipa_utils, "_BYTES_PER_CHUNK", 8)
+        chunked_inventory = analyze_ipa_file(filename, config, num_processes=2)
+
+    assert chunked_inventory.to_json() == inventory.to_json()
+    assert inventory.uncovered_symbol_examples["x"] == ["bach", "loch"]
+    assert "ɡ" in inventory.unused_phonemes
+    assert "k" not in inventory.unused_phonemes
+
+
+#####################################################################
+# Test ipa_utils.get_ipa_symbols()
+#####################################################################
+
+
+def test_get_ipa_symbols():
+    word_to_ipa = dict(ipa_utils.extract_key_and_value(line) for line in IPA_LINES)
+
+    assert ipa_utils.get_ipa_symbols(word_to_ipa) == set("ˈkætbɑxʔəɫ")
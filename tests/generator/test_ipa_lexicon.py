@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+import pytest
+
+from ipa_lexicon import IpaLexicon, LayeredIpaLexicon, get_default_index_file
+from ipa_utils import create_ipa_lookup_dictionary
+
+IPA_LINES = [
+    "dog,/ˈdɔɡ/",
+    "a,/ə/,/ˈeɪ/",
+    "cat,/ˈkæt/",
+    "no ipa",
+    "café,/kæˈfeɪ/",
+    "  cat,/ˈkat/",
+]
+
+
+def _write_ipa_file(directory, lines):
+    filename = os.path.join(directory, "ipa.csv")
+    with open(filename, "w", encoding="UTF-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+    return filename
+
+
+def test_lookup():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = _write_ipa_file(directory, IPA_LINES)
+
+        with IpaLexicon(filename) as lexicon:
+            assert os.path.exists(get_default_index_file(filename))
+            assert len(lexicon) == 4
+            assert lexicon["a"] == ["ə", "ˈeɪ"]
+            assert lexicon["café"] == ["kæˈfeɪ"]
+            assert lexicon.get("missing") is None
+            assert "dog" in lexicon
+            assert "Dog" not in lexicon
+            with pytest.raises(KeyError):
+                lexicon["missing"]  # pylint: disable=pointless-statement
+
+
+def test_matches_lookup_dictionary():
+    lines = IPA_LINES[:3] + IPA_LINES[4:]
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = _write_ipa_file(directory, lines)
+        word_to_ipa = create_ipa_lookup_dictionary(filename)
+
+        with IpaLexicon(filename) as lexicon:
+            assert {word: lexicon[word] for word in word_to_ipa} == word_to_ipa
+
+
+def test_rebuilds_stale_index():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = _write_ipa_file(directory, IPA_LINES)
+        with IpaLexicon(filename) as lexicon:
+            assert "bird" not in lexicon
+
+        _write_ipa_file(directory, IPA_LINES + ["bird,/ˈbɝd/"])
+        with IpaLexicon(filename) as lexicon:
+            assert lexicon["bird"] == ["ˈbɝd"]
+            assert lexicon["cat"] == ["ˈkat"]
+
+
+def test_empty_file():
+    with tempfile.TemporaryDirectory() as directory:
+        with IpaLexicon(_write_ipa_file(directory, [])) as lexicon:
+            assert len(lexicon) == 0
+            assert "cat" not in lexicon
+
+
+def test_layered_lookup():
+    with tempfile.TemporaryDirectory() as directory:
+        base_file = _write_ipa_file(directory, IPA_LINES)
+        corrections_file = os.path.join(directory, "corrections.csv")
+        with open(corrections_file, "w", encoding="UTF-8") as file:
+            file.write("cat,/ˈkæt/\nzebra,/ˈzɛbɹə/\n")
+
+        with LayeredIpaLexicon([corrections_file, base_file]) as lexicon:
+            assert lexicon["cat"] == ["ˈkæt"]
+            # The base file isn't indexed until a word isn't in the corrections.
+            assert not os.path.exists(get_default_index_file(base_file))
+            assert lexicon["dog"] == ["ˈdɔɡ"]
+            assert "zebra" in lexicon
+            assert lexicon.get("missing") is None
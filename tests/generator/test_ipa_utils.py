@@ -0,0 +1,134 @@
+import os
+import tempfile
+
+import ipa_utils
+from ipa_utils import IpaNormalizer, create_ipa_lookup_dictionary
+
+IPA_LINES = [
+    "a,/ə/,/ˈeɪ/",
+    "cat,/ˈkæt/",
+    "café,/kæˈfeɪ/",
+    "dog,/ˈdɔɡ/",
+    "cat,/ˈkat/",
+]
+
+
+def _write_ipa_file(directory):
+    filename = os.path.join(directory, "ipa.csv")
+    with open(filename, "w", encoding="UTF-8") as file:
+        file.write("\n".join(IPA_LINES) + "\n")
+
+    return filename
+
+
+#####################################################################
+# Test create_ipa_lookup_dictionary()
+#####################################################################
+
+
+def test_create_ipa_lookup_dictionary():
+    with tempfile.TemporaryDirectory() as directory:
+        word_to_ipa = create_ipa_lookup_dictionary(_write_ipa_file(directory))
+
+    assert word_to_ipa == {
+        "a": ["ə", "ˈeɪ"],
+        "cat": ["ˈkat"],
+        "café": ["kæˈfeɪ"],
+        "dog": ["ˈdɔɡ"],
+    }
+
+
+def test_create_ipa_lookup_dictionary_for_words():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = _write_ipa_file(directory)
+        word_to_ipa = create_ipa_lookup_dictionary(filename, ["Cat", "CAFÉ", "missing"])
+        full_word_to_ipa = create_ipa_lookup_dictionary(filename)
+
+    assert word_to_ipa == {"cat": ["ˈkat"], "café": ["kæˈfeɪ"]}
+    assert all(full_word_to_ipa[word] == ipa for word, ipa in word_to_ipa.items())
+
+
+def test_create_ipa_lookup_dictionary_for_no_words():
+    with tempfile.TemporaryDirectory() as directory:
+        assert create_ipa_lookup_dictionary(_write_ipa_file(directory), []) == {}
+
+
+def test_create_ipa_lookup_dictionary_in_chunks(monkeypatch):
+    # Use chunks a few lines long so that the two lines for "cat" are parsed
+    # by different processes.
+    monkeypatch.setattr(ipa_utils, "_BYTES_PER_CHUNK", 8)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = _write_ipa_file(directory)
+        serial_word_to_ipa = create_ipa_lookup_dictionary(filename, num_processes=1)
+        word_to_ipa = create_ipa_lookup_dictionary(filename, num_processes=2)
+        filtered_word_to_ipa = create_ipa_lookup_dictionary(filename, ["cat", "a"], 2)
+        full_word_to_ipa = create_ipa_lookup_dictionary(filename)
+
+    assert word_to_ipa == serial_word_to_ipa == full_word_to_ipa
+    assert word_to_ipa["cat"] == ["ˈkat"]
+    assert filtered_word_to_ipa == {"a": ["ə", "ˈeɪ"], "cat": ["ˈkat"]}
+
+
+def test_create_ipa_lookup_dictionary_from_layers():
+    with tempfile.TemporaryDirectory() as directory:
+        base_file = _write_ipa_file(directory)
+        corrections_file = os.path.join(directory, "corrections.csv")
+        with open(corrections_file, "w", encoding="UTF-8") as file:
+            file.write("cat,/ˈkæt/\nzebra,/ˈzɛbɹə/\n")
+
+        layers = [corrections_file, base_file]
+        word_to_ipa = create_ipa_lookup_dictionary(layers)
+        word_to_ipa_for_words = create_ipa_lookup_dictionary(layers, ["Cat", "dog", "missing"])
+
+        # Files after the one with every word aren't read.
+        missing_file = os.path.join(directory, "missing.csv")
+        assert create_ipa_lookup_dictionary([corrections_file, missing_file], ["cat"]) == {
+            "cat": ["ˈkæt"]
+        }
+
+    assert word_to_ipa == {
+        "a": ["ə", "ˈeɪ"],
+        "cat": ["ˈkæt"],
+        "café": ["kæˈfeɪ"],
+        "dog": ["ˈdɔɡ"],
+        "zebra": ["ˈzɛbɹə"],
+    }
+    assert word_to_ipa_for_words == {"cat": ["ˈkæt"], "dog": ["ˈdɔɡ"]}
+
+
+#####################################################################
+# Test IpaNormalizer
+#####################################################################
+
+
+def test_normalize_unicode():
+    normalizer = IpaNormalizer()
+    decomposed = "kafe\u0301"
+
+    assert normalizer.normalize(decomposed) == "kafé"
+    assert normalizer.normalize("ˈkæt") == "ˈkæt"
+
+
+def test_normalize_ignored_symbols():
+    normalizer = IpaNormalizer(["ˈ", "ˌ", "ː"])
+
+    assert normalizer.normalize("ˌkætəˈlɔːɡ") == "kætəlɔɡ"
+    assert normalizer.normalize("tˈʃ") == "tʃ"
+
+
+def test_normalize_shares_strings():
+    normalizer = IpaNormalizer(["ˈ"])
+    first = normalizer.normalize("".join(["ˈk", "æt"]))
+    second = normalizer.normalize("".join(["kæ", "t"]))
+
+    assert first == "kæt"
+    assert first is second
+
+
+def test_normalize_lookup_dictionary():
+    normalizer = IpaNormalizer(["ˈ"])
+    word_to_ipa = {"cat": ["ˈkæt", "kæt", "ˈkat"], "dog": ["ˈdɔɡ"]}
+
+    assert normalizer.normalize_lookup_dictionary(word_to_ipa) is word_to_ipa
+    assert word_to_ipa == {"cat": ["kæt", "kat"], "dog": ["dɔɡ"]}
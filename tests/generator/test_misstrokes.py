@@ -0,0 +1,61 @@
+from binary_dictionary import pack_stroke_sequence
+from misstrokes import find_risky_pairs, rank_pairs
+from steno import Key, StrokeSequence
+
+
+def _entries(entries):
+    return {
+        pack_stroke_sequence(StrokeSequence.from_string(sequence_str)): translation
+        for sequence_str, translation in entries.items()
+    }
+
+
+def _pair_strings(pairs):
+    return [str(pair) for pair in pairs]
+
+
+#####################################################################
+# Test find_risky_pairs()
+#####################################################################
+
+
+def test_single_stroke_neighbors():
+    pairs = find_risky_pairs(_entries({"KAT": "cat", "KAPT": "capped", "TKOG": "dog"}))
+
+    assert len(pairs) == 1
+    assert pairs[0].translation == "cat"
+    assert pairs[0].neighbor_translation == "capped"
+    assert pairs[0].steno_key == Key.RP
+    assert _pair_strings(pairs) == ["KAT (cat) / KAPT (capped): P in stroke 1"]
+
+
+def test_multi_stroke_neighbors():
+    entries = _entries({"KAT/HRAOG": "catalog", "KAT/HRAOGS": "catalogs", "KAT": "cat"})
+    pairs = find_risky_pairs(entries)
+
+    assert _pair_strings(pairs) == ["KAT/HRAOG (catalog) / KAT/HRAOGS (catalogs): S in stroke 2"]
+
+
+def test_same_translation_is_not_risky():
+    assert find_risky_pairs(_entries({"KAT": "cat", "KA*T": "cat"})) == []
+
+
+def test_strokes_differing_by_more_than_one_key():
+    assert find_risky_pairs(_entries({"KAT": "cat", "KAP": "cap", "KAT/KAT": "catcat"})) == []
+
+
+#####################################################################
+# Test rank_pairs()
+#####################################################################
+
+
+def test_rank_pairs():
+    pairs = find_risky_pairs(
+        _entries({"KAT": "cat", "KATS": "cats", "TKOG": "dog", "TKOGS": "dogs"})
+    )
+
+    ranked = rank_pairs(pairs, {"dogs": 0, "cat": 1})
+    assert [pair.translation for pair in ranked] == ["dog", "cat"]
+
+    ranked = rank_pairs(pairs, {"cats": 0})
+    assert [pair.translation for pair in ranked] == ["cat", "dog"]
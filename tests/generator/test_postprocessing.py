@@ -0,0 +1,94 @@
+import random
+
+from postprocessing import Disambiguator, get_sequence_key
+from steno import Stroke, StrokeSequence
+
+DISAMBIGUATOR = Stroke.from_string("W-B")
+
+
+def _sequences(*sequence_strs):
+    return [StrokeSequence.from_string(s) for s in sequence_strs]
+
+
+def _disambiguate_strings(sequence_strs_per_word):
+    """Resolve conflicts by comparing strings, the simplest correct approach."""
+
+    used = set()
+    results = []
+    for sequence_strs in sequence_strs_per_word:
+        for sequence_str in sequence_strs:
+            while sequence_str in used:
+                sequence_str += "/W-B"
+            used.add(sequence_str)
+            results.append(sequence_str)
+    return results
+
+
+#####################################################################
+# Test get_sequence_key()
+#####################################################################
+
+
+def test_get_sequence_key():
+    kat, hraog = _sequences("KAT", "HRAOG")
+    katalog = StrokeSequence([Stroke.from_string("KAT"), Stroke(), Stroke.from_string("HRAOG")])
+
+    assert get_sequence_key(katalog) == get_sequence_key(StrokeSequence.from_string("KAT/HRAOG"))
+    assert get_sequence_key(kat) != get_sequence_key(hraog)
+    assert get_sequence_key(StrokeSequence.from_string("KAT/HRAOG")) != get_sequence_key(
+        StrokeSequence.from_string("HRAOG/KAT")
+    )
+
+
+#####################################################################
+# Test Disambiguator
+#####################################################################
+
+
+def test_disambiguate():
+    disambiguator = Disambiguator(DISAMBIGUATOR)
+    results = []
+    for sequence_str in ["KAT", "KAT", "KAT/W-B/W-B", "KAT", "TKOG"]:
+        translations = _sequences(sequence_str)
+        disambiguator.disambiguate(translations)
+        results.append(str(translations[0]))
+
+    assert results == ["KAT", "KAT/W-B", "KAT/W-B/W-B", "KAT/W-B/W-B/W-B", "TKOG"]
+
+
+def test_used_keys_are_taken():
+    used_keys = {get_sequence_key(StrokeSequence.from_string("KAT"))}
+    disambiguator = Disambiguator(DISAMBIGUATOR, used_keys)
+
+    assert disambiguator.claim(StrokeSequence.from_string("KAT")) == 1
+    assert disambiguator.claim(StrokeSequence.from_string("TKOG")) == 0
+
+
+def test_matches_string_comparison():
+    rng = random.Random(0)
+    pool = ["KAT", "KAT/W-B", "KAT/W-B/W-B", "TKOG", "TKOG/W-B", "KAT/HRAOG", "W-B"]
+    sequence_strs_per_word = [rng.sample(pool, rng.randint(1, 3)) for _ in range(300)]
+
+    disambiguator = Disambiguator(DISAMBIGUATOR)
+    results = []
+    for sequence_strs in sequence_strs_per_word:
+        translations = _sequences(*sequence_strs)
+        disambiguator.disambiguate(translations)
+        results += [str(translation) for translation in translations]
+
+    assert results == _disambiguate_strings(sequence_strs_per_word)
+
+
+def test_restore_state():
+    sequence_strs = ["KAT", "KAT", "TKOG", "KAT", "KAT/W-B/W-B/W-B/W-B", "KAT"]
+
+    disambiguator = Disambiguator(DISAMBIGUATOR)
+    counts = [disambiguator.claim(s) for s in _sequences(*sequence_strs[:3])]
+    restored = Disambiguator(
+        DISAMBIGUATOR,
+        set(disambiguator.get_used_keys()),
+        dict(disambiguator.get_next_counts()),
+    )
+    counts += [restored.claim(s) for s in _sequences(*sequence_strs[3:])]
+
+    assert counts == [0, 1, 0, 2, 0, 3]
@@ -0,0 +1,82 @@
+import pytest
+
+from reverse_index import InvalidReverseIndexError, ReverseIndex
+from reverse_index import lookup_in_indexes, write_reverse_index
+from steno import StrokeSequence
+
+
+def _translations(*sequence_strs):
+    return [StrokeSequence.from_string(s) for s in sequence_strs]
+
+
+def _as_strings(results):
+    return [(word, [str(t) for t in translations]) for word, translations in results]
+
+
+WORDS_AND_TRANSLATIONS = [
+    ("cat", _translations("KAT")),
+    ("catalog", _translations("KA/TA/HROG", "KAT/HRAOG")),
+    ("Cat", _translations("KA*T")),
+    ("dog", _translations("TKOG")),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    filename = tmp_path / "words.stenorev"
+    write_reverse_index(WORDS_AND_TRANSLATIONS, filename)
+
+    with ReverseIndex(filename) as reverse_index:
+        yield reverse_index
+
+
+#####################################################################
+# Test queries
+#####################################################################
+
+
+def test_lookup(index):
+    assert len(index) == 4
+    assert _as_strings(index.lookup("catalog")) == [("catalog", ["KA/TA/HROG", "KAT/HRAOG"])]
+    assert _as_strings(index.lookup("Cat")) == [("Cat", ["KA*T"])]
+    assert index.lookup("cow") == []
+    assert index.lookup("CAT") == []
+
+
+def test_lookup_ignore_case(index):
+    assert _as_strings(index.lookup("CAT", ignore_case=True)) == [
+        ("Cat", ["KA*T"]),
+        ("cat", ["KAT"]),
+    ]
+
+
+def test_lookup_prefix(index):
+    assert [word for word, _ in index.lookup_prefix("cat")] == ["cat", "catalog"]
+    assert [word for word, _ in index.lookup_prefix("Ca", ignore_case=True)] == [
+        "Cat",
+        "cat",
+        "catalog",
+    ]
+    assert [word for word, _ in index.lookup_prefix("", limit=2)] == ["Cat", "cat"]
+    assert index.lookup_prefix("x") == []
+
+
+def test_lookup_in_indexes(tmp_path, index):
+    other_filename = tmp_path / "other.stenorev"
+    write_reverse_index([("cat", _translations("KAEGT"))], other_filename)
+
+    with ReverseIndex(other_filename) as other:
+        results = lookup_in_indexes([index, other], "cat")
+
+    assert [(filename, str(t[0])) for filename, _, t in results] == [
+        (str(tmp_path / "words.stenorev"), "KAT"),
+        (str(other_filename), "KAEGT"),
+    ]
+
+
+def test_not_a_reverse_index(tmp_path):
+    filename = tmp_path / "dictionary.json"
+    filename.write_text('{"KAT": "cat", "TKOG": "dog", "HRAOG": "log"}')
+
+    with pytest.raises(InvalidReverseIndexError):
+        ReverseIndex(filename)
@@ -0,0 +1,277 @@
+import json
+import os
+
+import pytest
+
+from config import Config
+from conftest import CONFIG_FILE, IPA_LINES, WORDS, to_strings, write_lines
+import core
+import sharding
+
+
+def generate_shards(directory, config, shard_count, output_name="out.json", use_ipa_index=False):
+    shard_files = []
+    for shard_index in range(shard_count):
+        shard_file = sharding.get_shard_file(
+            os.path.join(directory, output_name), shard_index, shard_count
+        )
+        sharding.generate_shard(
+            os.path.join(directory, "ipa.csv"),
+            os.path.join(directory, "words.txt"),
+            config,
+            shard_index,
+            shard_count,
+            shard_file,
+            use_ipa_index=use_ipa_index,
+        )
+        shard_files.append(shard_file)
+
+    return shard_files
+
+
+def rewrite_shard(shard_file, edit):
+    with open(shard_file, "r", encoding="UTF-8") as file:
+        shard = json.load(file)
+
+    edit(shard)
+
+    with open(shard_file, "w", encoding="UTF-8") as file:
+        json.dump(shard, file)
+
+
+#####################################################################
+# Test parse_shard_spec()
+#####################################################################
+
+
+@pytest.mark.parametrize("spec, expected", [("0/1", (0, 1)), ("0/4", (0, 4)), ("3/4", (3, 4))])
+def test_parse_shard_spec(spec, expected):
+    assert sharding.parse_shard_spec(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["3/3", "-1/3", "0/0", "a/b", "1", "1/2/3", "", "/"])
+def test_parse_invalid_shard_spec(spec):
+    with pytest.raises(ValueError):
+        sharding.parse_shard_spec(spec)
+
+
+#####################################################################
+# Test merge_shards()
+#####################################################################
+
+
+@pytest.mark.parametrize("shard_count", [1, 2, 3, len(WORDS) + 1])
+def test_merge_matches_single_run(directory, shard_count):
+    config = Config(CONFIG_FILE)
+    expected = to_strings(
+        core.generate_dictionary(
+            os.path.join(directory, "ipa.csv"), os.path.join(directory, "words.txt"), config
+        )
+    )
+    shard_files = generate_shards(directory, config, shard_count)
+
+    # The order the shards are given in doesn't matter.
+    assert to_strings(sharding.merge_shards(list(reversed(shard_files)), config)) == expected
+
+
+def test_merge_shards_made_with_ipa_index(directory):
+    config = Config(CONFIG_FILE)
+    expected = to_strings(
+        core.generate_dictionary(
+            os.path.join(directory, "ipa.csv"), os.path.join(directory, "words.txt"), config
+        )
+    )
+    shard_files = generate_shards(directory, config, 2, use_ipa_index=True)
+
+    assert to_strings(sharding.merge_shards(shard_files, config)) == expected
+
+
+def test_get_shard_word_list_file(directory):
+    shard_files = generate_shards(directory, Config(CONFIG_FILE), 2)
+
+    assert sharding.get_shard_word_list_file(shard_files) == os.path.join(directory, "words.txt")
+
+
+def test_merge_no_shards():
+    with pytest.raises(sharding.InvalidShardError):
+        sharding.merge_shards([], Config(CONFIG_FILE))
+
+
+def test_merge_missing_shard(directory):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 3)
+
+    with pytest.raises(sharding.InvalidShardError, match=r"Missing shards \[1\] of 3"):
+        sharding.merge_shards([shard_files[0], shard_files[2]], config)
+
+
+def test_merge_missing_shard_file(directory):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 2)
+    os.remove(shard_files[1])
+
+    with pytest.raises(sharding.InvalidShardError, match="Unable to read"):
+        sharding.merge_shards(shard_files, config)
+
+
+def test_merge_duplicate_shard(directory):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 2)
+
+    with pytest.raises(sharding.InvalidShardError, match="more than once"):
+        sharding.merge_shards([shard_files[0], shard_files[0], shard_files[1]], config)
+
+
+def test_merge_shards_with_different_shard_counts(directory):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 2)
+    other_shard_files = generate_shards(directory, config, 3, "other.json")
+
+    with pytest.raises(sharding.InvalidShardError):
+        sharding.merge_shards([shard_files[0], other_shard_files[1]], config)
+
+
+def test_merge_shards_from_different_word_lists(directory):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 2)
+
+    write_lines(os.path.join(directory, "words.txt"), WORDS + ["cat"])
+    other_shard_file = generate_shards(directory, config, 2, "other.json")[1]
+
+    with pytest.raises(sharding.InvalidShardError, match="different word list"):
+        sharding.merge_shards([shard_files[0], other_shard_file], config)
+
+
+def test_merge_shards_from_different_ipa_files(directory):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 2)
+
+    write_lines(os.path.join(directory, "ipa.csv"), IPA_LINES + ["bat,/ˈbæt/"])
+    other_shard_file = generate_shards(directory, config, 2, "other.json")[1]
+
+    with pytest.raises(sharding.InvalidShardError, match="different IPA files"):
+        sharding.merge_shards([shard_files[0], other_shard_file], config)
+
+
+def test_fingerprint_ipa_files(directory):
+    ipa_file = os.path.join(directory, "ipa.csv")
+    other_ipa_file = os.path.join(directory, "other.csv")
+    write_lines(other_ipa_file, IPA_LINES)
+
+    # Copies of a file have the same fingerprint.
+    assert sharding.fingerprint_ipa_files(ipa_file) == sharding.fingerprint_ipa_files(
+        other_ipa_file
+    )
+    assert sharding.fingerprint_ipa_files(ipa_file) == sharding.fingerprint_ipa_files([ipa_file])
+    assert sharding.fingerprint_ipa_files([ipa_file, other_ipa_file]) != (
+        sharding.fingerprint_ipa_files(ipa_file)
+    )
+
+    write_lines(other_ipa_file, IPA_LINES[1:])
+    assert sharding.fingerprint_ipa_files(ipa_file) != sharding.fingerprint_ipa_files(
+        other_ipa_file
+    )
+
+
+def test_merge_shards_with_different_config(directory):
+    shard_files = generate_shards(directory, Config(CONFIG_FILE), 2)
+
+    with open(CONFIG_FILE, "r", encoding="UTF-8") as file:
+        contents = file.read()
+    assert 'keys_right: ["-D"]' in contents
+
+    config_file = os.path.join(directory, "new.yaml")
+    with open(config_file, "w", encoding="UTF-8") as file:
+        file.write(contents.replace('keys_right: ["-D"]', 'keys_right: ["-D", "-T"]', 1))
+
+    with pytest.raises(sharding.InvalidShardError, match="different config"):
+        sharding.merge_shards(shard_files, Config(config_file))
+
+
+def test_merge_unreadable_shard(directory):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 2)
+    write_lines(shard_files[0], ['{"version": '])
+
+    with pytest.raises(sharding.InvalidShardError, match="Unable to read"):
+        sharding.merge_shards(shard_files, config)
+
+
+def test_merge_shard_with_unsupported_version(directory):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 2)
+    rewrite_shard(shard_files[0], lambda shard: shard.update(version=0))
+
+    with pytest.raises(sharding.InvalidShardError, match="supported version"):
+        sharding.merge_shards(shard_files, config)
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("positions", None),
+        ("words", "cat"),
+        ("translations", {}),
+        ("shard_index", "0"),
+        ("shard_count", None),
+        ("config_fingerprint", 1),
+        ("word_list_file", None),
+        ("word_list_fingerprint", None),
+        ("ipa_fingerprint", None),
+        ("num_words_requested", []),
+        ("ipa", None),
+    ],
+)
+def test_merge_shard_with_malformed_field(directory, field, value):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 2)
+    rewrite_shard(shard_files[0], lambda shard: shard.update({field: value}))
+
+    with pytest.raises(sharding.InvalidShardError, match=f"`{field}` should be"):
+        sharding.merge_shards(shard_files, config)
+
+
+@pytest.mark.parametrize("field", ["positions", "shard_count"])
+def test_merge_shard_with_missing_field(directory, field):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 2)
+    rewrite_shard(shard_files[1], lambda shard: shard.pop(field))
+
+    with pytest.raises(sharding.InvalidShardError, match=f"`{field}` should be"):
+        sharding.merge_shards(shard_files, config)
+
+
+def test_merge_shard_with_mismatched_lengths(directory):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 2)
+    rewrite_shard(shard_files[0], lambda shard: shard["words"].pop())
+
+    with pytest.raises(sharding.InvalidShardError, match="different number"):
+        sharding.merge_shards(shard_files, config)
+
+
+def test_merge_shard_with_invalid_index(directory):
+    config = Config(CONFIG_FILE)
+    shard_files = generate_shards(directory, config, 2)
+    rewrite_shard(shard_files[0], lambda shard: shard.update(shard_index=2))
+
+    with pytest.raises(sharding.InvalidShardError, match="doesn't exist"):
+        sharding.merge_shards(shard_files, config)
+
+
+#####################################################################
+# Test describe_shard_syllables()
+#####################################################################
+
+
+def test_describe_shard_syllables_matches_single_run(directory):
+    config = Config(CONFIG_FILE)
+    ipa_file = os.path.join(directory, "ipa.csv")
+    words_and_translations = core.generate_dictionary(
+        ipa_file, os.path.join(directory, "words.txt"), config
+    )
+    shard_files = generate_shards(directory, config, 3)
+
+    word_to_syllables = sharding.describe_shard_syllables(shard_files, config)
+    assert word_to_syllables == core.describe_syllables(words_and_translations, ipa_file, config)
+    assert word_to_syllables["cat"] != ""
@@ -0,0 +1,80 @@
+from sqlite_dictionary import SqliteDictionary, SqliteEntry
+from sqlite_dictionary import write_generated_dictionary, write_sqlite_dictionary
+from steno import StrokeSequence
+
+
+def _entry(strokes, word, source_file):
+    return SqliteEntry(strokes, None, word, source_file)
+
+
+#####################################################################
+# Test writing and querying
+#####################################################################
+
+
+def test_first_entry_wins(tmp_path):
+    filename = tmp_path / "dictionary.sqlite"
+    entries = [
+        _entry("KAT", "cat", "a.json"),
+        _entry("KAT/HRAOG", "catalog", "a.json"),
+        _entry("KAT", "kat", "b.json"),
+        _entry("TKOG", "dog", "b.json"),
+    ]
+
+    assert write_sqlite_dictionary(entries, filename, first_entry_wins=True) == 4
+
+    with SqliteDictionary(filename) as dictionary:
+        assert dictionary.lookup("KAT")["word"] == "cat"
+        assert dictionary.lookup("HRAOG") is None
+        assert [e["word"] for e in dictionary.entries_with_first_stroke("KAT")] == [
+            "cat",
+            "catalog",
+            "kat",
+        ]
+        assert [e["word"] for e in dictionary.entries_with_stroke_count(2)] == ["catalog"]
+        assert [e["word"] for e in dictionary.overridden_entries("b.json")] == ["kat"]
+        assert dictionary.overridden_entries("a.json") == []
+
+
+def test_last_entry_wins(tmp_path):
+    filename = tmp_path / "dictionary.sqlite"
+    entries = [_entry("KAT", "cat", "a.json"), _entry("KAT", "kat", "a.json")]
+    write_sqlite_dictionary(entries, filename, first_entry_wins=False)
+
+    with SqliteDictionary(filename) as dictionary:
+        assert dictionary.lookup("KAT")["word"] == "kat"
+        assert [e["word"] for e in dictionary.overridden_entries("a.json")] == ["cat"]
+
+
+def test_write_generated_dictionary(tmp_path):
+    filename = tmp_path / "generated.sqlite"
+    words_and_translations = [
+        ("cat", [StrokeSequence.from_string("KAT")]),
+        ("catalog", [StrokeSequence.from_string("KAT/HRAOG")]),
+    ]
+    write_generated_dictionary(
+        words_and_translations, filename, "words.txt", {"catalog": "kæt.ə.lɔɡ"}
+    )
+
+    with SqliteDictionary(filename) as dictionary:
+        assert dictionary.lookup("KAT")["syllables"] is None
+        assert dictionary.entries_for_word("catalog") == [
+            {
+                "strokes": "KAT/HRAOG",
+                "word": "catalog",
+                "source_file": "words.txt",
+                "priority": 1,
+                "overridden": 0,
+                "syllables": "kæt.ə.lɔɡ",
+            }
+        ]
+
+
+def test_existing_file_is_replaced(tmp_path):
+    filename = tmp_path / "dictionary.sqlite"
+    write_sqlite_dictionary([_entry("KAT", "cat", "a.json")], filename, first_entry_wins=True)
+    write_sqlite_dictionary([_entry("TKOG", "dog", "a.json")], filename, first_entry_wins=True)
+
+    with SqliteDictionary(filename) as dictionary:
+        assert dictionary.lookup("KAT") is None
+        assert dictionary.lookup("TKOG")["word"] == "dog"
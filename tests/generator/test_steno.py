@@ -1,10 +1,10 @@
 import copy
 import pytest
 
+import steno
 from steno import Key, Stroke, StrokeSequence
 from steno import MissingDashInStrokeError, OutOfStenoOrderError
 
-
 #####################################################################
 # Test Stroke class
 #####################################################################
@@ -149,6 +149,32 @@ class TestStroke:
         assert stroke1 < stroke2
         assert not (stroke2 < stroke1)
 
+    #################################################################
+    # Test sort_key()
+    #################################################################
+
+    def test_sort_key_matches_lt(self):
+        strokes = [
+            Stroke([Key.LK, Key.STAR, Key.RZ]),
+            Stroke([Key.LK, Key.O, Key.RD]),
+            Stroke([Key.LK, Key.STAR, Key.RP]),
+            Stroke([Key.LP, Key.A, Key.RT]),
+            Stroke([Key.LK, Key.RP]),
+            Stroke([Key.LK, Key.O, Key.RD, Key.RZ]),
+            Stroke([Key.LK, Key.RG]),
+        ]
+
+        by_key = sorted(strokes, key=Stroke.sort_key)
+
+        for stroke1, stroke2 in zip(by_key, by_key[1:]):
+            assert not (stroke2 < stroke1)
+
+    def test_sort_key_equal_for_equal_strokes(self):
+        stroke1 = Stroke([Key.LK, Key.O, Key.STAR, Key.RD])
+        stroke2 = Stroke([Key.LK, Key.O, Key.STAR, Key.RD])
+
+        assert stroke1.sort_key() == stroke2.sort_key()
+
     #################################################################
     # Test __str__()
     #################################################################
@@ -398,6 +424,26 @@ class TestStroke:
 
         assert stroke.get_keys() == [Key.LS, Key.LT, Key.STAR, Key.RG]
 
+    #################################################################
+    # Test copy()
+    #################################################################
+
+    def test_copy_is_independent(self):
+        stroke = Stroke([Key.LS, Key.A])
+        stroke_copy = stroke.copy()
+
+        stroke_copy.add_keys_maintain_steno_order([Key.RT])
+
+        assert stroke.get_keys() == [Key.LS, Key.A]
+        assert stroke_copy.get_keys() == [Key.LS, Key.A, Key.RT]
+
+    def test_copy_matches_deepcopy(self):
+        stroke = Stroke([Key.LK, Key.STAR, Key.RG])
+        stroke_copy = stroke.copy()
+
+        assert stroke_copy == copy.deepcopy(stroke)
+        assert vars(stroke_copy) == vars(copy.deepcopy(stroke))
+
     #################################################################
     # Test clear_keys()
     #################################################################
@@ -699,6 +745,57 @@ class TestStroke:
 
         assert stroke1.right_consonants_match(stroke2)
 
+    #################################################################
+    # Test to_int() and from_int()
+    #################################################################
+
+    def test_to_int_empty(self):
+        assert Stroke().to_int() == 0
+
+    def test_to_int_one_bit_per_key(self):
+        stroke = Stroke([Key.NUM, Key.LS, Key.RZ])
+
+        assert stroke.to_int() == (1 << 0) | (1 << 1) | (1 << 22)
+
+    def test_to_int_fits_in_23_bits(self):
+        stroke = Stroke(list(Key))
+
+        assert stroke.to_int() == (1 << 23) - 1
+
+    def test_from_int_round_trip(self):
+        stroke = Stroke([Key.LK, Key.LW, Key.A, Key.STAR, Key.RL, Key.RD])
+
+        assert Stroke.from_int(stroke.to_int()) == stroke
+
+    def test_from_int_only_star(self):
+        stroke = Stroke.from_int(1 << Key.STAR.index)
+
+        assert stroke.get_keys() == [Key.STAR]
+        assert stroke.get_last_key() is None
+
+    def test_caches_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(steno, "_MAX_CACHED_STROKES", 4)
+        caches = [
+            steno._STROKE_STRINGS,  # pylint: disable=protected-access
+            steno._STROKE_SORT_KEYS,  # pylint: disable=protected-access
+            steno._STROKE_INTS,  # pylint: disable=protected-access
+            steno._PACKED_STROKES,  # pylint: disable=protected-access
+        ]
+
+        for packed in range(1, 20):
+            stroke = Stroke.from_int(packed)
+            expected = Stroke([key for key in Key if packed >> key.index & 1])
+
+            assert stroke == expected
+            assert stroke.to_int() == packed
+            assert str(stroke) == str(expected)
+            assert stroke.sort_key() == expected.sort_key()
+            assert Stroke.string_from_int(packed) == str(expected)
+            assert Stroke.sort_key_from_int(packed) == expected.sort_key()
+
+        for cache in caches:
+            assert 0 < len(cache) <= 4
+
 
 #####################################################################
 # Test StrokeSequence class
@@ -803,3 +900,38 @@ class TestStrokeSequence:
         sequence = StrokeSequence(strokes)
 
         assert str(sequence) == "WUG/*B/H-PZ"
+
+    #################################################################
+    # Test to_ints() and from_ints()
+    #################################################################
+
+    def test_to_ints_empty(self):
+        assert StrokeSequence().to_ints() == []
+
+    def test_to_ints_keeps_empty_strokes(self):
+        sequence = StrokeSequence([Stroke(), Stroke([Key.A, Key.RT])])
+
+        assert sequence.to_ints() == [0, (1 << Key.A.index) | (1 << Key.RT.index)]
+
+    def test_from_ints_round_trip(self):
+        sequence = StrokeSequence([Stroke([Key.A, Key.RT]), Stroke([Key.LW, Key.STAR])])
+
+        assert StrokeSequence.from_ints(sequence.to_ints()) == sequence
+
+    #################################################################
+    # Test from_string()
+    #################################################################
+
+    def test_from_string_one_stroke(self):
+        sequence = StrokeSequence.from_string("KAT")
+
+        assert sequence == StrokeSequence([Stroke([Key.LK, Key.A, Key.RT])])
+
+    def test_from_string_multiple_strokes(self):
+        sequence = StrokeSequence.from_string("AT/W*")
+
+        assert sequence == StrokeSequence([Stroke([Key.A, Key.RT]), Stroke([Key.LW, Key.STAR])])
+
+    def test_from_string_out_of_steno_order(self):
+        with pytest.raises(OutOfStenoOrderError):
+            StrokeSequence.from_string("KAT/AK")
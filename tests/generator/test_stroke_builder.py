@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from config import Config
+import ipa_utils
+import stroke_builder
+
+CONFIG_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "generator", "configs", "config.yaml"
+)
+
+
+@pytest.fixture(scope="module")
+def config():
+    return Config(CONFIG_FILE)
+
+
+def get_syllables(ipa, config):
+    return ipa_utils.split_ipa_into_syllables(ipa, config)
+
+
+#####################################################################
+# Test StrokeCache
+#####################################################################
+
+
+def test_stroke_cache_matches_uncached(config):
+    stroke_cache = stroke_builder.StrokeCache()
+    pronunciations = ["wɔk", "wɔks", "wɔkt", "wɔkɪŋ", "wɔkɪŋ", "kæt", "kætəɫɔɡ", "æbf"]
+
+    for ipa in pronunciations:
+        syllables = get_syllables(ipa, config)
+        expected = stroke_builder.syllables_to_steno(syllables, config)
+        translations = stroke_builder.syllables_to_steno(syllables, config, stroke_cache)
+
+        assert translations == expected
+
+
+def test_stroke_cache_reuses_prefix(config):
+    stroke_cache = stroke_builder.StrokeCache()
+    stem = stroke_cache.get_possible_strokes(get_syllables("kætə", config), config)
+    longer = stroke_cache.get_possible_strokes(get_syllables("kætəɫɔɡ", config), config)
+
+    assert [[str(stroke) for stroke in strokes] for strokes in longer] == [["KA", "TU", "HRAUG"]]
+    assert longer[0][:2] == stem[0]
+    assert all(a is b for a, b in zip(longer[0], stem[0]))
+
+
+def test_stroke_cache_when_full(config):
+    stroke_cache = stroke_builder.StrokeCache(max_entries=1)
+
+    for ipa in ["wɔk", "kæt", "wɔkɪŋ", "kæt"]:
+        syllables = get_syllables(ipa, config)
+        assert stroke_builder.syllables_to_steno(
+            syllables, config, stroke_cache
+        ) == stroke_builder.syllables_to_steno(syllables, config)
@@ -0,0 +1,130 @@
+import pytest
+
+from steno import MissingDashInStrokeError, OutOfStenoOrderError, Stroke, StrokeSequence
+from stroke_translator import StrokeTranslator, StrokeTrie
+from stroke_translator import benchmark, create_trie_from_generated_dictionary, load_dictionaries
+from stroke_translator import format_translation, read_stroke_log, translate_strokes
+
+
+def _strokes(strokes_str):
+    return [Stroke.from_string(s).to_int() for s in strokes_str.split()]
+
+
+def _translate(trie, strokes_str):
+    return [
+        format_translation(key, translation)
+        for key, translation in translate_strokes(trie, _strokes(strokes_str))
+    ]
+
+
+def _trie(entries):
+    trie = StrokeTrie()
+    for sequence_str, translation in entries.items():
+        trie.add(tuple(_strokes(sequence_str.replace("/", " "))), translation)
+    return trie
+
+
+TRIE = _trie(
+    {
+        "KAT": "cat",
+        "KAT/HRAOG": "catalog",
+        "KAT/HRAOG/-S": "catalogs",
+        "HRAOG": "log",
+        "A/PWOUT/TPAEUS": "about face",
+    }
+)
+
+
+#####################################################################
+# Test translation
+#####################################################################
+
+
+def test_single_strokes():
+    assert _translate(TRIE, "KAT HRAOG") == ["catalog"]
+    assert _translate(TRIE, "HRAOG KAT") == ["log", "cat"]
+
+
+def test_longest_match_wins():
+    assert _translate(TRIE, "KAT HRAOG -S") == ["catalogs"]
+    assert _translate(TRIE, "KAT HRAOG KAT") == ["catalog", "cat"]
+
+
+def test_untranslated_strokes():
+    assert _translate(TRIE, "TKOG KAT") == ["TKOG", "cat"]
+    # "A/PWOUT" is only the start of an entry, so both strokes are untranslated.
+    assert _translate(TRIE, "A PWOUT KAT") == ["A", "PWOUT", "cat"]
+    assert _translate(TRIE, "A PWOUT TPAEUS") == ["about face"]
+
+
+def test_translations_are_output_once_final():
+    translator = StrokeTranslator(TRIE)
+
+    assert translator.add_stroke(Stroke.from_string("KAT").to_int()) == []
+    assert translator.add_stroke(Stroke.from_string("HRAOG").to_int()) == []
+    output = translator.add_stroke(Stroke.from_string("KAT").to_int())
+    assert [translation for _, translation in output] == ["catalog"]
+    assert [translation for _, translation in translator.flush()] == ["cat"]
+    assert translator.flush() == []
+
+
+#####################################################################
+# Test building tries
+#####################################################################
+
+
+def test_create_trie_from_generated_dictionary():
+    trie = create_trie_from_generated_dictionary(
+        [
+            ("cat", [StrokeSequence.from_string("KAT")]),
+            ("catalog", [StrokeSequence.from_string("KAT/HRAOG")]),
+            ("kat", [StrokeSequence.from_string("KAT")]),
+        ]
+    )
+
+    assert len(trie) == 2
+    assert _translate(trie, "KAT") == ["kat"]
+
+
+def test_load_dictionaries_first_file_wins(tmp_path):
+    first = tmp_path / "first.json"
+    first.write_text('{"KAT": "cat", "1-9": "19"}')
+    second = tmp_path / "second.json"
+    second.write_text('{"KAT": "kat", "TKOG": "dog"}')
+
+    trie = load_dictionaries([str(first), str(second)])
+
+    assert len(trie) == 2
+    assert _translate(trie, "KAT TKOG") == ["cat", "dog"]
+
+
+def test_benchmark():
+    trie = _trie({"KAT": "cat"})
+
+    assert benchmark(trie, _strokes("KAT KAT"), 1) > 0
+
+
+def test_benchmark_rejects_no_repeats():
+    trie = _trie({"KAT": "cat"})
+
+    with pytest.raises(ValueError):
+        benchmark(trie, _strokes("KAT"), 0)
+
+
+def test_read_stroke_log(tmp_path):
+    filename = tmp_path / "log.txt"
+    filename.write_text("KAT/HRAOG\nTKOG  A\n", encoding="UTF-8")
+
+    assert read_stroke_log(filename) == _strokes("KAT HRAOG TKOG A")
+
+
+def test_read_stroke_log_with_unparsable_stroke(tmp_path):
+    filename = tmp_path / "log.txt"
+
+    filename.write_text("KAT 1-9 TKOG", encoding="UTF-8")
+    with pytest.raises(OutOfStenoOrderError, match="1-9"):
+        read_stroke_log(filename)
+
+    filename.write_text("KAT TK", encoding="UTF-8")
+    with pytest.raises(MissingDashInStrokeError, match="TK"):
+        read_stroke_log(filename)
@@ -0,0 +1,111 @@
+import os
+import tempfile
+
+import pytest
+
+from config import Config
+from conftest import CONFIG_FILE, write_lines, write_variant
+import conflicts
+import core
+import ipa_utils
+import sweep
+
+IPA_LINES = [
+    "cat,/ˈkæt/",
+    "catalog,/ˈkætəˌɫɔɡ/",
+    "dog,/ˈdɔɡ/",
+    "dot,/ˈdɑt/",
+    "pst,/pst/",
+    "tad,/ˈtæd/",
+]
+WORDS = ["cat", "Catalog", "dog", "dot", "missing", "pst", "tad", "cat"]
+
+
+@pytest.fixture(scope="module")
+def files():
+    with tempfile.TemporaryDirectory() as directory:
+        ipa_file = os.path.join(directory, "ipa.csv")
+        write_lines(ipa_file, IPA_LINES)
+        word_list_file = os.path.join(directory, "words.txt")
+        write_lines(word_list_file, WORDS)
+
+        # Only changes how "d" is stroked, not how IPA is split.
+        keys_variant = write_variant(
+            directory, "keys.yaml", 'keys_right: ["-D"]', 'keys_right: ["-D", "-T"]'
+        )
+        # Changes which consonants can start a syllable.
+        phonology_variant = write_variant(
+            directory,
+            "phonology.yaml",
+            "immediately_before_vowel: []",
+            'immediately_before_vowel: ["ŋ"]',
+        )
+
+        yield ipa_file, word_list_file, [CONFIG_FILE, keys_variant, phonology_variant]
+
+
+#####################################################################
+# Test Config.get_syllabification_fingerprint()
+#####################################################################
+
+
+def test_syllabification_fingerprint(files):
+    _, _, config_files = files
+    base, keys_variant, phonology_variant = [Config(filename) for filename in config_files]
+
+    assert base.get_syllabification_fingerprint() == keys_variant.get_syllabification_fingerprint()
+    assert base.get_fingerprint() != keys_variant.get_fingerprint()
+    assert (
+        base.get_syllabification_fingerprint()
+        != phonology_variant.get_syllabification_fingerprint()
+    )
+
+
+#####################################################################
+# Test sweep()
+#####################################################################
+
+
+def test_sweep_matches_separate_runs(files):
+    ipa_file, word_list_file, config_files = files
+    results = sweep.sweep(ipa_file, word_list_file, config_files, num_processes=1)
+    parallel_results = sweep.sweep(ipa_file, word_list_file, config_files, num_processes=2)
+
+    assert [result.to_json() for result in parallel_results] == [
+        result.to_json() for result in results
+    ]
+
+    for config_file, result in zip(config_files, results):
+        config = Config(config_file)
+        report = conflicts.analyze_conflicts(
+            conflicts.translate_words(ipa_file, word_list_file, config), config
+        )
+
+        assert result.config_file == config_file
+        assert result.num_words == len(WORDS)
+        assert result.num_translated == report.num_words
+        assert result.num_translations == report.num_translations
+        assert result.num_conflicting_translations == report.get_num_conflicting_translations()
+        assert result.num_disambiguator_strokes == report.get_num_disambiguator_strokes()
+
+    # "cat" is listed twice, so its translations conflict with each other.
+    assert results[0].num_translated == 6
+    assert results[0].num_conflict_groups >= 1
+    assert results[0].get_average_strokes_per_word() > 1
+
+
+def test_split_words_is_translated_like_translate_word(files):
+    ipa_file, _, config_files = files
+    config = Config(config_files[0])
+    word_to_ipa = ipa_utils.create_ipa_lookup_dictionary(ipa_file)
+    syllables_for_each_word = sweep.split_words(WORDS, word_to_ipa, config)
+    ipa_utils.IpaNormalizer.from_config(config).normalize_lookup_dictionary(word_to_ipa)
+
+    assert syllables_for_each_word[WORDS.index("missing")] is None
+    assert syllables_for_each_word[WORDS.index("pst")] == [None]
+
+    for word, syllables in zip(WORDS, syllables_for_each_word):
+        if syllables is not None:
+            assert core.translate_syllables(word, syllables, config) == core.translate_word(
+                word, word_to_ipa, config
+            )
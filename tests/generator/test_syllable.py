@@ -1,4 +1,4 @@
-from syllable import Syllable, SyllableRegion, SyllableAtom
+from syllable import Syllable, SyllableRegion, SyllableAtom, get_atom_id
 
 
 #####################################################################
@@ -269,3 +269,51 @@ def test_map_atoms_with_overlap():
     }
     objs = syllable.map_atoms(atom_tuples_to_obj)
     assert objs == ["tʃ", "ɛp"]
+
+
+#####################################################################
+# Test map_atom_ids()
+#####################################################################
+
+
+PHONEME_IDS = {"k": 0, "l": 1, "æ": 2, "s": 3, "p": 4}
+
+
+def test_init_with_phoneme_ids():
+    syllable = Syllable(["k"], "æ", ["s"], PHONEME_IDS)
+    assert syllable.get_atom_ids() == (
+        get_atom_id(0, SyllableRegion.ONSET),
+        get_atom_id(2, SyllableRegion.NUCLEUS),
+        get_atom_id(3, SyllableRegion.CODA),
+    )
+    assert Syllable(["k"], "æ", ["s"]).get_atom_ids() is None
+
+
+def test_get_atom_id_is_unique():
+    atom_ids = {
+        get_atom_id(phoneme_id, region)
+        for phoneme_id in PHONEME_IDS.values()
+        for region in SyllableRegion
+    }
+    assert len(atom_ids) == len(PHONEME_IDS) * len(SyllableRegion)
+
+
+def test_map_atom_ids_matches_map_atoms():
+    syllable = Syllable(["k", "l"], "æ", ["p", "s"], PHONEME_IDS)
+    atom_tuples_to_obj = {
+        (SyllableAtom("k", SyllableRegion.ONSET), SyllableAtom("l", SyllableRegion.ONSET)): "kwel",
+        (SyllableAtom("k", SyllableRegion.ONSET),): "k",
+        (SyllableAtom("l", SyllableRegion.ONSET),): "l",
+        (SyllableAtom("æ", SyllableRegion.NUCLEUS),): "a",
+        (SyllableAtom("s", SyllableRegion.CODA),): "zzz",
+        (SyllableAtom("p", SyllableRegion.CODA),): "y",
+    }
+    atom_ids_to_obj = {
+        tuple(get_atom_id(PHONEME_IDS[phoneme], region) for phoneme, region in atoms): obj
+        for atoms, obj in atom_tuples_to_obj.items()
+    }
+
+    objs = syllable.map_atom_ids(atom_ids_to_obj)
+    assert objs == ["kwel", "a", "y", "zzz"]
+    assert objs == syllable.map_atoms(atom_tuples_to_obj)
+    assert syllable.map_atom_ids(atom_ids_to_obj, max_tuple_length=2) == objs